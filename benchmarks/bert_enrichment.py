@@ -0,0 +1,86 @@
+"""Compares the words/second of batched BERT word enrichment with one word per forward pass.
+
+With `--batch-size 1`, `BertWordEnrichmentStrategy` runs a forward pass with a batch of
+a single sentence for each word, as it did before the batched inference.
+
+Usage:
+    python benchmarks/bert_enrichment.py [--batch-size 32] [--n-words 200] [--cache-dir models] [DOCS_DIR]
+
+`DOCS_DIR` is a directory with `.txt` documents, such as the output of `sesg pdf-to-txt`,
+used as the enrichment text. Without it, a synthetic text is used.
+"""  # noqa: E501
+
+import argparse
+import random
+import re
+from pathlib import Path
+from time import perf_counter
+from typing import Optional
+
+from sesgx_cli.word_enrichment.bert_models import DEFAULT_BERT_MODEL, get_bert_model
+from sesgx_cli.word_enrichment.bert_strategy import BertWordEnrichmentStrategy
+from sesgx_cli.word_enrichment.stemming_filter import stem
+
+WORDS = [
+    "software", "testing", "machine", "learning", "defect", "prediction",
+    "code", "review", "model", "metrics", "neural", "network", "empirical",
+    "study", "tool", "support", "requirements", "engineering", "mining",
+    "repository", "refactoring", "smell", "quality", "maintenance", "mutation",
+    "developers", "projects", "approach", "evaluation", "results", "systematic",
+]  # fmt: skip
+
+
+def get_enrichment_text(docs_dir: Optional[Path]) -> str:
+    if docs_dir is not None:
+        return " ".join(path.read_text() for path in sorted(docs_dir.glob("*.txt")))
+
+    rng = random.Random(0)
+    return " ".join(
+        " ".join(rng.choices(WORDS, k=rng.randint(8, 30))).capitalize() + "."
+        for _ in range(500)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("docs_dir", type=Path, nargs="?")
+    parser.add_argument("--model-name", default=DEFAULT_BERT_MODEL)
+    parser.add_argument("--cache-dir", type=Path)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--n-words", type=int, default=200)
+    args = parser.parse_args()
+
+    enrichment_text = get_enrichment_text(args.docs_dir)
+    words = list(dict.fromkeys(re.findall(r"[a-z]{4,}", enrichment_text.lower())))
+    words = words[: args.n_words]
+
+    bert_tokenizer, bert_model = get_bert_model(
+        args.model_name, cache_dir=args.cache_dir
+    )
+
+    def run(batch_size: int) -> tuple[dict[str, list[str]], float]:
+        strategy = BertWordEnrichmentStrategy(
+            enrichment_text=enrichment_text,
+            bert_tokenizer=bert_tokenizer,
+            bert_model=bert_model,
+            batch_size=batch_size,
+        )
+        stem.cache_clear()
+
+        start = perf_counter()
+        enriched_words = strategy.enrich_many(words)
+
+        return enriched_words, perf_counter() - start
+
+    unbatched, unbatched_time = run(batch_size=1)
+    batched, batched_time = run(batch_size=args.batch_size)
+
+    print(f"{len(words)} words, {args.model_name}")
+    print(f"batch_size=1: {len(words) / unbatched_time:.1f} words/s")
+    print(f"batch_size={args.batch_size}: {len(words) / batched_time:.1f} words/s")
+    print(f"speedup: {unbatched_time / batched_time:.1f}x")
+    print(f"same enriched words: {batched == unbatched}")
+
+
+if __name__ == "__main__":
+    main()
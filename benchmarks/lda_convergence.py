@@ -0,0 +1,94 @@
+"""Compares the wall clock of LDA with and without early stopping, and checks the topics.
+
+Every fit uses `random_state=0`, so fitting with `extract_many` must return the same
+topics as calling `extract` on each strategy, while early stopping may change them.
+
+Usage:
+    python benchmarks/lda_convergence.py [--evaluate-every 10] [--n-jobs 4] [DOCS_DIR]
+
+`DOCS_DIR` is a directory with `.txt` documents, such as the output of `sesg pdf-to-txt`.
+Without it, a synthetic corpus is used.
+"""  # noqa: E501
+
+import argparse
+import random
+from pathlib import Path
+from time import perf_counter
+from typing import Optional
+
+from sesgx_cli.topic_extraction.lda_strategy import (
+    LDATopicExtractionStrategy,
+    extract_many,
+)
+
+WORDS = [
+    "software", "testing", "machine", "learning", "defect", "prediction",
+    "code", "review", "model", "metrics", "neural", "network", "empirical",
+    "study", "tool", "support", "requirements", "engineering", "mining",
+    "repository", "refactoring", "smell", "quality", "maintenance", "mutation",
+]  # fmt: skip
+
+MIN_DOCUMENT_FREQUENCY_LIST = [0.1, 0.3]
+N_TOPICS_LIST = [1, 2, 3]
+
+
+def get_docs(docs_dir: Optional[Path]) -> list[str]:
+    if docs_dir is not None:
+        return [path.read_text() for path in sorted(docs_dir.glob("*.txt"))]
+
+    rng = random.Random(0)
+    return [" ".join(rng.choices(WORDS, k=rng.randint(80, 200))) for _ in range(40)]
+
+
+def get_strategies(evaluate_every: int) -> list[LDATopicExtractionStrategy]:
+    return [
+        LDATopicExtractionStrategy(
+            min_document_frequency=min_document_frequency,
+            n_topics=n_topics,
+            max_n_words_per_topic=10,
+            evaluate_every=evaluate_every,
+        )
+        for min_document_frequency in MIN_DOCUMENT_FREQUENCY_LIST
+        for n_topics in N_TOPICS_LIST
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("docs_dir", type=Path, nargs="?")
+    parser.add_argument("--evaluate-every", type=int, default=10)
+    parser.add_argument("--n-jobs", type=int, default=4)
+    args = parser.parse_args()
+
+    docs = get_docs(args.docs_dir)
+
+    start = perf_counter()
+    baseline_topics = [s.extract(docs) for s in get_strategies(evaluate_every=-1)]
+    baseline_time = perf_counter() - start
+    print(f"sequential, evaluate_every=-1: {baseline_time:.2f}s")
+
+    start = perf_counter()
+    parallel_topics = extract_many(
+        get_strategies(evaluate_every=-1), docs, n_jobs=args.n_jobs
+    )
+    parallel_time = perf_counter() - start
+    print(
+        f"extract_many, n_jobs={args.n_jobs}, evaluate_every=-1: {parallel_time:.2f}s "
+        f"(topics unchanged: {parallel_topics == baseline_topics})"
+    )
+
+    start = perf_counter()
+    early_stopping_topics = extract_many(
+        get_strategies(evaluate_every=args.evaluate_every), docs, n_jobs=args.n_jobs
+    )
+    early_stopping_time = perf_counter() - start
+    n_unchanged = sum(a == b for a, b in zip(early_stopping_topics, baseline_topics))
+    print(
+        f"extract_many, n_jobs={args.n_jobs}, evaluate_every={args.evaluate_every}: "
+        f"{early_stopping_time:.2f}s "
+        f"(topics unchanged in {n_unchanged}/{len(baseline_topics)} configurations)"
+    )
+
+
+if __name__ == "__main__":
+    main()
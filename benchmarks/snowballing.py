@@ -0,0 +1,122 @@
+"""Compares the ways of running snowballing on GS citation graphs of increasing size.
+
+For each GS size, a random citation graph is created where each study references a few
+earlier studies, and many start sets (the GS studies found in Scopus) are evaluated, as
+in the evaluation of the strings of an experiment. The methods are:
+
+- `per start node`: a traversal from every study of the start set, as before `snowballing` ran a single traversal.
+- `snowballing`: a single traversal seeded with the whole start set.
+- `ReachabilityIndex`: the reachability is precomputed once per graph, and each start set is a bitwise OR. The time includes building the index.
+
+Both the directed (backward snowballing) and undirected (backward and forward
+snowballing) graphs are evaluated, and every method must return the same studies.
+
+Usage:
+    python benchmarks/snowballing.py [--gs-sizes 100 1000 5000] [--n-start-sets 200]
+"""  # noqa: E501
+
+import argparse
+import random
+from collections import deque
+from time import perf_counter
+from typing import Callable
+
+from sesgx_cli.citation_graph import (
+    ReachabilityIndex,
+    directed_adjacency_list_to_undirected,
+    snowballing,
+)
+
+
+def snowballing_per_start_node(
+    adjacency_list: dict[int, list[int]],
+    start_set: list[int],
+) -> list[int]:
+    reachable_nodes: list[int] = []
+
+    for starting_node in start_set:
+        visited = {starting_node}
+        q = deque([starting_node])
+
+        while len(q) != 0:
+            s = q.pop()
+            reachable_nodes.append(s)
+
+            for adjacent_node in adjacency_list.get(s, []):
+                if adjacent_node not in visited:
+                    q.append(adjacent_node)
+                    visited.add(adjacent_node)
+
+    return sorted(set(reachable_nodes))
+
+
+def create_gs_adjacency_list(rng: random.Random, gs_size: int) -> dict[int, list[int]]:
+    return {
+        study: rng.sample(range(study), k=min(study, rng.randint(0, 6)))
+        for study in range(gs_size)
+    }
+
+
+def time_method(
+    method: Callable[[list[int]], list[int]],
+    start_sets: list[list[int]],
+) -> tuple[list[list[int]], float]:
+    start = perf_counter()
+    results = [method(start_set) for start_set in start_sets]
+
+    return results, perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--gs-sizes", type=int, nargs="+", default=[100, 500, 1000, 2000, 5000]
+    )
+    parser.add_argument("--n-start-sets", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+
+    print("graph       gs size  per start node  snowballing  ReachabilityIndex")
+
+    for gs_size in args.gs_sizes:
+        directed_adjacency_list = create_gs_adjacency_list(rng, gs_size)
+        start_sets = [
+            rng.sample(range(gs_size), k=rng.randint(1, min(100, gs_size)))
+            for _ in range(args.n_start_sets)
+        ]
+
+        for graph, adjacency_list in [
+            ("directed", directed_adjacency_list),
+            ("undirected", directed_adjacency_list_to_undirected(directed_adjacency_list)),  # noqa: E501
+        ]:
+            expected, per_start_node_time = time_method(
+                lambda start_set, adjacency_list=adjacency_list: (
+                    snowballing_per_start_node(adjacency_list, start_set)
+                ),
+                start_sets,
+            )
+
+            results, snowballing_time = time_method(
+                lambda start_set, adjacency_list=adjacency_list: snowballing(  # type: ignore
+                    adjacency_list=adjacency_list,
+                    start_set=start_set,
+                ),
+                start_sets,
+            )
+            assert results == expected
+
+            start = perf_counter()
+            index = ReachabilityIndex(adjacency_list)
+            results, _ = time_method(index.reachable_from, start_sets)
+            index_time = perf_counter() - start
+            assert results == expected
+
+            print(
+                f"{graph:<10}  {gs_size:>7}  {per_start_node_time:>13.3f}s  "
+                f"{snowballing_time:>10.3f}s  {index_time:>16.3f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Compares the throughput of `filter_with_stemming` with the unoptimized filter.
+
+The unoptimized filter stems every word with `LancasterStemmer` on each call, and
+compares each candidate with the relevant ones pair by pair. Each call filters 30
+candidates, the number of words BERT predicts for each word. As in a sweep, the same
+words are filtered many times.
+
+Usage:
+    python benchmarks/stemming_filter.py [--n-calls 5000] [--n-words 200]
+"""
+
+import argparse
+import random
+from time import perf_counter
+
+from sesgx_cli.word_enrichment.stemming_filter import (
+    check_stemmed_enriched_word_is_valid,
+    check_strings_are_close,
+    check_word_is_punctuation,
+    filter_with_stemming,
+    lancaster,
+    stem,
+)
+
+N_CANDIDATES = 30
+
+
+def filter_with_stemming_unoptimized(
+    word: str,
+    enriched_words_list: list[str],
+) -> list[str]:
+    stemmed_word = lancaster.stem(word)
+    relevant_enriched_words: list[str] = []
+    stemmed_relevant_enriched_words: list[str] = []
+
+    for enriched_word in enriched_words_list:
+        stemmed_enriched_word = lancaster.stem(enriched_word)
+
+        is_relevant = (
+            not check_word_is_punctuation(enriched_word)
+            and check_stemmed_enriched_word_is_valid(
+                stemmed_enriched_word,
+                stemmed_word=stemmed_word,
+            )
+            and not any(
+                check_strings_are_close(stemmed_relevant_enriched_word, stemmed_enriched_word)  # noqa: E501
+                for stemmed_relevant_enriched_word in stemmed_relevant_enriched_words
+            )
+        )
+
+        if is_relevant:
+            relevant_enriched_words.append(enriched_word)
+            stemmed_relevant_enriched_words.append(stemmed_enriched_word)
+
+    return relevant_enriched_words
+
+
+def random_word(rng: random.Random) -> str:
+    return "".join(rng.choices("abcdeilmnorstuy", k=rng.randint(4, 12)))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-calls", type=int, default=5000)
+    parser.add_argument("--n-words", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = [random_word(rng) for _ in range(args.n_words * 5)]
+    outputs = {
+        word: rng.sample(vocabulary, k=N_CANDIDATES) + ["-", word]
+        for word in rng.sample(vocabulary, k=args.n_words)
+    }
+    calls = [rng.choice(list(outputs)) for _ in range(args.n_calls)]
+
+    start = perf_counter()
+    expected = [filter_with_stemming_unoptimized(w, outputs[w]) for w in calls]
+    unoptimized_time = perf_counter() - start
+
+    stem.cache_clear()
+    start = perf_counter()
+    filtered = [filter_with_stemming(w, enriched_words_list=outputs[w]) for w in calls]
+    optimized_time = perf_counter() - start
+
+    assert filtered == expected
+
+    print(f"{args.n_calls} calls with {N_CANDIDATES} candidates each")
+    print(f"unoptimized: {args.n_calls / unoptimized_time:,.0f} calls/s")
+    print(f"filter_with_stemming: {args.n_calls / optimized_time:,.0f} calls/s")
+    print(f"speedup: {unoptimized_time / optimized_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
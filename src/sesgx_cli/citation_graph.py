@@ -5,7 +5,11 @@ we will perform operations on a correlation (or citation) graph.
 """
 
 from collections import defaultdict, deque
-from typing import Optional
+from dataclasses import dataclass
+from typing import Iterable, Optional, Union
+
+import numpy as np
+import numpy.typing as npt
 
 
 def directed_adjacency_list_to_undirected(
@@ -35,91 +39,457 @@ def directed_adjacency_list_to_undirected(
     return dict(undirected_adjacency_list)
 
 
-def _breadth_first_search(
+def snowballing(
     *,
     adjacency_list: dict[int, list[int]],
-    starting_node: int,
-) -> list[int]:
-    """Runs breadth first search on a graph. Inspired by this [blog](https://www.geeksforgeeks.org/breadth-first-search-or-bfs-for-a-graph/).
+    start_set: list[int],
+    as_array: bool = False,
+) -> Union[list[int], npt.NDArray[np.int64]]:
+    """Runs snowballing on a graph represented by an adjacency list.
+
+    Snowballing is performed by running a single BFS (breadth first search) seeded with every study of the start set, so studies reachable from more than one study of the start set are visited only once.
 
     Args:
-        adjacency_list (dict[int, list[int]]): A dict mapping node IDs to their list of neighbors.
-        starting_node (int): Node where to start the search.
+        adjacency_list (dict[int, list[int]]): A dict mapping a study ID to it's neighbors (citation/references).
+        start_set (list[int]): List with the ID of the studies of the start set.
+        as_array (bool): Whether to return the study IDs as a NumPy integer array. Defaults to False.
 
     Returns:
-        List of nodes connected to the starting node by a path.
+        Sorted list (or array, if `as_array` is True) of study IDs that can be found via snowballing on the start set.
 
     Examples:
         >>> adjacency_list = {
         ...     1: [2],
         ...     2: [3, 4],
-        ...     4: [5, 6]
+        ...     4: [5, 6],
+        ...     7: [6, 8, 9]
         ... }
-        >>> _breadth_first_search(adjacency_list=adjacency_list, starting_node=2)
-        [2, 4, 6, 5, 3]
+        >>> snowballing(adjacency_list=adjacency_list, start_set=[4, 7])
+        [4, 5, 6, 7, 8, 9]
+        >>> snowballing(adjacency_list=adjacency_list, start_set=[4, 7], as_array=True)
+        array([4, 5, 6, 7, 8, 9])
     """  # noqa: E501
-    reachable_nodes: list[int] = []
-    q: deque[int] = deque()
-    visited: dict[int, bool] = defaultdict(lambda: False)
-
-    s = starting_node
-    q.append(s)
-    visited[s] = True
+    visited: set[int] = set(start_set)
+    q: deque[int] = deque(visited)
 
     while len(q) != 0:
-        s = q.pop()
-        reachable_nodes.append(s)
+        s = q.popleft()
 
-        if s not in adjacency_list:
-            continue
-
-        for adjacent_node in adjacency_list[s]:
-            if not visited[adjacent_node]:
+        for adjacent_node in adjacency_list.get(s, []):
+            if adjacent_node not in visited:
                 q.append(adjacent_node)
-                visited[adjacent_node] = True
+                visited.add(adjacent_node)
 
-    return reachable_nodes
+    snowballing_nodes = sorted(visited)
 
+    if as_array:
+        return np.array(snowballing_nodes, dtype=np.int64)
 
-def snowballing(
-    *,
-    adjacency_list: dict[int, list[int]],
-    start_set: list[int],
-) -> list[int]:
-    """Runs snowballing on a graph represented by an adjacency list.
+    return snowballing_nodes
 
-    Snowballing is performed by running a BFS (breadth first search) on each study of the start set
+
+class ReachabilityIndex:
+    """Precomputed reachability (transitive closure) of a graph represented by an adjacency list.
+
+    The strongly connected components of the graph are found with Tarjan's algorithm, and
+    the set of nodes reachable from each component is stored as a bitset (a Python `int`).
+    Since Tarjan's algorithm finds a component after all components reachable from it, each
+    bitset is the union of the component's own nodes and the bitsets of its successors.
+
+    For undirected graphs, the strongly connected components are the connected components.
+
+    After building the index, snowballing on a start set is a bitwise OR of the bitsets of
+    its nodes (see [`snowballing`][sesgx_cli.citation_graph.snowballing]).
 
     Args:
-        adjacency_list (dict[int, list[int]]): A dict mapping a study ID to it's neighbors (citation/references).
-        start_set (list[int]): List with the ID of the studies of the start set.
+        adjacency_list (dict[int, list[int]]): A dict mapping node IDs to their list of neighbors.
 
-    Returns:
-        List of study IDs that can be found via snowballing on the start set.
+    Examples:
+        >>> index = ReachabilityIndex({1: [2], 2: [3, 4], 4: [5, 6], 7: [6, 8, 9]})
+        >>> index.reachable_from([4, 7])
+        [4, 5, 6, 7, 8, 9]
+        >>> index.reachable_from([1, 10])
+        [1, 2, 3, 4, 5, 6, 10]
+    """  # noqa: E501
+
+    def __init__(self, adjacency_list: dict[int, list[int]]) -> None:
+        nodes = sorted(
+            {
+                *adjacency_list,
+                *(n for neighbors in adjacency_list.values() for n in neighbors),
+            }
+        )
+
+        self.nodes: list[int] = nodes
+        self.node_index: dict[int, int] = {node: i for i, node in enumerate(nodes)}
+        self._nodes_array = np.array(nodes, dtype=np.int64)
+
+        graph: list[list[int]] = [
+            [self.node_index[n] for n in adjacency_list.get(node, [])]
+            for node in nodes
+        ]
+
+        self._reachable_bitsets = self._compute_reachable_bitsets(graph)
+
+    @staticmethod
+    def _find_strongly_connected_components(graph: list[list[int]]) -> list[int]:
+        n_nodes = len(graph)
+
+        # iterative version of Tarjan's strongly connected components algorithm
+        indexes = [-1] * n_nodes
+        lowlinks = [0] * n_nodes
+        on_stack = [False] * n_nodes
+        stack: list[int] = []
+        next_index = 0
+
+        # components are numbered in the order they are found
+        component_of = [-1] * n_nodes
+        n_components = 0
+
+        for root in range(n_nodes):
+            if indexes[root] != -1:
+                continue
+
+            # each item is a node and the position of the next neighbor to visit
+            work: list[tuple[int, int]] = [(root, 0)]
+
+            while len(work) != 0:
+                node, position = work[-1]
+                neighbors = graph[node]
+
+                if position == 0:
+                    indexes[node] = lowlinks[node] = next_index
+                    next_index += 1
+                    stack.append(node)
+                    on_stack[node] = True
+                else:
+                    # back from visiting the neighbor before `position`
+                    child = neighbors[position - 1]
+                    lowlinks[node] = min(lowlinks[node], lowlinks[child])
+
+                # neighbors already visited only lower the lowlink, if on the stack
+                while position < len(neighbors) and indexes[neighbors[position]] != -1:
+                    neighbor = neighbors[position]
+                    if on_stack[neighbor]:
+                        lowlinks[node] = min(lowlinks[node], indexes[neighbor])
+                    position += 1
+
+                if position < len(neighbors):
+                    work[-1] = (node, position + 1)
+                    work.append((neighbors[position], 0))
+                    continue
+
+                work.pop()
+
+                if lowlinks[node] != indexes[node]:
+                    continue
+
+                # `node` is the root of a component, whose members are on top of the stack
+                while on_stack[node]:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component_of[member] = n_components
+
+                n_components += 1
+
+        return component_of
+
+    @staticmethod
+    def _compute_reachable_bitsets(graph: list[list[int]]) -> list[int]:
+        component_of = ReachabilityIndex._find_strongly_connected_components(graph)
+
+        n_components = max(component_of, default=-1) + 1
+        members_of: list[list[int]] = [[] for _ in range(n_components)]
+        for node, component in enumerate(component_of):
+            members_of[component].append(node)
+
+        # Tarjan's algorithm finds a component after the components reachable from it, so
+        # the bitsets of the successors of a component are known before its own
+        component_bitsets: list[int] = []
+
+        for component, members in enumerate(members_of):
+            bitset = 0
+            for member in members:
+                bitset |= 1 << member
+
+            for member in members:
+                for neighbor in graph[member]:
+                    if component_of[neighbor] != component:
+                        bitset |= component_bitsets[component_of[neighbor]]
+
+            component_bitsets.append(bitset)
+
+        return [component_bitsets[component] for component in component_of]
+
+    def reachable_from(self, start_set: list[int]) -> list[int]:
+        """Finds the nodes reachable from any node of the start set, including the start set.
+
+        Args:
+            start_set (list[int]): List with the ID of the nodes of the start set.
+
+        Returns:
+            Sorted list of node IDs reachable from the start set.
+        """  # noqa: E501
+        bitset = 0
+        unknown_nodes: set[int] = set()
+
+        for node in start_set:
+            if node in self.node_index:
+                bitset |= self._reachable_bitsets[self.node_index[node]]
+            else:
+                # a node that is not on the graph only reaches itself
+                unknown_nodes.add(node)
+
+        # the bit `i` of the bitset is set if the node `self.nodes[i]` is reachable
+        bits = np.unpackbits(
+            np.frombuffer(
+                bitset.to_bytes((len(self.nodes) + 7) // 8, "little"),
+                dtype=np.uint8,
+            ),
+            bitorder="little",
+        )
+        reachable_nodes = self._nodes_array[np.flatnonzero(bits[: len(self.nodes)])]
+
+        if len(unknown_nodes) == 0:
+            return reachable_nodes.tolist()
+
+        return sorted({*reachable_nodes.tolist(), *unknown_nodes})
+
+
+@dataclass(frozen=True)
+class CitationGraph:
+    """Directed citation graph stored as NumPy CSR (compressed sparse row) arrays.
+
+    Nodes are identified by their index in `node_ids`, so the neighbors of the node with
+    index `i` are `indices[indptr[i]:indptr[i + 1]]`.
+
+    Attributes:
+        node_ids (npt.NDArray[np.int64]): Sorted IDs of the nodes (e.g. `Study.id` or `Study.node_id`).
+        indptr (npt.NDArray[np.int32]): Offsets of the neighbors of each node in `indices`, with length `n_nodes + 1`.
+        indices (npt.NDArray[np.int32]): Node indices of the neighbors of every node, sorted by node.
 
     Examples:
-        >>> adjacency_list = {
-        ...     1: [2],
-        ...     2: [3, 4],
-        ...     4: [5, 6],
-        ...     7: [6, 8, 9]
-        ... }
-        >>> snowballing(adjacency_list=adjacency_list, start_set=[4, 7])
+        >>> graph = CitationGraph.from_adjacency_list({1: [2], 2: [3, 4], 4: [5, 6], 7: [6, 8, 9]})
+        >>> graph.reachable_from([4, 7]).tolist()
         [4, 5, 6, 7, 8, 9]
+        >>> graph.number_of_connected_components()
+        1
+        >>> graph.undirected_degrees().tolist()
+        [1, 3, 1, 3, 1, 2, 3, 1, 1]
     """  # noqa: E501
-    snowballing_nodes: list[int] = []
 
-    for node in start_set:
-        result = _breadth_first_search(
-            adjacency_list=adjacency_list,
-            starting_node=node,
+    node_ids: npt.NDArray[np.int64]
+    indptr: npt.NDArray[np.int32]
+    indices: npt.NDArray[np.int32]
+
+    @classmethod
+    def from_edges(
+        cls,
+        node_ids: Iterable[int],
+        sources: Iterable[int],
+        targets: Iterable[int],
+    ) -> "CitationGraph":
+        """Creates a graph from its nodes and edges. Duplicated edges are kept only once.
+
+        Args:
+            node_ids (Iterable[int]): IDs of the nodes. Nodes that only appear in the edges are also added.
+            sources (Iterable[int]): ID of the source node of each edge.
+            targets (Iterable[int]): ID of the target node of each edge.
+
+        Returns:
+            The graph.
+        """  # noqa: E501
+        source_ids = np.fromiter(sources, dtype=np.int64)
+        target_ids = np.fromiter(targets, dtype=np.int64)
+
+        if len(source_ids) != len(target_ids):
+            raise RuntimeError("Every edge must have a source and a target node.")
+
+        all_node_ids = np.unique(
+            np.concatenate(
+                [np.fromiter(node_ids, dtype=np.int64), source_ids, target_ids]
+            )
+        )
+
+        sources_idx = np.searchsorted(all_node_ids, source_ids)
+        targets_idx = np.searchsorted(all_node_ids, target_ids)
+
+        edges = np.unique(np.stack([sources_idx, targets_idx], axis=1), axis=0)
+        edges = edges.reshape(-1, 2)
+
+        indptr = np.zeros(len(all_node_ids) + 1, dtype=np.int32)
+        np.cumsum(
+            np.bincount(edges[:, 0], minlength=len(all_node_ids)),
+            out=indptr[1:],
+        )
+
+        return cls(
+            node_ids=all_node_ids,
+            indptr=indptr,
+            indices=edges[:, 1].astype(np.int32),
+        )
+
+    @classmethod
+    def from_adjacency_list(
+        cls,
+        adjacency_list: dict[int, list[int]],
+    ) -> "CitationGraph":
+        """Creates a graph from an adjacency list.
+
+        Args:
+            adjacency_list (dict[int, list[int]]): A dict mapping node IDs to their list of neighbors.
+
+        Returns:
+            The graph.
+        """  # noqa: E501
+        return cls.from_edges(
+            node_ids=adjacency_list.keys(),
+            sources=(n for n, neighbors in adjacency_list.items() for _ in neighbors),
+            targets=(n for neighbors in adjacency_list.values() for n in neighbors),
+        )
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def n_edges(self) -> int:
+        return len(self.indices)
+
+    def to_adjacency_list(self) -> dict[int, list[int]]:
+        """Converts the graph to an adjacency list with every node as a key.
+
+        Returns:
+            A dict mapping node IDs to their list of neighbors.
+        """
+        neighbors_ids = self.node_ids[self.indices].tolist()
+        indptr = self.indptr.tolist()
+
+        return {
+            node_id: neighbors_ids[indptr[i] : indptr[i + 1]]
+            for i, node_id in enumerate(self.node_ids.tolist())
+        }
+
+    def get_node_indices(self, node_ids: Iterable[int]) -> npt.NDArray[np.int32]:
+        """Maps node IDs to node indices.
+
+        Args:
+            node_ids (Iterable[int]): IDs of the nodes.
+
+        Raises:
+            KeyError: If any node is not on the graph.
+
+        Returns:
+            Index of each node.
+        """
+        ids = np.fromiter(node_ids, dtype=np.int64)
+        node_indices = np.searchsorted(self.node_ids, ids)
+
+        missing = node_indices == self.n_nodes
+        missing[~missing] = self.node_ids[node_indices[~missing]] != ids[~missing]
+        if missing.any():
+            raise KeyError(f"Nodes not on the graph: {ids[missing].tolist()}")
+
+        return node_indices.astype(np.int32)
+
+    def _get_edges(self) -> tuple[npt.NDArray[np.int32], npt.NDArray[np.int32]]:
+        sources = np.repeat(
+            np.arange(self.n_nodes, dtype=np.int32),
+            np.diff(self.indptr),
+        )
+
+        return sources, self.indices
+
+    def out_degrees(self) -> npt.NDArray[np.int64]:
+        """Number of neighbors (e.g. references) of each node."""
+        return np.diff(self.indptr).astype(np.int64)
+
+    def undirected_degrees(self) -> npt.NDArray[np.int64]:
+        """Degree of each node when the direction of the edges is ignored.
+
+        Same as the degree of a `networkx.Graph`: edges in both directions between two nodes count once, and self loops count twice.
+        """  # noqa: E501
+        sources, targets = self._get_edges()
+
+        edges = np.unique(
+            np.stack([np.minimum(sources, targets), np.maximum(sources, targets)]),
+            axis=1,
+        )
+
+        return np.bincount(edges[0], minlength=self.n_nodes) + np.bincount(
+            edges[1], minlength=self.n_nodes
         )
 
-        snowballing_nodes.extend(result)
+    def connected_components(self) -> npt.NDArray[np.int64]:
+        """Labels each node with its (weakly) connected component.
+
+        Components are found by hooking the label of each edge's endpoints to the smallest
+        of them and then compressing the labels with pointer jumping, until no label changes.
+
+        Returns:
+            Label of the component of each node, from 0 to the number of components minus one.
+        """  # noqa: E501
+        sources, targets = self._get_edges()
+        labels = np.arange(self.n_nodes, dtype=np.int64)
+
+        while True:
+            source_labels = labels[sources]
+            target_labels = labels[targets]
+            min_labels = np.minimum(source_labels, target_labels)
+
+            new_labels = labels.copy()
+            np.minimum.at(new_labels, source_labels, min_labels)
+            np.minimum.at(new_labels, target_labels, min_labels)
+
+            while True:
+                jumped_labels = new_labels[new_labels]
+                if np.array_equal(jumped_labels, new_labels):
+                    break
+                new_labels = jumped_labels
+
+            if np.array_equal(new_labels, labels):
+                break
+
+            labels = new_labels
+
+        return np.unique(labels, return_inverse=True)[1].reshape(-1)
+
+    def number_of_connected_components(self) -> int:
+        """Number of (weakly) connected components of the graph."""
+        if self.n_nodes == 0:
+            return 0
+
+        return int(self.connected_components().max()) + 1
+
+    def reachable_from(self, start_set: Iterable[int]) -> npt.NDArray[np.int64]:
+        """Runs snowballing on the graph, expanding the whole frontier at each step.
+
+        Args:
+            start_set (Iterable[int]): IDs of the nodes of the start set.
+
+        Raises:
+            KeyError: If any node of the start set is not on the graph.
+
+        Returns:
+            Sorted IDs of the nodes reachable from the start set, including the start set.
+        """  # noqa: E501
+        visited = np.zeros(self.n_nodes, dtype=bool)
+
+        frontier = np.unique(self.get_node_indices(start_set))
+        visited[frontier] = True
+
+        while len(frontier) != 0:
+            starts = self.indptr[frontier]
+            lengths = self.indptr[frontier + 1] - starts
+
+            # positions in `indices` of the neighbors of every node in the frontier
+            offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+            neighbors = self.indices[offsets + np.arange(lengths.sum())]
 
-    snowballing_nodes_without_duplicates = list(set(snowballing_nodes))
+            frontier = np.unique(neighbors[~visited[neighbors]])
+            visited[frontier] = True
 
-    return snowballing_nodes_without_duplicates
+        return self.node_ids[visited]
 
 
 def create_citation_graph(
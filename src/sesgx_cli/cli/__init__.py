@@ -1,8 +1,12 @@
+import ast
 import warnings
 from importlib import import_module
 from pathlib import Path
+from typing import Optional
 
+import click
 import typer
+from typer.core import TyperGroup
 
 try:
     from numba.core.errors import NumbaDeprecationWarning
@@ -12,24 +16,84 @@ except:  # noqa: E722
     pass
 
 
-def _include_cli_apps(app: typer.Typer):
-    for path in Path(__file__).parent.iterdir():
-        # ignore dunder entries, such as
-        # __init__.py, __main__.py, __pycache__/, etc.
-        if path.stem.startswith("__") and path.stem.endswith("__"):
-            continue
+# maps the name of each sub-command to the module under `cli/` that defines its app,
+# so the modules are only imported when their sub-command is invoked
+_CLI_APPS: dict[str, str] = {
+    "citation-graph": "citation_graph",
+    "config": "config",
+    "db": "db",
+    "experiment": "experiment",
+    "fix-invalid-strings": "fix_invalid_strings",
+    "pdf-to-txt": "pdf_to_txt",
+    "results": "results",
+    "scopus": "scopus",
+    "slr": "slr",
+}
+
+
+def _get_app_help(cli_module_name: str) -> Optional[str]:
+    """Reads the `help` passed to the `app` of a CLI module from its source, without importing it."""  # noqa: E501
+    tree = ast.parse((Path(__file__).parent / f"{cli_module_name}.py").read_text())
+
+    for node in tree.body:
+        if (
+            isinstance(node, ast.Assign)
+            and any(isinstance(t, ast.Name) and t.id == "app" for t in node.targets)
+            and isinstance(node.value, ast.Call)
+        ):
+            for keyword in node.value.keywords:
+                if keyword.arg == "help":
+                    return ast.literal_eval(keyword.value)
+
+    return None
+
+
+class LazyTyperGroup(TyperGroup):
+    """Group that imports the module of a sub-command only when it is invoked.
+
+    While formatting the help, placeholder commands are returned instead, with the help
+    read from the source of each module, so listing the sub-commands imports none of them.
+    """  # noqa: E501
+
+    _formatting_help: bool = False
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted({*super().list_commands(ctx), *_CLI_APPS})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name not in _CLI_APPS:
+            return super().get_command(ctx, cmd_name)
+
+        cli_module_name = _CLI_APPS[cmd_name]
+
+        if self._formatting_help:
+            return click.Group(name=cmd_name, help=_get_app_help(cli_module_name))
 
-        cli_module_name = path.stem
         module = import_module(f"sesgx_cli.cli.{cli_module_name}")
-        app.add_typer(module.app, name=cli_module_name.replace("_", "-"))
+
+        command = typer.main.get_group(module.app)
+        command.name = cmd_name
+
+        return command
+
+    def format_help(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        self._formatting_help = True
+        try:
+            super().format_help(ctx, formatter)
+        finally:
+            self._formatting_help = False
 
 
 app = typer.Typer(
+    cls=LazyTyperGroup,
     rich_markup_mode="markdown",
     pretty_exceptions_show_locals=False,
 )
 
-_include_cli_apps(app)
+
+@app.callback()
+def main():
+    pass
 
 
 if __name__ == "__main__":
@@ -1,15 +1,35 @@
 import typer
+from rich import print
 
 from sesgx_cli.database.connection import engine
 from sesgx_cli.database.models.base import Base
+from sesgx_cli.database.util.schema_upgrade import upgrade_tables as upgrade_schema
 
 app = typer.Typer(rich_markup_mode="markdown", help="Create or drop the database.")
 
 
 @app.command()
 def create_tables():
-    """Creates the tables on the database."""
+    """Creates the tables on the database, and upgrades the ones that already exist."""
     Base.metadata.create_all(bind=engine)
+    upgrade_tables()
+
+
+@app.command()
+def upgrade_tables():
+    """Upgrades the existing tables to the current schema.
+
+    Adds the `evaluate_every` column to `lda_params` and includes it in the unique
+    constraint of the table. Required by `sesg experiment start` on databases created
+    before the column existed.
+
+    Adds the `chunk_index` column to `search_string_results` and includes it in the
+    primary key of the table, so the stored Scopus results are saved in chunks.
+    """
+    statements = upgrade_schema(engine)
+
+    for statement in statements:
+        print(f"[green]Executed[/] {statement}")
 
 
 @app.command()
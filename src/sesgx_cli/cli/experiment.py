@@ -3,13 +3,14 @@ from itertools import product
 from pathlib import Path
 from random import sample
 from time import time
+from typing import Optional
 
 import typer
 from rich import print
-from rich.progress import Progress
+from rich.progress import Progress, TaskID
 
 from sesgx_cli.async_typer import AsyncTyper
-from sesgx_cli.database.connection import Session
+from sesgx_cli.database.connection import Session, engine
 from sesgx_cli.database.models import (
     SLR,
     BERTopicParams,
@@ -17,10 +18,17 @@ from sesgx_cli.database.models import (
     FormulationParams,
     LDAParams,
     Params,
-    SearchString,
 )
+from sesgx_cli.database.models.params import ParamsKey
+from sesgx_cli.database.util.schema_upgrade import get_lda_params_upgrade_statements
 from sesgx_cli.env_vars import DATABASE_URL
 from sesgx_cli.experiment_config import ExperimentConfig
+from sesgx_cli.experiment_sweep import (
+    SweepSettings,
+    SweepTask,
+    SweepWriter,
+    run_sweep,
+)
 from sesgx_cli.telegram_report_experiment import TelegramReportExperiment
 from sesgx_cli.topic_extraction.strategies import TopicExtractionStrategy
 from sesgx_cli.word_enrichment.strategies import WordEnrichmentStrategy
@@ -94,11 +102,54 @@ async def start(  # noqa: C901 - method too complex
         help="Send experiment report to telegram.",
         show_default=True,
     ),
+    n_workers: int = typer.Option(
+        1,
+        "--workers",
+        "-w",
+        help="Number of processes used to generate the search strings.",
+        min=1,
+        show_default=True,
+    ),
+    batch_size: int = typer.Option(
+        50,
+        "--batch-size",
+        "-b",
+        help="Number of generated search strings saved to the database at once.",
+        min=1,
+        show_default=True,
+    ),
+    enrichment_cache_size: int = typer.Option(
+        10_000,
+        "--enrichment-cache-size",
+        help="Max number of enriched words kept in memory by each worker. Use 0 to disable.",  # noqa: E501
+        min=0,
+        show_default=True,
+    ),
+    embeddings_cache_dir: Optional[Path] = typer.Option(
+        None,
+        "--embeddings-cache-dir",
+        help="Directory where the BERTopic document embeddings are persisted, to be reused by later runs.",  # noqa: E501
+        dir_okay=True,
+        file_okay=False,
+    ),
+    model_cache_dir: Optional[Path] = typer.Option(
+        None,
+        "--model-cache-dir",
+        help="Directory where local copies of the word enrichment models are kept, for fast and offline loading.",  # noqa: E501
+        dir_okay=True,
+        file_okay=False,
+    ),
 ):
     """Starts an experiment and generates search strings.
 
     Will only generate strings using unseen parameters from the config file. If a string was already
     generated for this experiment using a set of parameters for the strategy, will skip it.
+
+    With `--workers`, the parameter variations are generated by a pool of processes, while the
+    search strings are saved by the current process as they are generated.
+
+    Databases created before `evaluate_every` identified the LDA params are refused until
+    `sesg db upgrade-tables` is run.
     """  # noqa: E501
     typer.confirm(
         f"Database in use: {DATABASE_URL}. Confirm?",
@@ -106,16 +157,15 @@ async def start(  # noqa: C901 - method too complex
         abort=True,
     )
 
+    if len(get_lda_params_upgrade_statements(engine)) > 0:
+        print(
+            "[red]The database tables are outdated. Run `sesg db upgrade-tables` first."
+        )
+        raise typer.Exit(1)
+
     start_time = time()
-    from sesgx import SeSG
     from transformers import logging  # type: ignore
 
-    from sesgx_cli.string_formulation.scopus_string_formulation_model import (
-        ScopusStringFormulationModel,
-    )
-    from sesgx_cli.topic_extraction.topic_extraction_cache import TopicExtractionCache
-    from sesgx_cli.word_enrichment.word_enrichment_cache import WordEnrichmentCache
-
     logging.set_verbosity_error()
 
     config = ExperimentConfig.from_toml(config_toml_path)
@@ -170,17 +220,9 @@ async def start(  # noqa: C901 - method too complex
             print(f'Study(id={study.id}, title="{study.title}")')
 
         print()
-
-        docs = experiment.get_docs()
-        enrichment_text = experiment.get_enrichment_text()
-
-        if len(docs) < 10:
+        if len(experiment.qgs) < 10:
             print("[blue]Less than 10 documents. Duplicating the current documents.")
             print()
-            docs = [*docs, *docs]
-
-        print("Loading tokenizer and language model...")
-        print()
 
         with Progress() as progress:
             print("Retrieving strategies parameters from database...")
@@ -193,6 +235,7 @@ async def start(  # noqa: C901 - method too complex
             lda_params = LDAParams.get_or_save_from_params_product(
                 min_document_frequency_list=config.lda_params.min_document_frequency,
                 n_topics_list=config.lda_params.n_topics,
+                evaluate_every=config.lda_params.evaluate_every,
                 session=session,
             )
 
@@ -202,206 +245,121 @@ async def start(  # noqa: C901 - method too complex
                 session=session,
             )
 
+            print("Retrieving already generated parameters variations...")
+            completed_params_keys = Params.get_keys_by_experiment(
+                experiment_id=experiment.id,
+                session=session,
+            )
+
+            tasks: list[SweepTask] = []
+            progress_bar_task_ids: dict[tuple[str, str], TaskID] = {}
+            n_params_by_strategies: dict[tuple[str, str], int] = {}
+            n_done_by_strategies: dict[tuple[str, str], int] = {}
+
             for word_enrichment_strategy, topic_extraction_strategy in product(
                 word_enrichment_strategies_list,
                 topic_extraction_strategies_list,
             ):
+                topic_params: list[LDAParams] | list[BERTopicParams]
                 if topic_extraction_strategy == TopicExtractionStrategy.bertopic:
-                    concatenated_params = product(bertopic_params, formulation_params)
+                    topic_params = bertopic_params
                 elif topic_extraction_strategy == TopicExtractionStrategy.lda:
-                    concatenated_params = product(lda_params, formulation_params)
+                    topic_params = lda_params
                 else:
                     raise RuntimeError(
                         "Invalid Topic Extraction Strategy or the params instance does not have neither a lda_params or bertopic_params"
                         # noqa: E501
                     )
 
-                concatenated_params = list(concatenated_params)
-
-                n_params = len(concatenated_params)
-                progress_bar_task_id = progress.add_task(
-                    f"Found [bright_cyan]{n_params}[/bright_cyan] parameters variations for {topic_extraction_strategy.value} with {word_enrichment_strategy.value}...",
-                    # noqa: E501
-                    total=n_params,
+                strategies = (
+                    topic_extraction_strategy.value,
+                    word_enrichment_strategy.value,
                 )
+                n_params = len(topic_params) * len(formulation_params)
+                n_skipped = 0
 
-                if word_enrichment_strategy == WordEnrichmentStrategy.bert:
-                    from transformers import BertForMaskedLM, BertTokenizer
+                for topic_param in topic_params:
+                    formulation_params_ids: list[int] = []
 
-                    from sesgx_cli.word_enrichment.bert_strategy import (
-                        BertWordEnrichmentStrategy,
-                    )
+                    for formulation_param in formulation_params:
+                        key = ParamsKey(
+                            topic_extraction_strategy=topic_extraction_strategy.value,
+                            word_enrichment_strategy=word_enrichment_strategy.value,
+                            topic_params_id=topic_param.id,
+                            formulation_params_id=formulation_param.id,
+                        )
 
-                    # instead of using composition
-                    # this part could be initialized by BertWordEnrichmentStrategy
-                    bert_tokenizer = BertTokenizer.from_pretrained("bert-base-uncased")
-                    bert_model = BertForMaskedLM.from_pretrained("bert-base-uncased")
-                    bert_model.eval()  # type: ignore
+                        if key in completed_params_keys:
+                            n_skipped += 1
+                            continue
 
-                    word_enrichment_model = BertWordEnrichmentStrategy(
-                        enrichment_text=enrichment_text,
-                        bert_model=bert_model,
-                        bert_tokenizer=bert_tokenizer,
-                    )
+                        formulation_params_ids.append(formulation_param.id)
 
-                elif isinstance(word_enrichment_strategy, WordEnrichmentStrategy):
-                    from sesgx_cli.word_enrichment.llm_strategy import (
-                        LLMWordEnrichmentStrategy,
-                    )
+                    if len(formulation_params_ids) > 0:
+                        tasks.append(
+                            SweepTask(
+                                topic_extraction_strategy=topic_extraction_strategy,
+                                word_enrichment_strategy=word_enrichment_strategy,
+                                topic_params_id=topic_param.id,
+                                formulation_params_ids=tuple(formulation_params_ids),
+                            )
+                        )
 
-                    word_enrichment_model = LLMWordEnrichmentStrategy(
-                        enrichment_text=enrichment_text,
-                        model=word_enrichment_strategy.value,
-                    )
+                n_params_by_strategies[strategies] = n_params
+                n_done_by_strategies[strategies] = n_skipped
+                progress_bar_task_ids[strategies] = progress.add_task(
+                    f"Found [bright_cyan]{n_params}[/bright_cyan] parameters variations for {topic_extraction_strategy.value} with {word_enrichment_strategy.value}, skipped [bright_cyan]{n_skipped}[/bright_cyan]...",
+                    # noqa: E501
+                    total=n_params,
+                    completed=n_skipped,
+                )
 
-                else:
-                    raise RuntimeError(
-                        f"Invalid Similar Word Generation Strategy. Must be: {[e.value for e in WordEnrichmentStrategy]}."
-                        # noqa: E501
-                    )
+            if n_workers > 1:
+                print(f"Generating strings with {n_workers} workers...")
+            else:
+                print("Loading tokenizer and language model...")
+            print()
 
-                for i, (topic_param, formulation_param) in enumerate(
-                    concatenated_params
+            with SweepWriter(
+                experiment_id=experiment.id,
+                session=session,
+                completed_params_keys=completed_params_keys,
+                batch_size=batch_size,
+            ) as writer:
+                for result in run_sweep(
+                    tasks,
+                    settings=SweepSettings(
+                        experiment_id=experiment.id,
+                        max_n_words_per_topic=max_n_words_per_topic,
+                        enrichment_cache_size=enrichment_cache_size,
+                        lda_n_jobs=config.lda_params.n_jobs,
+                        embeddings_cache_dir=embeddings_cache_dir,
+                        model_cache_dir=model_cache_dir,
+                    ),
+                    session=session,
+                    n_workers=n_workers,
                 ):
+                    writer.add(result)
+
+                    topic_extraction_strategy = result.task.topic_extraction_strategy
+                    word_enrichment_strategy = result.task.word_enrichment_strategy
+
+                    strategies = (
+                        topic_extraction_strategy.value,
+                        word_enrichment_strategy.value,
+                    )
+                    n_params = n_params_by_strategies[strategies]
+                    i = n_done_by_strategies[strategies]
+                    n_done_by_strategies[strategies] += 1
+
                     progress.update(
-                        progress_bar_task_id,
+                        progress_bar_task_ids[strategies],
                         advance=1,
                         description=f"{topic_extraction_strategy.value} - {word_enrichment_strategy.value}: Using parameter variation [bright_cyan]{i + 1}[/] of [bright_cyan]{n_params}[/]",
                         # noqa: E501
                         refresh=True,
                     )
 
-                    word_enrichment_model_with_cache = WordEnrichmentCache(
-                        word_enrichment_model=word_enrichment_model,
-                        word_enrichment_strategy=word_enrichment_strategy,
-                        experiment=experiment,
-                        session=session,
-                        n_enrichments=formulation_param.n_enrichments_per_word,
-                    )
-
-                    current_concatenated_params = Params.get_one_or_none(
-                        experiment_id=experiment.id,
-                        formulation_params_id=formulation_param.id,
-                        topic_extraction_strategy=topic_extraction_strategy,
-                        word_enrichment_strategy=word_enrichment_strategy,
-                        bertopic_params_id=topic_param.id,
-                        lda_params_id=topic_param.id,
-                        session=session,
-                    )
-
-                    if current_concatenated_params is not None:
-                        progress.update(
-                            progress_bar_task_id,
-                            description=f"{topic_extraction_strategy.value} - {word_enrichment_strategy.value}: Skipped parameter variation [bright_cyan]{i + 1}[/] of [bright_cyan]{n_params}[/]",
-                            # noqa: E501
-                            refresh=True,
-                        )
-                        continue
-
-                    if (
-                        topic_extraction_strategy == TopicExtractionStrategy.bertopic
-                        and isinstance(topic_param, BERTopicParams)
-                    ):
-                        from sesgx_cli.topic_extraction.bertopic_strategy import (
-                            BERTopicTopicExtractionStrategy,
-                        )
-
-                        topic_extraction_model = BERTopicTopicExtractionStrategy(
-                            kmeans_n_clusters=topic_param.kmeans_n_clusters,
-                            umap_n_neighbors=topic_param.umap_n_neighbors,
-                            max_n_words_per_topic=max_n_words_per_topic,
-                        )
-
-                    elif (
-                        topic_extraction_strategy == TopicExtractionStrategy.lda
-                        and isinstance(topic_param, LDAParams)
-                    ):
-                        from sesgx_cli.topic_extraction.lda_strategy import (
-                            LDATopicExtractionStrategy,
-                        )
-
-                        topic_extraction_model = LDATopicExtractionStrategy(
-                            min_document_frequency=topic_param.min_document_frequency,
-                            n_topics=topic_param.n_topics,
-                            max_n_words_per_topic=max_n_words_per_topic,
-                        )
-
-                    else:
-                        raise RuntimeError(
-                            "Invalid Topic Extraction Strategy or the params instance does not have neither a lda_params or bertopic_params"
-                            # noqa: E501
-                        )
-
-                    topic_extraction_model_with_cache = TopicExtractionCache(
-                        topic_extraction_model=topic_extraction_model,
-                        topic_extraction_strategy=topic_extraction_strategy,
-                        experiment=experiment,
-                        n_words_per_topic=formulation_param.n_words_per_topic,
-                        topic_param=topic_param,
-                        session=session,
-                    )
-
-                    string_formulation_model = ScopusStringFormulationModel(
-                        use_enriched_string_formulation_model=formulation_param.n_enrichments_per_word
-                        > 0,
-                        min_year=slr.min_publication_year,
-                        max_year=slr.max_publication_year,
-                        n_words_per_topic=formulation_param.n_words_per_topic,
-                    )
-
-                    sesg = SeSG(
-                        topic_extraction_model=topic_extraction_model_with_cache,
-                        word_enrichment_model=word_enrichment_model_with_cache,
-                        string_formulation_model=string_formulation_model,
-                    )
-
-                    string = sesg.generate(docs)
-
-                    db_search_string = SearchString.get_or_save_by_string(
-                        string,
-                        session,
-                    )
-
-                    if (
-                        topic_extraction_strategy == TopicExtractionStrategy.lda
-                        and isinstance(topic_param, LDAParams)
-                    ):
-                        concatenated_params = Params(
-                            experiment_id=experiment.id,
-                            experiment=experiment,
-                            lda_params_id=topic_param.id,
-                            lda_params=topic_param,
-                            formulation_params_id=formulation_param.id,
-                            formulation_params=formulation_param,
-                            word_enrichment_strategy=word_enrichment_strategy.value,
-                            search_string_id=db_search_string.id,
-                            search_string=db_search_string,
-                        )
-
-                    elif (
-                        topic_extraction_strategy == TopicExtractionStrategy.bertopic
-                        and isinstance(topic_param, BERTopicParams)
-                    ):
-                        concatenated_params = Params(
-                            experiment_id=experiment.id,
-                            experiment=experiment,
-                            bertopic_params_id=topic_param.id,
-                            bertopic_params=topic_param,
-                            formulation_params_id=formulation_param.id,
-                            formulation_params=formulation_param,
-                            word_enrichment_strategy=word_enrichment_strategy.value,
-                            search_string_id=db_search_string.id,
-                            search_string=db_search_string,
-                        )
-                    else:
-                        raise RuntimeError(
-                            "Invalid Topic Extraction Strategy or the params instance does not have neither a lda_params or bertopic_params"
-                            # noqa: E501
-                        )
-
-                    session.add(concatenated_params)
-                    session.commit()
-
                     if send_telegram_report:
                         if i + 1 in (
                             1,  # 0% - of total params variations
@@ -424,6 +382,7 @@ async def start(  # noqa: C901 - method too complex
                                 word_enrichment_strategy=word_enrichment_strategy,
                             )
 
+            for progress_bar_task_id in progress_bar_task_ids.values():
                 progress.remove_task(progress_bar_task_id)
 
     if send_telegram_report:
@@ -1,23 +1,39 @@
 import asyncio
 from dataclasses import dataclass, field
-from functools import wraps
+from functools import partial, wraps
+from itertools import groupby
+from operator import attrgetter
 from pathlib import Path
 from time import time
-from typing import Callable
+from typing import TYPE_CHECKING, Callable, Optional
 
 import typer
 from rich import print
-from rich.progress import BarColumn, Progress, TaskProgressColumn, TextColumn
+from rich.progress import BarColumn, Progress, TaskProgressColumn, TextColumn, track
 
 from sesgx_cli.async_typer import AsyncTyper
 from sesgx_cli.database.connection import Session
 from sesgx_cli.database.models import (
+    SLR,
     Experiment,
     SearchStringPerformance,
+    SearchStringResults,
 )
 from sesgx_cli.experiment_config import ExperimentConfig
+from sesgx_cli.scopus_key_pool import (
+    ScopusKeyPool,
+    map_in_order,
+    search_with_key_pool,
+)
 from sesgx_cli.telegram_report_scopus import TelegramReportScopus
 
+if TYPE_CHECKING:
+    from sesgx_cli.evaluation_factory import (
+        Evaluation,
+        EvaluationFactory,
+        IncrementalEvaluation,
+    )
+
 telegram_report = TelegramReportScopus()
 
 
@@ -68,6 +84,126 @@ def catch_exception():
 app = AsyncTyper(rich_markup_mode="markdown", help="Perform Scopus searches.")
 
 
+@dataclass
+class ScopusSearchResults:
+    """What is kept from the results of a Scopus search.
+
+    Instead of the entries returned by Scopus, only their titles are kept, to be evaluated
+    at the end. With an incremental evaluation, the titles are matched as they arrive
+    instead, and are not kept. With `save_chunk`, the titles and EIDs are saved every
+    `chunk_size` entries, so storing them does not keep them in memory either.
+
+    Attributes:
+        n_results (int): Number of entries returned by Scopus.
+        titles (list[str]): Titles to evaluate, without an incremental evaluation.
+        incremental_evaluation (Optional[IncrementalEvaluation]): Evaluation that receives the titles as they arrive.
+        save_chunk (Optional[Callable[[int, list[Optional[str]], list[Optional[str]]], None]]): Receives the index, titles and EIDs of each chunk of entries, with None for the missing ones.
+        chunk_size (int): Number of entries of each saved chunk.
+    """  # noqa: E501
+
+    n_results: int = 0
+    titles: list[str] = field(default_factory=list)
+    incremental_evaluation: Optional["IncrementalEvaluation"] = None
+    save_chunk: Optional[
+        Callable[[int, list[Optional[str]], list[Optional[str]]], None]
+    ] = None
+    chunk_size: int = 5_000
+    _n_chunks: int = field(init=False, default=0)
+    _chunk_titles: list[Optional[str]] = field(init=False, default_factory=list)
+    _chunk_eids: list[Optional[str]] = field(init=False, default_factory=list)
+
+    def add_entries(self, entries: list[dict]) -> None:
+        self.n_results += len(entries)
+
+        # entries without a title are not evaluated, but empty titles are
+        titles = [e["dc:title"] for e in entries if "dc:title" in e]
+        if self.incremental_evaluation is not None:
+            self.incremental_evaluation.add(titles)
+        else:
+            self.titles.extend(titles)
+
+        if self.save_chunk is not None:
+            self._chunk_titles.extend(e.get("dc:title") for e in entries)
+            self._chunk_eids.extend(e.get("eid") for e in entries)
+
+            if len(self._chunk_titles) >= self.chunk_size:
+                self.flush()
+
+    def flush(self) -> None:
+        """Saves the entries not saved yet, in a last chunk.
+
+        A string without results still gets an empty chunk, so it is known to have none.
+        """
+        if self.save_chunk is None:
+            return
+
+        if len(self._chunk_titles) == 0 and self._n_chunks > 0:
+            return
+
+        self.save_chunk(self._n_chunks, self._chunk_titles, self._chunk_eids)
+
+        self._n_chunks += 1
+        self._chunk_titles = []
+        self._chunk_eids = []
+
+    def evaluate(self, evaluation_factory: "EvaluationFactory") -> "Evaluation":
+        if self.incremental_evaluation is not None:
+            return self.incremental_evaluation.evaluate()
+
+        return evaluation_factory.evaluate(self.titles)
+
+
+def create_evaluation_factory(experiment: Experiment) -> "EvaluationFactory":
+    """Creates an evaluation factory with the GS of the experiment's SLR and the experiment's QGS."""  # noqa: E501
+    from sesgx_cli.evaluation_factory import EvaluationFactory, Study
+
+    evaluation_gs = [
+        Study(
+            id=s.id,
+            title=s.title,
+            references=[Study(id=ref.id, title=ref.title) for ref in s.references],
+        )
+        for s in experiment.slr.gs
+    ]
+
+    evaluation_qgs = [
+        Study(
+            id=s.id,
+            title=s.title,
+            references=[Study(id=ref.id, title=ref.title) for ref in s.references],
+        )
+        for s in experiment.qgs
+    ]
+
+    return EvaluationFactory(
+        gs=evaluation_gs,
+        qgs=evaluation_qgs,
+    )
+
+
+def create_performance(
+    evaluation: "Evaluation",
+    *,
+    slr: SLR,
+    n_scopus_results: int,
+    search_string_id: int,
+) -> SearchStringPerformance:
+    """Creates the performance of a search string from its evaluation."""
+    return SearchStringPerformance.from_studies_lists(
+        n_scopus_results=n_scopus_results,
+        qgs_in_scopus=[slr.get_study_by_id(s.id) for s in evaluation.qgs_in_scopus],
+        gs_in_scopus=[slr.get_study_by_id(s.id) for s in evaluation.gs_in_scopus],
+        gs_in_bsb=[slr.get_study_by_id(s.id) for s in evaluation.gs_in_bsb],
+        gs_in_sb=[slr.get_study_by_id(s.id) for s in evaluation.gs_in_sb],
+        start_set_precision=evaluation.start_set_precision,
+        start_set_recall=evaluation.start_set_recall,
+        start_set_f1_score=evaluation.start_set_f1_score,
+        bsb_recall=evaluation.bsb_recall,
+        sb_recall=evaluation.sb_recall,
+        search_string_id=search_string_id,
+    )
+
+
 @app.async_command()
 @catch_exception()
 async def search(  # noqa: C901
@@ -88,12 +224,45 @@ async def search(  # noqa: C901
         help="Send experiment report to telegram.",
         show_default=True,
     ),
+    concurrency: int = typer.Option(
+        1,
+        "--concurrency",
+        "-n",
+        help="Number of search strings searched at the same time, spread over the Scopus API keys.",  # noqa: E501
+        min=1,
+        show_default=True,
+    ),
+    incremental_matching: bool = typer.Option(
+        True,
+        "--incremental-matching/--no-incremental-matching",
+        help="Match the Scopus titles against the GS as pages arrive, with a TF-IDF vocabulary fitted only on the GS, instead of keeping every title to fit a vocabulary per string.",  # noqa: E501
+        show_default=True,
+    ),
+    store_results: bool = typer.Option(
+        True,
+        "--store-results/--no-store-results",
+        help="Store the titles and EIDs returned by Scopus, so the strings can be reevaluated offline with `sesg scopus reevaluate`.",  # noqa: E501
+        show_default=True,
+    ),
 ):
-    """Searches the strings of the experiment on Scopus."""
+    """Searches the strings of the experiment on Scopus.
+
+    With `--concurrency`, several strings are searched at the same time, each one using the
+    Scopus API key with the least searches in flight. A key that runs out of quota (or gets a
+    429) is put on cooldown and the string is searched again with another key. Any other error
+    stops the search. Performances are saved in the same order of the strings, and a string
+    only starts once the oldest one is saved, so at most `--concurrency` strings are searched
+    or waiting to be saved at any time.
+
+    By default, the titles are matched as pages arrive, and the stored results are saved in
+    chunks while paginating, so memory does not grow with the number of results. The
+    similarities may slightly differ from the ones of the baseline, which fits a TF-IDF
+    vocabulary per string. Use `--no-incremental-matching` to keep every title and match
+    them as the baseline did, or `sesg scopus reevaluate` to do it from the stored results.
+    """  # noqa: E501
     start_time = time()
-    from scopus_client import InvalidStringError, ScopusClient
-
-    from sesgx_cli.evaluation_factory import EvaluationFactory, Study
+    from scopus_client import InvalidStringError, OutOfAPIKeysError, ScopusClient
+    from sqlalchemy import delete
 
     with Session() as session:
         experiment = Experiment.get_by_name(experiment_name, session)
@@ -105,6 +274,12 @@ async def search(  # noqa: C901
         search_strings_list = experiment.get_search_strings_without_performance(session)
         n_strings = len(search_strings_list)
 
+        # read upfront, since committing the performances expires the loaded objects
+        search_strings: list[tuple[int, str]] = [
+            (search_string.id, search_string.string)
+            for search_string in search_strings_list
+        ]
+
         if send_telegram_report:
             telegram_report.set_attrs(
                 slr_name=slr.name,
@@ -127,30 +302,55 @@ async def search(  # noqa: C901
                 )
                 await telegram_report.resume_execution()
 
-        evaluation_gs = [
-            Study(
-                id=s.id,
-                title=s.title,
-                references=[Study(id=ref.id, title=ref.title) for ref in s.references],
-            )
-            for s in slr.gs
-        ]
+        evaluation_factory = create_evaluation_factory(experiment)
 
-        evaluation_qgs = [
-            Study(
-                id=s.id,
-                title=s.title,
-                references=[Study(id=ref.id, title=ref.title) for ref in s.references],
+        key_pool = ScopusKeyPool(
+            config.scopus_api_keys,
+            client_factory=lambda key: ScopusClient([key]),
+            # raised by the client, with its single key, when the key is out of quota
+            quota_errors=(OutOfAPIKeysError,),
+        )
+
+        def save_results_chunk(
+            search_string_id: int,
+            chunk_index: int,
+            titles: list[Optional[str]],
+            eids: list[Optional[str]],
+        ) -> None:
+            chunk = SearchStringResults.from_titles_and_eids(
+                search_string_id=search_string_id,
+                titles=titles,
+                eids=eids,
+                chunk_index=chunk_index,
             )
-            for s in experiment.qgs
-        ]
 
-        evaluation_factory = EvaluationFactory(
-            gs=evaluation_gs,
-            qgs=evaluation_qgs,
-        )
+            # committed along with the next performance, without keeping the chunk in
+            # the session
+            session.add(chunk)
+            session.flush()
+            session.expunge(chunk)
+
+        def create_results(search_string_id: int) -> ScopusSearchResults:
+            save_chunk = None
+            if store_results:
+                # replaces the results of a previous, or interrupted, search of the string
+                session.execute(
+                    delete(SearchStringResults).where(
+                        SearchStringResults.search_string_id == search_string_id
+                    )
+                )
+                save_chunk = partial(save_results_chunk, search_string_id)
 
-        client = ScopusClient(config.scopus_api_keys)
+            incremental_evaluation = None
+            if incremental_matching:
+                incremental_evaluation = (
+                    evaluation_factory.create_incremental_evaluation()
+                )
+
+            return ScopusSearchResults(
+                incremental_evaluation=incremental_evaluation,
+                save_chunk=save_chunk,
+            )
 
         with Progress(
             TextColumn(
@@ -164,7 +364,10 @@ async def search(  # noqa: C901
                 total=n_strings,
             )
 
-            for i, search_string in enumerate(search_strings_list):
+            async def search_string_on_scopus(
+                search_string_id: int,
+                string: str,
+            ) -> SearchStringPerformance:
                 progress_task = progress.add_task(
                     "Paginating",
                 )
@@ -179,54 +382,30 @@ async def search(  # noqa: C901
                     callback=timer_callback,
                 )
 
-                results: list[dict] = []
+                def on_page(page) -> None:
+                    progress.update(
+                        progress_task,
+                        total=page.n_pages,
+                        advance=1,
+                    )
+
+                    timer.reset()
 
                 try:
                     timer.start()
 
-                    async for page in client.search(search_string.string):
-                        progress.update(
-                            progress_task,
-                            total=page.n_pages,
-                            advance=1,
-                        )
-
-                        results.extend(page.entries)
-                        timer.reset()
-
-                    evaluation = evaluation_factory.evaluate(
-                        [r["dc:title"] for r in results if "dc:title" in r]
-                    )
-                    performance = SearchStringPerformance.from_studies_lists(
-                        n_scopus_results=len(results),
-                        qgs_in_scopus=[
-                            slr.get_study_by_id(s.id) for s in evaluation.qgs_in_scopus
-                        ],
-                        gs_in_scopus=[
-                            slr.get_study_by_id(s.id) for s in evaluation.gs_in_scopus
-                        ],
-                        gs_in_bsb=[
-                            slr.get_study_by_id(s.id) for s in evaluation.gs_in_bsb
-                        ],
-                        gs_in_sb=[
-                            slr.get_study_by_id(s.id) for s in evaluation.gs_in_sb
-                        ],
-                        start_set_precision=evaluation.start_set_precision,
-                        start_set_recall=evaluation.start_set_recall,
-                        start_set_f1_score=evaluation.start_set_f1_score,
-                        bsb_recall=evaluation.bsb_recall,
-                        sb_recall=evaluation.sb_recall,
-                        search_string_id=search_string.id,
+                    results = await search_with_key_pool(
+                        string,
+                        key_pool,
+                        on_page=on_page,
+                        create_results=partial(create_results, search_string_id),
                     )
 
-                    session.add(performance)
-                    session.commit()
-
                 except InvalidStringError:
                     print("The following string raised an InvalidStringError")
-                    print(search_string.string)
+                    print(string)
 
-                    performance = SearchStringPerformance(
+                    invalid_string_performance = SearchStringPerformance(
                         n_scopus_results=-1,
                         qgs_in_scopus=[],
                         gs_in_bsb=[],
@@ -241,33 +420,152 @@ async def search(  # noqa: C901
                         start_set_f1_score=0,
                         bsb_recall=0,
                         sb_recall=0,
-                        search_string_id=search_string.id,
+                        search_string_id=search_string_id,
                     )
 
-                    session.add(performance)
-                    session.commit()
+                    return invalid_string_performance
 
                 finally:
                     progress.remove_task(progress_task)
-                    progress.advance(overall_task)
                     timer.stop()
 
-                if send_telegram_report:
-                    if i + 1 in (
-                        1,  # 0% - of total params variations
-                        int(n_strings * 0.25),  # 25%
-                        int(n_strings * 0.50),  # 50%
-                        int(n_strings * 0.75),  # 75%
-                    ):
-                        await telegram_report.send_progress_report(
-                            idx_string=i + 1,
-                            percentage=int(((i + 1) / n_strings) * 100)
-                            if i != 0
-                            else 0,
-                            exec_time=time() - start_time,
-                        )
+                results.flush()
+
+                return create_performance(
+                    results.evaluate(evaluation_factory),
+                    slr=slr,
+                    n_scopus_results=results.n_results,
+                    search_string_id=search_string_id,
+                )
+
+            # the strings are searched concurrently, but their performances are saved in
+            # the same order of the strings
+            searches = map_in_order(
+                lambda search_string: search_string_on_scopus(*search_string),
+                search_strings,
+                concurrency=concurrency,
+            )
+
+            try:
+                i = 0
+                async for performance in searches:
+                    session.add(performance)
+                    session.commit()
+
+                    progress.advance(overall_task)
+
+                    if send_telegram_report:
+                        if i + 1 in (
+                            1,  # 0% - of total params variations
+                            int(n_strings * 0.25),  # 25%
+                            int(n_strings * 0.50),  # 50%
+                            int(n_strings * 0.75),  # 75%
+                        ):
+                            await telegram_report.send_progress_report(
+                                idx_string=i + 1,
+                                percentage=int(((i + 1) / n_strings) * 100)
+                                if i != 0
+                                else 0,
+                                exec_time=time() - start_time,
+                            )
+
+                    i += 1
+
+            finally:
+                # cancels the searches still running if saving fails
+                await searches.aclose()
 
             progress.remove_task(overall_task)
 
+        print(f"Scopus API keys usage: {key_pool}")
+
     if send_telegram_report:
         await telegram_report.send_finish_report(exec_time=time() - start_time)
+
+
+@app.command()
+def reevaluate(
+    experiment_name: str = typer.Argument(
+        ...,
+        help="Name of the experiment to reevaluate the search strings of.",
+    ),
+    batch_matching: bool = typer.Option(
+        False,
+        "--batch-matching",
+        help="Match the titles of every string at once, with a TF-IDF vocabulary fitted only on the GS (like `search --incremental-matching`), instead of one vocabulary per string.",  # noqa: E501
+        show_default=True,
+    ),
+):
+    """Recomputes the performance of the search strings of the experiment from the Scopus results stored by `sesg scopus search`.
+
+    No Scopus request is made. The performances of the strings with stored results are
+    replaced, and the other strings are left as they are.
+    """  # noqa: E501
+    from sqlalchemy import select
+
+    with Session() as session:
+        experiment = Experiment.get_by_name(experiment_name, session)
+
+        print("Retrieving stored Scopus results...")
+        stored_results = experiment.get_search_strings_results(session)
+
+        if len(stored_results) == 0:
+            print("[yellow]No stored Scopus results for this experiment.")
+            raise typer.Exit()
+
+        evaluation_factory = create_evaluation_factory(experiment)
+
+        search_string_ids: list[int] = []
+        n_scopus_results: list[int] = []
+        titles_sets: list[list[str]] = []
+
+        for search_string_id, chunks in groupby(
+            stored_results,
+            key=attrgetter("search_string_id"),
+        ):
+            string_chunks = list(chunks)
+
+            search_string_ids.append(search_string_id)
+            n_scopus_results.append(
+                sum(chunk.n_scopus_results for chunk in string_chunks)
+            )
+            titles_sets.append(
+                [
+                    t
+                    for chunk in string_chunks
+                    for t in chunk.get_titles()
+                    if t is not None
+                ]
+            )
+
+        if batch_matching:
+            evaluations = evaluation_factory.evaluate_many(titles_sets)
+        else:
+            evaluations = [
+                evaluation_factory.evaluate(titles)
+                for titles in track(titles_sets, description="Evaluating")
+            ]
+
+        stmt = select(SearchStringPerformance).where(
+            SearchStringPerformance.search_string_id.in_(search_string_ids)
+        )
+        for old_performance in session.execute(stmt).scalars():
+            session.delete(old_performance)
+
+        # the old performances must be deleted before inserting the new ones
+        session.flush()
+
+        session.add_all(
+            create_performance(
+                evaluation,
+                slr=experiment.slr,
+                n_scopus_results=n,
+                search_string_id=search_string_id,
+            )
+            for evaluation, n, search_string_id in zip(
+                evaluations, n_scopus_results, search_string_ids
+            )
+        )
+        session.commit()
+
+    print(f"Reevaluated {len(search_string_ids)} search strings.")
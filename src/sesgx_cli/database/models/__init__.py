@@ -16,6 +16,7 @@ from .lda_params import LDAParams
 from .params import Params
 from .search_string import SearchString
 from .search_string_performance import SearchStringPerformance
+from .search_string_results import SearchStringResults
 from .slr import SLR
 from .study import Study
 from .topics_cache import TopicsExtractedCache
@@ -37,6 +38,7 @@ __all__ = (
     "Study",
     "SearchString",
     "SearchStringPerformance",
+    "SearchStringResults",
     "EnrichedWordsCacheKey",
     "CachedEnrichedWords",
     "TopicsExtractedCache",
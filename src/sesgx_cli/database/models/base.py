@@ -1,8 +1,15 @@
+from typing import Any, Sequence, TypeVar
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import (
     DeclarativeBase,
     MappedAsDataclass,
+    Session,
 )
 
+T = TypeVar("T", bound="Base")
+
 
 class Base(DeclarativeBase, MappedAsDataclass):
     ...
@@ -22,3 +29,57 @@ class Base(DeclarativeBase, MappedAsDataclass):
         parameters = ", ".join(f"{k}={v}" for k, v in props.items())
 
         return f"{self.__class__.__name__}({parameters})"
+
+    @classmethod
+    def get_or_save_many(
+        cls: type[T],
+        columns: Sequence[str],
+        rows: Sequence[tuple[Any, ...]],
+        session: Session,
+    ) -> list[T]:
+        """Retrieves an instance for each row of values, saving the ones that do not exist.
+
+        Existing instances are retrieved with a single `SELECT ... WHERE (columns) IN (rows)`.
+        If some are missing, they are saved with a single `INSERT ... ON CONFLICT DO NOTHING`,
+        and the rows are selected again after the commit. The columns must be covered by an
+        unique constraint.
+
+        Args:
+            columns (Sequence[str]): Names of the columns that identify an instance.
+            rows (Sequence[tuple[Any, ...]]): Values of the columns, one tuple per instance.
+            session (Session): Database session.
+
+        Returns:
+            List with an instance for each row, in the same order.
+        """  # noqa: E501
+        unique_rows = list(dict.fromkeys(rows))
+
+        if len(unique_rows) == 0:
+            return []
+
+        stmt = select(cls).where(
+            tuple_(*(getattr(cls, c) for c in columns)).in_(unique_rows)
+        )
+
+        def get_instances_by_row() -> dict[tuple[Any, ...], T]:
+            return {
+                tuple(getattr(instance, c) for c in columns): instance
+                for instance in session.execute(stmt).scalars()
+            }
+
+        instances_by_row = get_instances_by_row()
+        missing_rows = [r for r in unique_rows if r not in instances_by_row]
+
+        if len(missing_rows) > 0:
+            insert_stmt = (
+                insert(cls)
+                .values([dict(zip(columns, r)) for r in missing_rows])
+                .on_conflict_do_nothing(index_elements=list(columns))
+            )
+
+            session.execute(insert_stmt)
+            session.commit()
+
+            instances_by_row = get_instances_by_row()
+
+        return [instances_by_row[r] for r in rows]
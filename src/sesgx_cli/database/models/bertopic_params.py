@@ -74,14 +74,13 @@ class BERTopicParams(Base):
         umap_n_neighbors_list: list[int],
         session: Session,
     ) -> list["BERTopicParams"]:
-        return [
-            BERTopicParams.get_or_save(
-                kmeans_n_clusters=kmeans_n_clusters,
-                umap_n_neighbors=umap_n_neighbors,
-                session=session,
-            )
-            for kmeans_n_clusters, umap_n_neighbors in product(
-                kmeans_n_clusters_list,
-                umap_n_neighbors_list,
-            )
-        ]
+        return cls.get_or_save_many(
+            columns=("kmeans_n_clusters", "umap_n_neighbors"),
+            rows=list(
+                product(
+                    kmeans_n_clusters_list,
+                    umap_n_neighbors_list,
+                )
+            ),
+            session=session,
+        )
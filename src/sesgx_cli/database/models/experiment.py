@@ -17,6 +17,7 @@ from .base import Base
 if TYPE_CHECKING:
     from .enriched_words_cache_key import EnrichedWordsCacheKey
     from .params import Params
+    from .search_string_results import SearchStringResults
     from .slr import SLR
     from .study import Study
     from .topics_cache import TopicsExtractedCache
@@ -122,6 +123,34 @@ class Experiment(Base):
 
         return list(unique_results.values())
 
+    def get_search_strings_results(
+        self,
+        session: Session,
+    ) -> list["SearchStringResults"]:
+        """Retrieves the stored Scopus results of the search strings of the experiment.
+
+        Only the strings with a performance are considered, since the results of the other
+        ones may be incomplete. The chunks are ordered by string and chunk index.
+        """  # noqa: E501
+        from .params import Params
+        from .search_string import SearchString
+        from .search_string_results import SearchStringResults
+
+        stmt = (
+            select(SearchStringResults)
+            .join(SearchStringResults.search_string)
+            .join(SearchString.performance)
+            .join(SearchString.params_list)
+            .where(Params.experiment_id == self.id)
+            .distinct()
+            .order_by(
+                SearchStringResults.search_string_id,
+                SearchStringResults.chunk_index,
+            )
+        )
+
+        return list(session.execute(stmt).scalars().all())
+
     def get_docs(self):
         docs = create_docs(
             [
@@ -68,14 +68,13 @@ class FormulationParams(Base):
         n_enrichments_per_word_list: list[int],
         session: Session,
     ) -> list["FormulationParams"]:
-        return [
-            FormulationParams.get_or_save(
-                n_words_per_topic=n_words_per_topic,
-                n_enrichments_per_word=n_enrichments_per_word,
-                session=session,
-            )
-            for n_words_per_topic, n_enrichments_per_word in product(
-                n_words_per_topic_list,
-                n_enrichments_per_word_list,
-            )
-        ]
+        return cls.get_or_save_many(
+            columns=("n_words_per_topic", "n_enrichments_per_word"),
+            rows=list(
+                product(
+                    n_words_per_topic_list,
+                    n_enrichments_per_word_list,
+                )
+            ),
+            session=session,
+        )
@@ -28,6 +28,10 @@ class LDAParams(Base):
 
     min_document_frequency: Mapped[float] = mapped_column(Float())
     n_topics: Mapped[int] = mapped_column(Integer())
+    # early stopping changes the extracted topics, so it identifies the params too
+    evaluate_every: Mapped[int] = mapped_column(
+        Integer(), default=-1, server_default="-1"
+    )
 
     params: Mapped[list["Params"]] = relationship(
         back_populates="lda_params",
@@ -39,7 +43,9 @@ class LDAParams(Base):
         default_factory=list,
     )
 
-    __table_args__ = (UniqueConstraint("min_document_frequency", "n_topics"),)
+    __table_args__ = (
+        UniqueConstraint("min_document_frequency", "n_topics", "evaluate_every"),
+    )
 
     @classmethod
     def get_or_save(
@@ -47,11 +53,13 @@ class LDAParams(Base):
         n_topics: int,
         min_document_frequency: float,
         session: Session,
+        evaluate_every: int = -1,
     ):
         stmt = (
             select(LDAParams)
             .where(LDAParams.n_topics == n_topics)
             .where(LDAParams.min_document_frequency == min_document_frequency)
+            .where(LDAParams.evaluate_every == evaluate_every)
         )
 
         params = session.execute(stmt).scalar_one_or_none()
@@ -60,6 +68,7 @@ class LDAParams(Base):
             params = LDAParams(
                 min_document_frequency=min_document_frequency,
                 n_topics=n_topics,
+                evaluate_every=evaluate_every,
             )
 
             session.add(params)
@@ -74,15 +83,16 @@ class LDAParams(Base):
         n_topics_list: list[int],
         min_document_frequency_list: list[float],
         session: Session,
+        evaluate_every: int = -1,
     ) -> list["LDAParams"]:
-        return [
-            LDAParams.get_or_save(
-                n_topics=n_topics,
-                min_document_frequency=min_doc_freq,
-                session=session,
-            )
-            for n_topics, min_doc_freq in product(
-                n_topics_list,
-                min_document_frequency_list,
-            )
-        ]
+        return cls.get_or_save_many(
+            columns=("n_topics", "min_document_frequency", "evaluate_every"),
+            rows=list(
+                product(
+                    n_topics_list,
+                    min_document_frequency_list,
+                    [evaluate_every],
+                )
+            ),
+            session=session,
+        )
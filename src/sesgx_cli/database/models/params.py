@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, NamedTuple, Optional
 
 from sqlalchemy import (
     CheckConstraint,
@@ -27,6 +27,22 @@ if TYPE_CHECKING:
     from .search_string import SearchString
 
 
+class ParamsKey(NamedTuple):
+    """Identifies the params of an experiment.
+
+    Args:
+        topic_extraction_strategy (str): Value of the topic extraction strategy.
+        word_enrichment_strategy (str): Value of the word enrichment strategy.
+        topic_params_id (int): ID of the `LDAParams` or `BERTopicParams`.
+        formulation_params_id (int): ID of the `FormulationParams`.
+    """
+
+    topic_extraction_strategy: str
+    word_enrichment_strategy: str
+    topic_params_id: int
+    formulation_params_id: int
+
+
 class Params(Base):
     __tablename__ = "params"
 
@@ -126,6 +142,50 @@ class Params(Base):
 
         return session.execute(stmt).scalar_one_or_none()
 
+    @classmethod
+    def get_keys_by_experiment(
+        cls,
+        experiment_id: int,
+        session: Session,
+    ) -> set[ParamsKey]:
+        """Retrieves the keys of all params of the experiment with a single query."""
+        stmt = select(
+            Params.word_enrichment_strategy,
+            Params.formulation_params_id,
+            Params.lda_params_id,
+            Params.bertopic_params_id,
+        ).where(Params.experiment_id == experiment_id)
+
+        keys: set[ParamsKey] = set()
+
+        for (
+            word_enrichment_strategy,
+            formulation_params_id,
+            lda_params_id,
+            bertopic_params_id,
+        ) in session.execute(stmt):
+            if lda_params_id is not None:
+                keys.add(
+                    ParamsKey(
+                        topic_extraction_strategy=TopicExtractionStrategy.lda.value,
+                        word_enrichment_strategy=word_enrichment_strategy,
+                        topic_params_id=lda_params_id,
+                        formulation_params_id=formulation_params_id,
+                    )
+                )
+
+            if bertopic_params_id is not None:
+                keys.add(
+                    ParamsKey(
+                        topic_extraction_strategy=TopicExtractionStrategy.bertopic.value,  # noqa: E501
+                        word_enrichment_strategy=word_enrichment_strategy,
+                        topic_params_id=bertopic_params_id,
+                        formulation_params_id=formulation_params_id,
+                    )
+                )
+
+        return keys
+
     # @classmethod
     # def create_with_lda_params(
     #     cls,
@@ -4,6 +4,7 @@ from sqlalchemy import (
     Text,
     select,
 )
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import (
     Mapped,
     Session,
@@ -16,6 +17,7 @@ from .base import Base
 if TYPE_CHECKING:
     from .params import Params
     from .search_string_performance import SearchStringPerformance
+    from .search_string_results import SearchStringResults
 
 
 class SearchString(Base):
@@ -34,6 +36,12 @@ class SearchString(Base):
         default=None,
     )
 
+    results: Mapped[list["SearchStringResults"]] = relationship(
+        back_populates="search_string",
+        default_factory=list,
+        order_by="SearchStringResults.chunk_index",
+    )
+
     @classmethod
     def get_or_save_by_string(
         cls,
@@ -55,6 +63,49 @@ class SearchString(Base):
 
         return search_string
 
+    @classmethod
+    def get_or_save_many_by_string(
+        cls,
+        strings: list[str],
+        session: Session,
+    ) -> dict[str, int]:
+        """Retrieves the ID of each string, saving the ones that do not exist.
+
+        New strings are saved with a single `INSERT ... ON CONFLICT (string) DO NOTHING RETURNING id`,
+        and the IDs of the existing ones are retrieved with a single `SELECT`. Does not commit the session.
+
+        Args:
+            strings (list[str]): Search strings.
+            session (Session): Database session.
+
+        Returns:
+            A dictionary mapping each string to its ID.
+        """  # noqa: E501
+        unique_strings = list(dict.fromkeys(strings))
+
+        if len(unique_strings) == 0:
+            return {}
+
+        insert_stmt = (
+            insert(SearchString)
+            .values([{"string": string} for string in unique_strings])
+            .on_conflict_do_nothing(index_elements=["string"])
+            .returning(SearchString.id, SearchString.string)
+        )
+
+        ids = {string: id for id, string in session.execute(insert_stmt)}
+
+        existing_strings = [s for s in unique_strings if s not in ids]
+
+        if len(existing_strings) > 0:
+            stmt = select(SearchString.id, SearchString.string).where(
+                SearchString.string.in_(existing_strings)
+            )
+
+            ids.update({string: id for id, string in session.execute(stmt)})
+
+        return ids
+
     @classmethod
     def get_by_id(cls, id: int, session: Session):
         stmt = select(SearchString).where(SearchString.id == id)
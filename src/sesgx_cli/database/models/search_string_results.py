@@ -0,0 +1,87 @@
+import zlib
+from typing import TYPE_CHECKING, Optional
+
+from sqlalchemy import ForeignKey, Integer, LargeBinary
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from .base import Base
+
+if TYPE_CHECKING:
+    from .search_string import SearchString
+
+_SEPARATOR = "\0"
+# stands for a missing value, which is not the same as an empty string
+_MISSING = "\1"
+
+
+def _compress_column(values: list[Optional[str]]) -> bytes:
+    return zlib.compress(
+        _SEPARATOR.join(_MISSING if v is None else v for v in values).encode("utf8")
+    )
+
+
+def _decompress_column(data: bytes, n_values: int) -> list[Optional[str]]:
+    # an empty string is also the result of joining a single empty value
+    if n_values == 0:
+        return []
+
+    return [
+        None if v == _MISSING else v
+        for v in zlib.decompress(data).decode("utf8").split(_SEPARATOR)
+    ]
+
+
+class SearchStringResults(Base):
+    """Chunk of the raw results returned by Scopus for a search string.
+
+    The title and EID of each entry are stored as two zlib compressed columns, aligned by
+    position, so the performance of the string can be recomputed without searching it
+    on Scopus again. Entries without a title or EID have None in its place, while an
+    empty title is kept as an empty string.
+
+    The results are saved in chunks while the string is paginated, so they are never
+    kept in memory at once. The entries of the string are the ones of its chunks, in the
+    order of `chunk_index`.
+    """  # noqa: E501
+
+    __tablename__ = "search_string_results"
+
+    search_string_id: Mapped[int] = mapped_column(
+        ForeignKey("search_string.id"),
+        primary_key=True,
+    )
+    chunk_index: Mapped[int] = mapped_column(Integer(), primary_key=True)
+    search_string: Mapped["SearchString"] = relationship(
+        back_populates="results",
+        init=False,
+    )
+
+    n_scopus_results: Mapped[int] = mapped_column(Integer())
+
+    compressed_titles: Mapped[bytes] = mapped_column(LargeBinary(), repr=False)
+    compressed_eids: Mapped[bytes] = mapped_column(LargeBinary(), repr=False)
+
+    @classmethod
+    def from_titles_and_eids(
+        cls,
+        search_string_id: int,
+        titles: list[Optional[str]],
+        eids: list[Optional[str]],
+        chunk_index: int = 0,
+    ) -> "SearchStringResults":
+        if len(titles) != len(eids):
+            raise RuntimeError("Every Scopus entry must have a title and an EID.")
+
+        return SearchStringResults(
+            search_string_id=search_string_id,
+            chunk_index=chunk_index,
+            n_scopus_results=len(titles),
+            compressed_titles=_compress_column(titles),
+            compressed_eids=_compress_column(eids),
+        )
+
+    def get_titles(self) -> list[Optional[str]]:
+        return _decompress_column(self.compressed_titles, self.n_scopus_results)
+
+    def get_eids(self) -> list[Optional[str]]:
+        return _decompress_column(self.compressed_eids, self.n_scopus_results)
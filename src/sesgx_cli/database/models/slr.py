@@ -9,11 +9,20 @@ from sqlalchemy import (
     Text,
     select,
 )
-from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
+from sqlalchemy.orm import (
+    Mapped,
+    Session,
+    aliased,
+    mapped_column,
+    object_session,
+    relationship,
+)
 
 from .base import Base
 
 if TYPE_CHECKING:
+    from sesgx_cli.citation_graph import CitationGraph
+
     from .experiment import Experiment
     from .study import Study
 
@@ -55,14 +64,83 @@ class SLR(Base):
     def get_study_by_id(self, id: int) -> "Study":
         return self._study_mapping[id]
 
+    def _get_citations(
+        self,
+        use_node_id: bool,
+    ) -> list[tuple[int, Optional[int]]]:
+        """Gets each GS study paired with each of its references, with a single query to the `studies_citations` table.
+
+        Studies without references are paired with None. The rows are ordered by the
+        `Study.id` of the study and then of the reference, like the `gs` and `references`
+        relationships.
+        """  # noqa: E501
+        from .association_tables import studies_citations
+        from .study import Study
+
+        session = object_session(self)
+        if session is None:
+            raise RuntimeError("The SLR must be attached to a session.")
+
+        reference = aliased(Study)
+        study_column = Study.node_id if use_node_id else Study.id
+        reference_column = reference.node_id if use_node_id else reference.id
+
+        stmt = (
+            select(study_column, reference_column)
+            .outerjoin(studies_citations, studies_citations.c.study_id == Study.id)
+            .outerjoin(reference, reference.id == studies_citations.c.reference_id)
+            .where(Study.slr_id == self.id)
+            .order_by(Study.id, studies_citations.c.reference_id)
+        )
+
+        return [(study, ref) for study, ref in session.execute(stmt).all()]
+
+    def get_citation_graph(
+        self,
+        use_node_id: bool = False,
+    ) -> "CitationGraph":
+        """Creates the citation graph of the GS with a single query to the `studies_citations` table.
+
+        Args:
+            use_node_id (bool): Whether to identify the nodes by `Study.node_id` instead of `Study.id`.
+
+        Returns:
+            The citation graph, with an edge from each study to its references.
+        """  # noqa: E501
+        from sesgx_cli.citation_graph import CitationGraph
+
+        rows = self._get_citations(use_node_id)
+        edges = [(study, ref) for study, ref in rows if ref is not None]
+
+        return CitationGraph.from_edges(
+            node_ids=(study for study, _ in rows),
+            sources=(study for study, _ in edges),
+            targets=(ref for _, ref in edges),
+        )
+
     def adjacency_list(
         self,
         use_node_id: bool = False,
     ) -> dict[int, list[int]]:
-        if use_node_id:
-            return {s.node_id: [s.node_id for s in s.references] for s in self.gs}
+        """Creates the adjacency list of the GS citations with a single query.
 
-        return {s.id: [s.id for s in s.references] for s in self.gs}
+        The studies, and the references of each study, are ordered by `Study.id`, as when
+        the adjacency list was built from the `gs` and `references` relationships.
+
+        Args:
+            use_node_id (bool): Whether to identify the studies by `Study.node_id` instead of `Study.id`.
+
+        Returns:
+            A dict mapping each GS study to its references.
+        """  # noqa: E501
+        adjacency_list: dict[int, list[int]] = {}
+
+        for study, ref in self._get_citations(use_node_id):
+            neighbors = adjacency_list.setdefault(study, [])
+            if ref is not None:
+                neighbors.append(ref)
+
+        return adjacency_list
 
     @classmethod
     def from_json(cls, path: Path) -> "SLR":
@@ -110,13 +188,9 @@ class SLR(Base):
 
     def get_graph_statistics(self) -> tuple[int, float]:
         """Returns the number of connected components and the mean degree of the graph"""
-        adjacency_list = self.adjacency_list()
-
-        from networkx import Graph, number_connected_components
+        graph = self.get_citation_graph()
 
-        g = Graph(adjacency_list)
-        number_of_components: int = number_connected_components(g)
-        degrees = [degree for _, degree in g.degree]  # type: ignore
-        mean_degree = sum(degrees) / len(degrees)
+        number_of_components = graph.number_of_connected_components()
+        mean_degree = float(graph.undirected_degrees().mean())
 
         return number_of_components, mean_degree
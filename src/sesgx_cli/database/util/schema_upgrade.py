@@ -0,0 +1,112 @@
+from sqlalchemy import Engine, inspect, text
+
+
+def get_lda_params_upgrade_statements(engine: Engine) -> list[str]:
+    """Gets the statements that bring an existing `lda_params` table to the current schema.
+
+    `Base.metadata.create_all` does not alter tables that already exist, so databases
+    created before `evaluate_every` identified the LDA params lack the column, and keep
+    the unique constraint over `(min_document_frequency, n_topics)` only. The existing
+    rows get `evaluate_every = -1`, which is the behavior they were extracted with.
+
+    Args:
+        engine (Engine): Database engine.
+
+    Returns:
+        List with the statements to execute, empty if the table is up to date or does not exist.
+    """  # noqa: E501
+    inspector = inspect(engine)
+
+    if not inspector.has_table("lda_params"):
+        return []
+
+    statements: list[str] = []
+
+    columns = {column["name"] for column in inspector.get_columns("lda_params")}
+    if "evaluate_every" not in columns:
+        statements.append(
+            "ALTER TABLE lda_params ADD COLUMN evaluate_every INTEGER NOT NULL DEFAULT -1"  # noqa: E501
+        )
+
+    unique_constraints = inspector.get_unique_constraints("lda_params")
+
+    for constraint in unique_constraints:
+        if set(constraint["column_names"]) == {"min_document_frequency", "n_topics"}:
+            statements.append(
+                f'ALTER TABLE lda_params DROP CONSTRAINT "{constraint["name"]}"'
+            )
+
+    if not any(
+        set(constraint["column_names"])
+        == {"min_document_frequency", "n_topics", "evaluate_every"}
+        for constraint in unique_constraints
+    ):
+        statements.append(
+            "ALTER TABLE lda_params ADD CONSTRAINT lda_params_min_document_frequency_n_topics_evaluate_every_key UNIQUE (min_document_frequency, n_topics, evaluate_every)"  # noqa: E501
+        )
+
+    return statements
+
+
+def get_search_string_results_upgrade_statements(engine: Engine) -> list[str]:
+    """Gets the statements that bring an existing `search_string_results` table to the current schema.
+
+    Databases created before the Scopus results were saved in chunks keep a single row per
+    string, identified by `search_string_id` only. The existing rows become the first
+    chunk of their string.
+
+    Args:
+        engine (Engine): Database engine.
+
+    Returns:
+        List with the statements to execute, empty if the table is up to date or does not exist.
+    """  # noqa: E501
+    inspector = inspect(engine)
+
+    if not inspector.has_table("search_string_results"):
+        return []
+
+    statements: list[str] = []
+
+    columns = {
+        column["name"] for column in inspector.get_columns("search_string_results")
+    }
+    if "chunk_index" not in columns:
+        statements.append(
+            "ALTER TABLE search_string_results ADD COLUMN chunk_index INTEGER NOT NULL DEFAULT 0"  # noqa: E501
+        )
+
+    primary_key = inspector.get_pk_constraint("search_string_results")
+
+    if set(primary_key["constrained_columns"]) != {"search_string_id", "chunk_index"}:
+        if primary_key["name"] is not None:
+            statements.append(
+                f'ALTER TABLE search_string_results DROP CONSTRAINT "{primary_key["name"]}"'  # noqa: E501
+            )
+
+        statements.append(
+            "ALTER TABLE search_string_results ADD PRIMARY KEY (search_string_id, chunk_index)"  # noqa: E501
+        )
+
+    return statements
+
+
+def upgrade_tables(engine: Engine) -> list[str]:
+    """Upgrades the existing tables to the current schema, in a single transaction.
+
+    Args:
+        engine (Engine): Database engine.
+
+    Returns:
+        List with the executed statements.
+    """
+    statements = [
+        *get_lda_params_upgrade_statements(engine),
+        *get_search_string_results_upgrade_statements(engine),
+    ]
+
+    with engine.begin() as connection:
+        for statement in statements:
+            connection.execute(text(statement))
+
+    return statements
@@ -7,13 +7,15 @@ string generated by SeSG.
 
 from dataclasses import dataclass, field
 from functools import cached_property
+from typing import Any, Optional
 
+import numpy as np
 from numpy import argsort
 from rapidfuzz.distance import Levenshtein
 from sklearn.feature_extraction.text import TfidfVectorizer  # type: ignore
 from sklearn.metrics.pairwise import cosine_similarity  # type: ignore
 
-from .citation_graph import directed_adjacency_list_to_undirected, snowballing
+from .citation_graph import ReachabilityIndex, directed_adjacency_list_to_undirected
 
 
 def similarity_score(
@@ -84,6 +86,144 @@ def similarity_score(
     return similars
 
 
+class IncrementalTitleMatcher:
+    """Matches titles streamed in chunks against a fixed set of titles.
+
+    Works like [`similarity_score`][sesg.evaluation.evaluation_factory.similarity_score],
+    with `titles` as the small set, but the TF-IDF vocabulary is fitted once (usually on
+    the GS) instead of on both sets. For each title, the most similar streamed title seen
+    so far is kept, and the Levenshtein confirmation only runs on these winners.
+
+    Args:
+        tfidf_vectorizer (Any): A fitted `TfidfVectorizer`.
+        titles (list[str]): Titles to find matches for.
+
+    Examples:
+        >>> titles = ["machine learning", "databases", "search strings"]
+        >>> matcher = IncrementalTitleMatcher(TfidfVectorizer().fit(titles), titles)
+        >>> matcher.update(["databases, an introduction", "machine learning"])
+        >>> matcher.update(["search string"])
+        >>> matcher.get_matches()
+        [0, 2]
+    """  # noqa: E501
+
+    def __init__(  # noqa: D107
+        self,
+        tfidf_vectorizer: Any,
+        titles: list[str],
+    ) -> None:
+        self.tfidf_vectorizer = tfidf_vectorizer
+        self.titles = titles
+        self.tfidf_matrix = tfidf_vectorizer.transform(titles)
+
+        self.best_scores = np.full(len(titles), -1.0)
+        self.best_matches: list[Optional[str]] = [None] * len(titles)
+
+    def update(self, other_titles: list[str]) -> None:
+        """Updates the most similar title of each title with a chunk of other titles."""
+        if len(other_titles) == 0 or len(self.titles) == 0:
+            return
+
+        other_matrix = self.tfidf_vectorizer.transform(other_titles)
+
+        # rows are L2 normalized, so the dot product is the cosine similarity
+        similarity_matrix = (self.tfidf_matrix @ other_matrix.T).toarray()
+
+        closest_indexes = similarity_matrix.argmax(axis=1)
+        closest_scores = similarity_matrix[
+            np.arange(len(self.titles)), closest_indexes
+        ]
+
+        for i in np.flatnonzero(closest_scores > self.best_scores):
+            self.best_scores[i] = closest_scores[i]
+            self.best_matches[i] = other_titles[closest_indexes[i]]
+
+    def get_matches(self) -> list[int]:
+        """Indexes of the titles whose most similar title is also close character-wise."""
+        matches: list[int] = []
+
+        for i, (title, best_match) in enumerate(zip(self.titles, self.best_matches)):
+            if best_match is None:
+                continue
+
+            distance = Levenshtein.distance(title, best_match, score_cutoff=10)
+
+            if distance < 10:
+                matches.append(i)
+
+        return matches
+
+
+def _segment_argmax(
+    matrix: Any,
+    starts: Any,
+) -> Any:
+    """Finds the column of the max value of each row within each segment of columns.
+
+    Ties are broken by the first column, like `numpy.argmax`.
+
+    Args:
+        matrix (npt.NDArray): Dense 2D array.
+        starts (npt.NDArray): Sorted and distinct first column of each segment. A segment ends where the next one starts.
+
+    Returns:
+        Array with shape `(n_rows, n_segments)` with the column of the max of each row in each segment.
+
+    Examples:
+        >>> matrix = np.array([[0.1, 0.3, 0.2, 0.5], [0.4, 0.4, 0.9, 0.1]])
+        >>> _segment_argmax(matrix, np.array([0, 2])).tolist()
+        [[1, 3], [0, 2]]
+    """  # noqa: E501
+    n_columns = matrix.shape[1]
+
+    maxes = np.maximum.reduceat(matrix, starts, axis=1)
+    lengths = np.diff(np.append(starts, n_columns))
+
+    is_max = matrix == np.repeat(maxes, lengths, axis=1)
+    columns = np.where(is_max, np.arange(n_columns), n_columns)
+
+    return np.minimum.reduceat(columns, starts, axis=1)
+
+
+def _confirm_closest_titles(
+    studies_titles: list[str],
+    closest_titles: list[str],
+    *,
+    n_gs: int,
+) -> tuple[list[int], list[int]]:
+    """Confirms the most similar title of each study with the Levenshtein distance.
+
+    Args:
+        studies_titles (list[str]): Processed titles of the GS followed by the ones of the QGS.
+        closest_titles (list[str]): Processed title most similar to each study.
+        n_gs (int): Number of GS studies at the start of `studies_titles`.
+
+    Returns:
+        Tuple with the indexes of the matched GS studies and the matched QGS studies.
+
+    Examples:
+        >>> _confirm_closest_titles(["machine learning", "robotics"], ["machine learnings", "history of medieval agriculture"], n_gs=1)
+        ([0], [])
+    """  # noqa: E501
+    gs_matches: list[int] = []
+    qgs_matches: list[int] = []
+
+    for i, (study_title, closest_title) in enumerate(
+        zip(studies_titles, closest_titles)
+    ):
+        distance = Levenshtein.distance(study_title, closest_title, score_cutoff=10)
+
+        if distance >= 10:
+            continue
+
+        if i < n_gs:
+            gs_matches.append(i)
+        else:
+            qgs_matches.append(i - n_gs)
+
+    return gs_matches, qgs_matches
+
+
 def process_title(
     string: str,
 ) -> str:
@@ -262,6 +402,16 @@ class EvaluationFactory:
         """Undirected adjacency list of the GS."""
         return directed_adjacency_list_to_undirected(self.directed_adjacency_list)
 
+    @cached_property
+    def directed_reachability_index(self) -> ReachabilityIndex:
+        """Reachability of the directed GS graph, used for backward snowballing."""
+        return ReachabilityIndex(self.directed_adjacency_list)
+
+    @cached_property
+    def undirected_reachability_index(self) -> ReachabilityIndex:
+        """Reachability of the undirected GS graph, used for backward and forward snowballing."""  # noqa: E501
+        return ReachabilityIndex(self.undirected_adjacency_list)
+
     def get_qgs_in_scopus(
         self,
         processed_scopus_titles: list[str],
@@ -291,9 +441,8 @@ class EvaluationFactory:
         gs_in_scopus: list[Study],
     ) -> list[Study]:
         """Get GS studies that were found via backward snowballing."""
-        gs_in_bsb = snowballing(
-            adjacency_list=self.directed_adjacency_list,
-            start_set=[s.id for s in gs_in_scopus],
+        gs_in_bsb = self.directed_reachability_index.reachable_from(
+            [s.id for s in gs_in_scopus]
         )
 
         return [self._get_study_by_id(id) for id in gs_in_bsb]
@@ -303,13 +452,42 @@ class EvaluationFactory:
         gs_in_scopus: list[Study],
     ) -> list[Study]:
         """Get GS studies that were found via backward or forward snowballing."""
-        gs_in_bsb = snowballing(
-            adjacency_list=self.undirected_adjacency_list,
-            start_set=[s.id for s in gs_in_scopus],
+        gs_in_bsb = self.undirected_reachability_index.reachable_from(
+            [s.id for s in gs_in_scopus]
         )
 
         return [self._get_study_by_id(id) for id in gs_in_bsb]
 
+    @cached_property
+    def gs_tfidf_vectorizer(self) -> Any:
+        """TF-IDF vectorizer fitted on the preprocessed GS titles."""
+        return TfidfVectorizer().fit(self.processed_gs_titles)
+
+    def create_incremental_evaluation(
+        self,
+        chunk_size: int = 1000,
+    ) -> "IncrementalEvaluation":
+        """Creates an evaluation that receives the Scopus results in chunks.
+
+        See [`IncrementalEvaluation`][sesg.evaluation.evaluation_factory.IncrementalEvaluation].
+
+        Args:
+            chunk_size (int): Number of titles buffered before matching them. Defaults to 1000.
+
+        Returns:
+            An empty incremental evaluation.
+        """  # noqa: E501
+        return IncrementalEvaluation(
+            evaluation_factory=self,
+            gs_matcher=IncrementalTitleMatcher(
+                self.gs_tfidf_vectorizer, self.processed_gs_titles
+            ),
+            qgs_matcher=IncrementalTitleMatcher(
+                self.gs_tfidf_vectorizer, self.processed_qgs_titles
+            ),
+            chunk_size=chunk_size,
+        )
+
     def evaluate(
         self,
         scopus_results: list[str],
@@ -337,3 +515,191 @@ class EvaluationFactory:
             gs_size=len(self.gs),
             n_scopus_results=len(scopus_results),
         )
+
+    def _create_evaluation(
+        self,
+        *,
+        gs_matches: list[int],
+        qgs_matches: list[int],
+        n_scopus_results: int,
+    ) -> Evaluation:
+        gs_in_scopus = [self.gs[i] for i in gs_matches]
+
+        return Evaluation(
+            qgs_in_scopus=[self.qgs[i] for i in qgs_matches],
+            gs_in_scopus=gs_in_scopus,
+            gs_in_bsb=self.get_gs_in_bsb(gs_in_scopus),
+            gs_in_sb=self.get_gs_in_sb(gs_in_scopus),
+            gs_size=len(self.gs),
+            n_scopus_results=n_scopus_results,
+        )
+
+    def evaluate_many(
+        self,
+        scopus_results_sets: list[list[str]],
+        *,
+        memory_budget_bytes: int = 256 * 1024**2,
+    ) -> list[Evaluation]:
+        """Evaluate the performance of many search strings at once.
+
+        Every distinct title is transformed once with the GS TF-IDF vectorizer (see
+        [`gs_tfidf_vectorizer`][sesg.evaluation.evaluation_factory.EvaluationFactory.gs_tfidf_vectorizer]),
+        and the similarities with the GS and QGS are computed with a single sparse matrix
+        product. Then, the most similar title of each study is found within the results of
+        each search string, and confirmed with the Levenshtein distance. Since the TF-IDF
+        vocabulary is fitted only on the GS, the results are the same as the ones of
+        [`IncrementalEvaluation`][sesg.evaluation.evaluation_factory.IncrementalEvaluation].
+
+        The similarities are densified in blocks of results, sized so a block uses about
+        `memory_budget_bytes`. A result set larger than a block is split over several
+        blocks, keeping the most similar title of each study found so far.
+
+        Args:
+            scopus_results_sets (list[list[str]]): For each search string, list with the titles of the studies returned by Scopus.
+            memory_budget_bytes (int): Approximate memory used to densify a block of similarities. Defaults to 256 MiB.
+
+        Returns:
+            An object with the evaluation metrics of each search string, in the same order.
+        """  # noqa: E501
+        titles_indexes: dict[str, int] = {}
+        results_titles: list[int] = []
+
+        for scopus_results in scopus_results_sets:
+            for title in scopus_results:
+                processed_title = process_title(title)
+                results_titles.append(
+                    titles_indexes.setdefault(processed_title, len(titles_indexes))
+                )
+
+        n_gs = len(self.gs)
+        studies_titles = [*self.processed_gs_titles, *self.processed_qgs_titles]
+        n_studies = len(studies_titles)
+        n_results = [len(scopus_results) for scopus_results in scopus_results_sets]
+
+        matches: list[tuple[list[int], list[int]]] = [
+            ([], []) for _ in scopus_results_sets
+        ]
+
+        if len(titles_indexes) > 0 and n_studies > 0:
+            titles = list(titles_indexes)
+            tfidf_vectorizer = self.gs_tfidf_vectorizer
+
+            # rows are L2 normalized, so the dot product is the cosine similarity
+            similarity_matrix = (
+                tfidf_vectorizer.transform(studies_titles)
+                @ tfidf_vectorizer.transform(titles).T
+            ).tocsc()
+
+            results_titles_array = np.array(results_titles)
+            offsets = np.concatenate([[0], np.cumsum(n_results)]).astype(np.int64)
+            set_of_result = np.repeat(np.arange(len(n_results)), n_results)
+            n_total_results = int(offsets[-1])
+
+            # the dense block and the temporary arrays of `_segment_argmax`
+            bytes_per_similarity = 32
+            block_size = max(
+                1, memory_budget_bytes // (bytes_per_similarity * n_studies)
+            )
+
+            # most similar result of each study within the set that is being matched
+            best_scores = np.empty(0)
+            best_results = np.empty(0, dtype=np.int64)
+            open_set = -1
+
+            for block_start in range(0, n_total_results, block_size):
+                block_end = min(block_start + block_size, n_total_results)
+                block_titles = results_titles_array[block_start:block_end]
+                block_sets = np.unique(set_of_result[block_start:block_end])
+
+                block = similarity_matrix[:, block_titles].toarray()
+                closest_columns = _segment_argmax(
+                    block,
+                    np.maximum(offsets[block_sets], block_start) - block_start,
+                )
+                closest_scores = np.take_along_axis(block, closest_columns, axis=1)
+
+                for j, set_index in enumerate(block_sets):
+                    scores = closest_scores[:, j]
+                    results = closest_columns[:, j] + block_start
+
+                    if set_index == open_set:
+                        # ties keep the earlier result, like `numpy.argmax`
+                        is_better = scores > best_scores
+                        best_scores = np.where(is_better, scores, best_scores)
+                        best_results = np.where(is_better, results, best_results)
+                    else:
+                        best_scores, best_results, open_set = scores, results, set_index
+
+                    # the rest of the set is in the next block
+                    if offsets[set_index + 1] > block_end:
+                        continue
+
+                    matches[set_index] = _confirm_closest_titles(
+                        studies_titles,
+                        [titles[results_titles_array[r]] for r in best_results],
+                        n_gs=n_gs,
+                    )
+
+        return [
+            self._create_evaluation(
+                gs_matches=gs_matches,
+                qgs_matches=qgs_matches,
+                n_scopus_results=n,
+            )
+            for (gs_matches, qgs_matches), n in zip(matches, n_results)
+        ]
+
+
+@dataclass
+class IncrementalEvaluation:
+    """Evaluation of a search string that receives the Scopus results as they are paginated.
+
+    Titles are buffered and matched against the GS and QGS in chunks, keeping only the
+    running best match of each study, so memory does not grow with the number of results.
+    Since the TF-IDF vocabulary is fitted only on the GS, the similarities may differ from
+    the ones computed by [`evaluate`][sesg.evaluation.evaluation_factory.EvaluationFactory.evaluate].
+
+    Create it with [`create_incremental_evaluation`][sesg.evaluation.evaluation_factory.EvaluationFactory.create_incremental_evaluation].
+
+    Args:
+        evaluation_factory (EvaluationFactory): Factory with the GS and QGS.
+        gs_matcher (IncrementalTitleMatcher): Matcher for the GS titles.
+        qgs_matcher (IncrementalTitleMatcher): Matcher for the QGS titles.
+        chunk_size (int): Number of titles buffered before matching them.
+    """  # noqa: E501
+
+    evaluation_factory: EvaluationFactory
+    gs_matcher: IncrementalTitleMatcher
+    qgs_matcher: IncrementalTitleMatcher
+    chunk_size: int = 1000
+
+    n_scopus_results: int = field(init=False, default=0)
+    _buffer: list[str] = field(init=False, default_factory=list, repr=False)
+
+    def _flush(self) -> None:
+        self.gs_matcher.update(self._buffer)
+        self.qgs_matcher.update(self._buffer)
+
+        self._buffer = []
+
+    def add(self, scopus_results: list[str]) -> None:
+        """Adds titles of studies returned by Scopus."""
+        self.n_scopus_results += len(scopus_results)
+        self._buffer.extend(process_title(title) for title in scopus_results)
+
+        if len(self._buffer) >= self.chunk_size:
+            self._flush()
+
+    def evaluate(self) -> Evaluation:
+        """Evaluates the performance of the search string with the titles added so far.
+
+        Returns:
+            An object with the evaluation metrics.
+        """
+        self._flush()
+
+        return self.evaluation_factory._create_evaluation(
+            gs_matches=self.gs_matcher.get_matches(),
+            qgs_matches=self.qgs_matcher.get_matches(),
+            n_scopus_results=self.n_scopus_results,
+        )
@@ -11,6 +11,10 @@ from dacite import from_dict
 class LDAParams:
     min_document_frequency: List[float]
     n_topics: List[int]
+    # how often the perplexity is evaluated to stop early, `-1` disables it
+    evaluate_every: int = -1
+    # number of processes used to fit the models of different `n_topics`
+    n_jobs: int = 1
 
 
 @dataclass(frozen=True)
@@ -56,6 +60,8 @@ class ExperimentConfig:
         lda_params = LDAParams(
             min_document_frequency=[0.1, 0.2, 0.3, 0.4],
             n_topics=[1, 2, 3, 4, 5],
+            evaluate_every=-1,
+            n_jobs=1,
         )
 
         bertopic_params = BERTopicParams(
@@ -0,0 +1,693 @@
+"""Parameter sweep executor for `sesg experiment start`.
+
+The sweep is split into tasks, one for each topic extraction parameter of a strategy
+combination, holding the formulation parameters that still need a search string.
+A task runs in two stages: the topics are extracted once, and then a string is
+formulated for each formulation parameter using those topics.
+
+Tasks are run by a `SweepWorker`, either in the current process or in a pool of
+processes, where each process owns its own database session and models. Workers only
+generate the strings, which are sent back one by one and saved in batches by a single
+`SweepWriter`.
+
+When LDA is configured with multiple jobs, the LDA topics that are not cached yet are
+extracted upfront by fitting several models concurrently.
+"""
+
+import atexit
+import multiprocessing
+import os
+import queue
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+from rich import print
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from sesgx_cli.database.models import (
+    BERTopicParams,
+    Experiment,
+    FormulationParams,
+    LDAParams,
+    Params,
+    SearchString,
+)
+from sesgx_cli.database.models.params import ParamsKey
+from sesgx_cli.topic_extraction.strategies import TopicExtractionStrategy
+from sesgx_cli.word_enrichment.strategies import WordEnrichmentStrategy
+
+
+@dataclass(frozen=True)
+class SweepTask:
+    """A topic extraction parameter and the formulation parameters to generate strings for.
+
+    Args:
+        topic_extraction_strategy (TopicExtractionStrategy): Topic extraction strategy.
+        word_enrichment_strategy (WordEnrichmentStrategy): Word enrichment strategy.
+        topic_params_id (int): ID of the `LDAParams` or `BERTopicParams`, depending on the topic extraction strategy.
+        formulation_params_ids (tuple[int, ...]): IDs of the `FormulationParams` that will be used.
+    """  # noqa: E501
+
+    topic_extraction_strategy: TopicExtractionStrategy
+    word_enrichment_strategy: WordEnrichmentStrategy
+    topic_params_id: int
+    formulation_params_ids: tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    """A search string generated for a single parameter variation.
+
+    Args:
+        task (SweepTask): Task that generated the string.
+        formulation_params_id (int): ID of the `FormulationParams` used.
+        string (str): Generated search string.
+    """
+
+    task: SweepTask
+    formulation_params_id: int
+    string: str
+
+    @property
+    def params_key(self) -> ParamsKey:
+        return ParamsKey(
+            topic_extraction_strategy=self.task.topic_extraction_strategy.value,
+            word_enrichment_strategy=self.task.word_enrichment_strategy.value,
+            topic_params_id=self.task.topic_params_id,
+            formulation_params_id=self.formulation_params_id,
+        )
+
+
+@dataclass(frozen=True)
+class SweepSettings:
+    """Settings shared by all sweep workers.
+
+    Args:
+        experiment_id (int): ID of the experiment.
+        max_n_words_per_topic (int): Number of words to keep in each extracted topic.
+        enrichment_cache_size (int): Max number of words kept in the in-memory enrichment cache. Defaults to 10000.
+        lda_n_jobs (int): Number of processes used to fit the LDA models before the sweep. Defaults to 1.
+        embeddings_cache_dir (Optional[Path]): Directory where the BERTopic document embeddings are persisted. Defaults to None.
+        model_cache_dir (Optional[Path]): Directory with local copies of the word enrichment models. Defaults to None.
+    """  # noqa: E501
+
+    experiment_id: int
+    max_n_words_per_topic: int
+    enrichment_cache_size: int = 10_000
+    lda_n_jobs: int = 1
+    embeddings_cache_dir: Optional[Path] = None
+    model_cache_dir: Optional[Path] = None
+
+
+def get_sweep_docs(experiment: Experiment) -> list[str]:
+    """Documents used for topic extraction. If there are less than 10, they are duplicated."""  # noqa: E501
+    docs = experiment.get_docs()
+
+    if len(docs) < 10:
+        docs = [*docs, *docs]
+
+    return docs
+
+
+def create_topic_extraction_model(
+    topic_extraction_strategy: TopicExtractionStrategy,
+    topic_param: LDAParams | BERTopicParams,
+    settings: SweepSettings,
+):
+    if (
+        topic_extraction_strategy == TopicExtractionStrategy.bertopic
+        and isinstance(topic_param, BERTopicParams)
+    ):
+        from sesgx_cli.topic_extraction.bertopic_strategy import (
+            BERTopicTopicExtractionStrategy,
+        )
+
+        return BERTopicTopicExtractionStrategy(
+            kmeans_n_clusters=topic_param.kmeans_n_clusters,
+            umap_n_neighbors=topic_param.umap_n_neighbors,
+            max_n_words_per_topic=settings.max_n_words_per_topic,
+            embeddings_cache_dir=settings.embeddings_cache_dir,
+        )
+
+    if topic_extraction_strategy == TopicExtractionStrategy.lda and isinstance(
+        topic_param, LDAParams
+    ):
+        from sesgx_cli.topic_extraction.lda_strategy import (
+            LDATopicExtractionStrategy,
+        )
+
+        return LDATopicExtractionStrategy(
+            min_document_frequency=topic_param.min_document_frequency,
+            n_topics=topic_param.n_topics,
+            max_n_words_per_topic=settings.max_n_words_per_topic,
+            evaluate_every=topic_param.evaluate_every,
+        )
+
+    raise RuntimeError(
+        "Invalid Topic Extraction Strategy or the params instance does not have neither a lda_params or bertopic_params"  # noqa: E501
+    )
+
+
+class SweepWorker:
+    """Generates the search strings of sweep tasks for an experiment.
+
+    Word enrichment models are created once per strategy and reused across tasks.
+    The enrichments already cached for the experiment are loaded into memory upfront.
+
+    Args:
+        settings (SweepSettings): Settings of the sweep.
+        session (Session): Database session used by the caches.
+    """  # noqa: E501
+
+    def __init__(
+        self,
+        settings: SweepSettings,
+        session: Session,
+    ):
+        from sesgx_cli.word_enrichment.word_enrichment_cache import (
+            EnrichedWordsMemoryCache,
+        )
+
+        self.settings = settings
+        self.session = session
+        self.max_n_words_per_topic = settings.max_n_words_per_topic
+
+        experiment = session.get(Experiment, settings.experiment_id)
+        if experiment is None:
+            raise RuntimeError(
+                f"Experiment with ID {settings.experiment_id} does not exist."
+            )
+
+        self.experiment: Experiment = experiment
+        self.slr = experiment.slr
+
+        self.docs = get_sweep_docs(experiment)
+        self.enrichment_text = experiment.get_enrichment_text()
+
+        self._word_enrichment_models: dict = {}
+
+        self.enriched_words_memory_cache = EnrichedWordsMemoryCache(
+            max_size=settings.enrichment_cache_size,
+        )
+        self.enriched_words_memory_cache.warm_up(experiment.id, session)
+
+    def get_word_enrichment_model(
+        self,
+        word_enrichment_strategy: WordEnrichmentStrategy,
+    ):
+        if word_enrichment_strategy in self._word_enrichment_models:
+            return self._word_enrichment_models[word_enrichment_strategy]
+
+        if word_enrichment_strategy == WordEnrichmentStrategy.bert:
+            from sesgx_cli.word_enrichment.bert_models import get_bert_model
+            from sesgx_cli.word_enrichment.bert_strategy import (
+                BertWordEnrichmentStrategy,
+            )
+
+            # instead of using composition
+            # this part could be initialized by BertWordEnrichmentStrategy
+            bert_tokenizer, bert_model = get_bert_model(
+                "bert-base-uncased",
+                cache_dir=self.settings.model_cache_dir,
+            )
+
+            word_enrichment_model = BertWordEnrichmentStrategy(
+                enrichment_text=self.enrichment_text,
+                bert_model=bert_model,
+                bert_tokenizer=bert_tokenizer,
+            )
+
+        elif isinstance(word_enrichment_strategy, WordEnrichmentStrategy):
+            from sesgx_cli.word_enrichment.llm_strategy import (
+                LLMWordEnrichmentStrategy,
+            )
+
+            word_enrichment_model = LLMWordEnrichmentStrategy(
+                enrichment_text=self.enrichment_text,
+                model=word_enrichment_strategy.value,
+            )
+
+        else:
+            raise RuntimeError(
+                f"Invalid Similar Word Generation Strategy. Must be: {[e.value for e in WordEnrichmentStrategy]}."  # noqa: E501
+            )
+
+        self._word_enrichment_models[word_enrichment_strategy] = word_enrichment_model
+
+        return word_enrichment_model
+
+    def get_topic_params(
+        self,
+        task: SweepTask,
+    ) -> LDAParams | BERTopicParams:
+        if task.topic_extraction_strategy == TopicExtractionStrategy.bertopic:
+            topic_param = self.session.get(BERTopicParams, task.topic_params_id)
+
+        elif task.topic_extraction_strategy == TopicExtractionStrategy.lda:
+            topic_param = self.session.get(LDAParams, task.topic_params_id)
+
+        else:
+            topic_param = None
+
+        if topic_param is None:
+            raise RuntimeError(
+                "Invalid Topic Extraction Strategy or the params instance does not have neither a lda_params or bertopic_params"  # noqa: E501
+            )
+
+        return topic_param
+
+    def get_topic_extraction_model(
+        self,
+        topic_extraction_strategy: TopicExtractionStrategy,
+        topic_param: LDAParams | BERTopicParams,
+    ):
+        return create_topic_extraction_model(
+            topic_extraction_strategy,
+            topic_param,
+            self.settings,
+        )
+
+    def extract_topics(
+        self,
+        task: SweepTask,
+        topic_param: LDAParams | BERTopicParams,
+    ) -> list[list[str]]:
+        """Extracts the topics of the task, with `max_n_words_per_topic` words each."""
+        from sesgx_cli.topic_extraction.topic_extraction_cache import (
+            TopicExtractionCache,
+        )
+
+        topic_extraction_model_with_cache = TopicExtractionCache(
+            topic_extraction_model=self.get_topic_extraction_model(
+                task.topic_extraction_strategy,
+                topic_param,
+            ),
+            topic_extraction_strategy=task.topic_extraction_strategy,
+            experiment=self.experiment,
+            n_words_per_topic=self.max_n_words_per_topic,
+            topic_param=topic_param,
+            session=self.session,
+        )
+
+        return topic_extraction_model_with_cache.get_topics(self.docs)
+
+    def run(self, task: SweepTask) -> Iterator[SweepResult]:
+        """Generates a search string for each formulation parameter of the task.
+
+        Topics only depend on the topic extraction parameter, so they are extracted
+        once and reused for every formulation parameter of the task.
+        """  # noqa: E501
+        from sesgx import SeSG
+
+        from sesgx_cli.string_formulation.scopus_string_formulation_model import (
+            ScopusStringFormulationModel,
+        )
+        from sesgx_cli.topic_extraction.topic_extraction_cache import (
+            PrecomputedTopicExtraction,
+        )
+        from sesgx_cli.word_enrichment.word_enrichment_cache import (
+            WordEnrichmentCache,
+        )
+
+        topic_param = self.get_topic_params(task)
+        topics = self.extract_topics(task, topic_param)
+
+        word_enrichment_model = self.get_word_enrichment_model(
+            task.word_enrichment_strategy
+        )
+
+        formulation_params: list[FormulationParams] = []
+        for formulation_params_id in task.formulation_params_ids:
+            formulation_param = self.session.get(
+                FormulationParams, formulation_params_id
+            )
+            if formulation_param is None:
+                raise RuntimeError(
+                    f"FormulationParams with ID {formulation_params_id} does not exist."  # noqa: E501
+                )
+
+            formulation_params.append(formulation_param)
+
+        # enrich every word that will be used by the task at once, so the strings
+        # below are formulated with enrichments that are already cached
+        n_words_to_enrich = max(
+            (
+                p.n_words_per_topic
+                for p in formulation_params
+                if p.n_enrichments_per_word > 0
+            ),
+            default=0,
+        )
+        if n_words_to_enrich > 0:
+            WordEnrichmentCache(
+                word_enrichment_model=word_enrichment_model,
+                word_enrichment_strategy=task.word_enrichment_strategy,
+                experiment=self.experiment,
+                session=self.session,
+                n_enrichments=0,
+                memory_cache=self.enriched_words_memory_cache,
+            ).enrich_many(
+                [word for topic in topics for word in topic[:n_words_to_enrich]]
+            )
+
+        for formulation_param in formulation_params:
+
+            word_enrichment_model_with_cache = WordEnrichmentCache(
+                word_enrichment_model=word_enrichment_model,
+                word_enrichment_strategy=task.word_enrichment_strategy,
+                experiment=self.experiment,
+                session=self.session,
+                n_enrichments=formulation_param.n_enrichments_per_word,
+                memory_cache=self.enriched_words_memory_cache,
+            )
+
+            string_formulation_model = ScopusStringFormulationModel(
+                use_enriched_string_formulation_model=formulation_param.n_enrichments_per_word
+                > 0,
+                min_year=self.slr.min_publication_year,
+                max_year=self.slr.max_publication_year,
+                n_words_per_topic=formulation_param.n_words_per_topic,
+            )
+
+            sesg = SeSG(
+                topic_extraction_model=PrecomputedTopicExtraction(
+                    topics=topics,
+                    n_words_per_topic=formulation_param.n_words_per_topic,
+                ),
+                word_enrichment_model=word_enrichment_model_with_cache,
+                string_formulation_model=string_formulation_model,
+            )
+
+            yield SweepResult(
+                task=task,
+                formulation_params_id=formulation_param.id,
+                string=sesg.generate(self.docs),
+            )
+
+
+class SweepWriter:
+    """Saves the generated strings and their params in batches.
+
+    Results are buffered and saved with one transaction per batch. When used as a
+    context manager, the buffered results are saved on exit, even if the sweep fails,
+    so the experiment can be resumed from where it stopped.
+
+    Results whose params were already saved are skipped using `completed_params_keys`.
+    The `Params` unique constraint cannot be relied on for this, since its topic params
+    columns are nullable and Postgres never considers rows with NULLs as duplicated.
+
+    Args:
+        experiment_id (int): ID of the experiment.
+        session (Session): Database session.
+        completed_params_keys (set[ParamsKey]): Keys of the params already saved. Updated after each batch.
+        batch_size (int): Number of results to buffer before saving. Defaults to 50.
+    """  # noqa: E501
+
+    def __init__(
+        self,
+        experiment_id: int,
+        session: Session,
+        completed_params_keys: set[ParamsKey],
+        batch_size: int = 50,
+    ):
+        self.experiment_id = experiment_id
+        self.session = session
+        self.completed_params_keys = completed_params_keys
+        self.batch_size = batch_size
+
+        self._buffer: list[SweepResult] = []
+
+    def add(self, result: SweepResult) -> None:
+        self._buffer.append(result)
+
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Saves the buffered results in a single transaction."""
+        # also removes duplicated params within the batch
+        results = list(
+            {
+                r.params_key: r
+                for r in self._buffer
+                if r.params_key not in self.completed_params_keys
+            }.values()
+        )
+
+        if len(results) == 0:
+            self._buffer.clear()
+            return
+
+        search_strings_ids = SearchString.get_or_save_many_by_string(
+            [r.string for r in results],
+            self.session,
+        )
+
+        rows: list[dict] = []
+        for r in results:
+            row = {
+                "experiment_id": self.experiment_id,
+                "formulation_params_id": r.formulation_params_id,
+                "word_enrichment_strategy": r.task.word_enrichment_strategy.value,
+                "search_string_id": search_strings_ids[r.string],
+                # every row of a multi-row insert must have the same columns
+                "lda_params_id": None,
+                "bertopic_params_id": None,
+            }
+
+            if r.task.topic_extraction_strategy == TopicExtractionStrategy.lda:
+                row["lda_params_id"] = r.task.topic_params_id
+            elif r.task.topic_extraction_strategy == TopicExtractionStrategy.bertopic:
+                row["bertopic_params_id"] = r.task.topic_params_id
+            else:
+                raise RuntimeError(
+                    "Invalid Topic Extraction Strategy or the params instance does not have neither a lda_params or bertopic_params"  # noqa: E501
+                )
+
+            rows.append(row)
+
+        self.session.execute(insert(Params).values(rows))
+        self.session.commit()
+
+        self.completed_params_keys.update(r.params_key for r in results)
+        self._buffer.clear()
+
+    def __enter__(self) -> "SweepWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.flush()
+            return
+
+        # the failure may have left the transaction unusable
+        self.session.rollback()
+
+        try:
+            self.flush()
+        except Exception as e:
+            # the exception that stopped the sweep is the one propagated
+            print(f"[red]Could not save the last {len(self._buffer)} results: {e!r}")
+
+
+def prefetch_lda_topics(
+    tasks: list[SweepTask],
+    *,
+    settings: SweepSettings,
+    session: Session,
+) -> None:
+    """Extracts and caches the topics of the LDA params of the tasks that are not cached yet.
+
+    The models are fitted concurrently by `settings.lda_n_jobs` processes, so the tasks
+    find their topics on cache instead of fitting one model at a time.
+
+    Args:
+        tasks (list[SweepTask]): Tasks of the sweep.
+        settings (SweepSettings): Settings of the sweep.
+        session (Session): Database session.
+    """  # noqa: E501
+    from sesgx_cli.topic_extraction.lda_strategy import extract_many
+    from sesgx_cli.topic_extraction.topic_extraction_cache import (
+        TopicExtractionCache,
+    )
+
+    experiment = session.get(Experiment, settings.experiment_id)
+    if experiment is None:
+        raise RuntimeError(
+            f"Experiment with ID {settings.experiment_id} does not exist."
+        )
+
+    docs = get_sweep_docs(experiment)
+
+    lda_params_ids = dict.fromkeys(
+        task.topic_params_id
+        for task in tasks
+        if task.topic_extraction_strategy == TopicExtractionStrategy.lda
+    )
+
+    uncached_topic_extraction_caches = []
+    for lda_params_id in lda_params_ids:
+        lda_param = session.get(LDAParams, lda_params_id)
+        if lda_param is None:
+            raise RuntimeError(f"LDAParams with ID {lda_params_id} does not exist.")
+
+        topic_extraction_cache = TopicExtractionCache(
+            topic_extraction_model=create_topic_extraction_model(
+                TopicExtractionStrategy.lda,
+                lda_param,
+                settings,
+            ),
+            topic_extraction_strategy=TopicExtractionStrategy.lda,
+            experiment=experiment,
+            n_words_per_topic=settings.max_n_words_per_topic,
+            topic_param=lda_param,
+            session=session,
+        )
+
+        if topic_extraction_cache.get_from_cache() is None:
+            uncached_topic_extraction_caches.append(topic_extraction_cache)
+
+    if len(uncached_topic_extraction_caches) == 0:
+        return
+
+    print(
+        f"Fitting [bright_cyan]{len(uncached_topic_extraction_caches)}[/] LDA models with {settings.lda_n_jobs} jobs..."  # noqa: E501
+    )
+
+    topics_list = extract_many(
+        [c.topic_extraction_model for c in uncached_topic_extraction_caches],
+        docs,
+        n_jobs=settings.lda_n_jobs,
+    )
+
+    for topic_extraction_cache, topics in zip(
+        uncached_topic_extraction_caches, topics_list
+    ):
+        topic_extraction_cache.save_topics_on_cache(topics)
+
+
+_worker: Optional[SweepWorker] = None
+_results_queue: Optional["queue.Queue[SweepResult]"] = None
+
+
+def _init_worker(
+    settings: SweepSettings,
+    n_threads: int,
+    results_queue: "queue.Queue[SweepResult]",
+) -> None:
+    global _worker, _results_queue
+
+    from transformers import logging  # type: ignore
+
+    logging.set_verbosity_error()
+
+    try:
+        import torch
+
+        # avoid oversubscribing the cores when every worker runs a model
+        torch.set_num_threads(n_threads)
+    except ImportError:
+        pass
+
+    from sesgx_cli.database.connection import Session
+
+    session = Session()
+    # returns the connection to the pool when the worker process exits
+    atexit.register(session.close)
+
+    _worker = SweepWorker(
+        settings=settings,
+        session=session,
+    )
+    _results_queue = results_queue
+
+
+def _run_task(task: SweepTask) -> None:
+    if _worker is None or _results_queue is None:
+        raise RuntimeError("Sweep worker was not initialized.")
+
+    # each string is sent as soon as it is generated, instead of once per task
+    for result in _worker.run(task):
+        _results_queue.put(result)
+
+
+def run_sweep(
+    tasks: list[SweepTask],
+    *,
+    settings: SweepSettings,
+    session: Session,
+    n_workers: int = 1,
+) -> Iterator[SweepResult]:
+    """Runs the sweep tasks, yielding the generated strings as they are ready.
+
+    With a single worker, the tasks are run in the current process using `session`.
+    Otherwise, they are distributed over a pool of `n_workers` processes, each one
+    with its own session, which send each result through a queue as soon as it is
+    generated.
+
+    Args:
+        tasks (list[SweepTask]): Tasks to run.
+        settings (SweepSettings): Settings of the sweep.
+        session (Session): Database session used when running in the current process.
+        n_workers (int): Number of worker processes. Defaults to 1.
+
+    Yields:
+        A `SweepResult` for each formulation parameter of each task.
+    """  # noqa: E501
+    if settings.lda_n_jobs > 1:
+        prefetch_lda_topics(tasks, settings=settings, session=session)
+
+    if n_workers <= 1:
+        worker = SweepWorker(
+            settings=settings,
+            session=session,
+        )
+
+        for task in tasks:
+            yield from worker.run(task)
+
+        print(f"Enrichment memory cache: {worker.enriched_words_memory_cache}")
+
+        return
+
+    # spawning avoids sharing the parent's connection pool and torch threads
+    mp_context = multiprocessing.get_context("spawn")
+    manager = mp_context.Manager()
+    results_queue = manager.Queue()
+
+    executor = ProcessPoolExecutor(
+        max_workers=n_workers,
+        mp_context=mp_context,
+        initializer=_init_worker,
+        initargs=(
+            settings,
+            max(1, (os.cpu_count() or 1) // n_workers),
+            results_queue,
+        ),
+    )
+
+    try:
+        futures: list[Future] = [executor.submit(_run_task, task) for task in tasks]
+
+        while True:
+            # checked before reading the queue, since a task puts all of its
+            # results on the queue before finishing
+            all_tasks_done = all(f.done() for f in futures)
+
+            for future in futures:
+                if future.done():
+                    # raises the exception of a failed task
+                    future.result()
+
+            try:
+                yield results_queue.get(timeout=1)
+            except queue.Empty:
+                if all_tasks_done:
+                    break
+
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        manager.shutdown()
@@ -0,0 +1,285 @@
+"""Pool of Scopus API keys shared by concurrent searches.
+
+Each key has its own client, so concurrent searches are spread over the keys and their
+independent quotas. Keys that are rate limited or exceed their quota are put on a cooldown
+that doubles on each consecutive failure, and the search is retried with another key.
+After `max_failures` consecutive failures a key is no longer used. Any other error is not
+caused by the key, so it is raised without touching the key.
+
+A key is considered out of quota when its client raises one of the `quota_errors` of the
+pool, such as the error raised by a `scopus_client.ScopusClient` that ran out of keys, or
+when the client lets a 429 response through.
+"""  # noqa: E501
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import islice
+from time import monotonic
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional, TypeVar
+
+from rich import print
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+QUOTA_EXCEEDED_STATUS_CODE = 429
+
+
+def get_status_code(error: BaseException) -> Optional[int]:
+    """Gets the HTTP status code of an error raised by an HTTP client, if it has one.
+
+    The status code is looked up on the error and on its response, as `status_code`
+    (httpx, requests), `status` (aiohttp) or `code` (urllib).
+    """
+    for obj in (error, getattr(error, "response", None)):
+        for attr in ("status_code", "status", "code"):
+            status_code = getattr(obj, attr, None)
+
+            if isinstance(status_code, int):
+                return status_code
+
+    return None
+
+
+def is_quota_error(
+    error: BaseException,
+    quota_errors: tuple[type[BaseException], ...] = (),
+) -> bool:
+    """Checks if the error, or one of the errors that caused it, means the key is out of quota.
+
+    Scopus responds with a 429 both when a key is throttled and when its weekly quota is
+    exceeded. Clients may handle the 429 themselves and raise their own error instead,
+    which is recognized by its type. The chain of causes is followed since clients may also
+    wrap the HTTP error.
+
+    Args:
+        error (BaseException): Error raised by the client.
+        quota_errors (tuple[type[BaseException], ...]): Error types raised by the client when its key is out of quota. Defaults to ().
+    """  # noqa: E501
+    current: Optional[BaseException] = error
+
+    while current is not None:
+        if isinstance(current, quota_errors):
+            return True
+
+        if get_status_code(current) == QUOTA_EXCEEDED_STATUS_CODE:
+            return True
+
+        current = current.__cause__ or current.__context__
+
+    return False
+
+
+@dataclass
+class ScopusKey:
+    """State of a Scopus API key in the pool.
+
+    Attributes:
+        key (str): The API key.
+        client (Any): Client that uses only this key.
+        n_in_flight (int): Number of searches currently using the key.
+        n_requests (int): Number of pages requested with the key.
+        n_consecutive_failures (int): Number of searches that failed in a row with the key.
+        available_at (float): Monotonic time when the key can be used again.
+    """  # noqa: E501
+
+    key: str
+    client: Any = field(repr=False)
+    n_in_flight: int = 0
+    n_requests: int = 0
+    n_consecutive_failures: int = 0
+    available_at: float = 0.0
+
+    def __str__(self) -> str:
+        return f"...{self.key[-4:]}"
+
+
+class ScopusKeyPool:
+    """Hands out the Scopus API keys to concurrent searches.
+
+    The key with the fewest searches in flight, and then the fewest requests, is used.
+
+    Args:
+        api_keys (list[str]): Scopus API keys.
+        client_factory (Callable[[str], Any]): Creates a client that uses only the given key. For example, `lambda key: ScopusClient([key])`.
+        quota_errors (tuple[type[BaseException], ...]): Error types raised by a client when its key is out of quota, besides a 429 response. Defaults to ().
+        max_failures (int): Number of consecutive failures after which a key is not used anymore. Defaults to 3.
+        cooldown_seconds (float): Time a key waits after its first failure before being used again. Defaults to 30.
+    """  # noqa: E501
+
+    def __init__(
+        self,
+        api_keys: list[str],
+        client_factory: Callable[[str], Any],
+        *,
+        quota_errors: tuple[type[BaseException], ...] = (),
+        max_failures: int = 3,
+        cooldown_seconds: float = 30,
+    ):
+        if len(api_keys) == 0:
+            raise RuntimeError("At least one Scopus API key is required.")
+
+        self.keys = [ScopusKey(key=key, client=client_factory(key)) for key in api_keys]
+        self.quota_errors = quota_errors
+        self.max_failures = max_failures
+        self.cooldown_seconds = cooldown_seconds
+
+    def _get_usable_keys(self) -> list[ScopusKey]:
+        return [k for k in self.keys if k.n_consecutive_failures < self.max_failures]
+
+    @property
+    def is_exhausted(self) -> bool:
+        """True if every key reached the max number of consecutive failures."""
+        return len(self._get_usable_keys()) == 0
+
+    async def acquire(self) -> ScopusKey:
+        """Waits until a key is available and marks it as in flight.
+
+        Raises:
+            RuntimeError: If every key reached the max number of consecutive failures.
+
+        Returns:
+            The key to use.
+        """
+        while True:
+            usable_keys = self._get_usable_keys()
+            if len(usable_keys) == 0:
+                raise RuntimeError(
+                    "Every Scopus API key failed too many times in a row."
+                )
+
+            now = monotonic()
+            available_keys = [k for k in usable_keys if k.available_at <= now]
+
+            if len(available_keys) > 0:
+                key = min(available_keys, key=lambda k: (k.n_in_flight, k.n_requests))
+                key.n_in_flight += 1
+
+                return key
+
+            await asyncio.sleep(min(k.available_at for k in usable_keys) - now)
+
+    def record_request(self, key: ScopusKey) -> None:
+        key.n_requests += 1
+
+    def release(
+        self,
+        key: ScopusKey,
+        *,
+        failed: bool = False,
+    ) -> None:
+        """Marks the search that was using the key as finished.
+
+        Args:
+            key (ScopusKey): Key used by the search.
+            failed (bool): Whether the search failed because the key is out of quota, which puts the key on cooldown.
+        """  # noqa: E501
+        key.n_in_flight -= 1
+
+        if failed:
+            key.n_consecutive_failures += 1
+            key.available_at = monotonic() + self.cooldown_seconds * 2 ** (
+                key.n_consecutive_failures - 1
+            )
+        else:
+            key.n_consecutive_failures = 0
+
+    def __str__(self) -> str:
+        return ", ".join(
+            f"{k} ({k.n_requests} requests, {k.n_consecutive_failures} failures)"
+            for k in self.keys
+        )
+
+
+async def search_with_key_pool(
+    string: str,
+    key_pool: ScopusKeyPool,
+    on_page: Callable[[Any], None],
+    create_results: Callable[[], R],
+) -> R:
+    """Searches the string on Scopus, retrying with another key if the key in use is out of quota.
+
+    Pages are consumed as they arrive, and passed to the `add_entries` method of the
+    results, so memory does not grow with the size of the entries.
+
+    Args:
+        string (str): Search string.
+        key_pool (ScopusKeyPool): Pool with the Scopus API keys.
+        on_page (Callable[[Any], None]): Called with each page of results.
+        create_results (Callable[[], R]): Creates the empty results, once per attempt.
+
+    Raises:
+        RuntimeError: If every key reached the max number of consecutive failures.
+        Exception: Any error that does not mean the key is out of quota, such as an `InvalidStringError`, a server error or an error in `on_page`.
+
+    Returns:
+        The results of the search.
+    """  # noqa: E501
+    while True:
+        key = await key_pool.acquire()
+        results = create_results()
+
+        try:
+            async for page in key.client.search(string):
+                key_pool.record_request(key)
+                on_page(page)
+
+                results.add_entries(page.entries)  # type: ignore
+
+        except Exception as e:
+            if not is_quota_error(e, key_pool.quota_errors):
+                key_pool.release(key)
+                raise
+
+            key_pool.release(key, failed=True)
+            if key_pool.is_exhausted:
+                raise
+
+            print(
+                f"[yellow]Scopus API key {key} is out of quota ({e!r}). Retrying the string with another key."  # noqa: E501
+            )
+            continue
+
+        key_pool.release(key)
+
+        return results
+
+
+async def map_in_order(
+    func: Callable[[T], Awaitable[R]],
+    items: Iterable[T],
+    *,
+    concurrency: int,
+) -> AsyncIterator[R]:
+    """Runs `func` on the items concurrently, yielding the results in the order of the items.
+
+    A new item only starts when the oldest one is yielded, so at most `concurrency` items
+    are running or waiting to be yielded at any time, and the results of fast items never
+    pile up behind a slow one. The items still running are cancelled when the iterator is
+    closed.
+
+    Args:
+        func (Callable[[T], Awaitable[R]]): Function to run on each item.
+        items (Iterable[T]): Items, consumed as they are started.
+        concurrency (int): Max number of items running or waiting to be yielded.
+
+    Yields:
+        The result of each item, in the order of the items.
+    """  # noqa: E501
+    tasks: deque[asyncio.Future[R]] = deque()
+    pending_items = iter(items)
+
+    try:
+        while True:
+            for item in islice(pending_items, concurrency - len(tasks)):
+                tasks.append(asyncio.ensure_future(func(item)))
+
+            if len(tasks) == 0:
+                return
+
+            yield await tasks.popleft()
+
+    finally:
+        for task in tasks:
+            task.cancel()
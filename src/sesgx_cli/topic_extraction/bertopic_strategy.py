@@ -1,37 +1,58 @@
 """Topic extraction with [BERTopic](https://arxiv.org/abs/2203.05794)."""
 
 from dataclasses import dataclass
-from typing import List
+from pathlib import Path
+from typing import List, Optional
 
 from bertopic import BERTopic  # type: ignore
+from bertopic.dimensionality import BaseDimensionalityReduction  # type: ignore
 from sesgx import TopicExtractionModel
 from sklearn.cluster import KMeans  # type: ignore
 from sklearn.feature_extraction.text import CountVectorizer  # type: ignore
-from umap import UMAP  # type: ignore
 
+from .embeddings import DEFAULT_EMBEDDING_MODEL, get_reduced_embeddings
 from .reduce_n_words_per_topic import reduce_n_words_per_topic
 
 
 @dataclass
 class BERTopicTopicExtractionStrategy(TopicExtractionModel):
+    """Topic extraction with BERTopic.
+
+    The embeddings of the documents are computed once and shared between the runs with
+    different parameters, and their UMAP reduction is shared between the runs with the same
+    `umap_n_neighbors` (see [get_reduced_embeddings][sesgx_cli.topic_extraction.embeddings.get_reduced_embeddings]).
+
+    Attributes:
+        kmeans_n_clusters (int): Number of clusters, which is the number of topics.
+        umap_n_neighbors (int): Number of neighbors used by UMAP.
+        max_n_words_per_topic (int): Number of words to keep in each topic.
+        embedding_model (str): Name of the sentence transformer model. Defaults to `all-MiniLM-L6-v2`.
+        embeddings_cache_dir (Optional[Path]): Directory where the embeddings are persisted. Defaults to None.
+    """  # noqa: E501
+
     kmeans_n_clusters: int
     umap_n_neighbors: int
     max_n_words_per_topic: int
+    embedding_model: str = DEFAULT_EMBEDDING_MODEL
+    embeddings_cache_dir: Optional[Path] = None
 
     def extract(self, docs: List[str]) -> List[List[str]]:
+        # UMAP only depends on `umap_n_neighbors`, so the reduction is computed once
+        # and shared between the cluster counts. BERTopic receives the reduced
+        # embeddings, and skips its own reduction step.
+        reduced_embeddings = get_reduced_embeddings(
+            docs,
+            umap_n_neighbors=self.umap_n_neighbors,
+            embedding_model=self.embedding_model,
+            cache_dir=self.embeddings_cache_dir,
+        )
+
         vectorizer_model = CountVectorizer(
             stop_words="english",
             ngram_range=(1, 3),
         )
 
-        umap_model = UMAP(
-            n_neighbors=self.umap_n_neighbors,
-            # default values used in BERTopic initialization.
-            n_components=5,
-            min_dist=0.0,
-            metric="cosine",
-            low_memory=False,
-        )
+        umap_model = BaseDimensionalityReduction()
 
         cluster_model = KMeans(
             n_clusters=self.kmeans_n_clusters,
@@ -45,7 +66,7 @@ class BERTopicTopicExtractionStrategy(TopicExtractionModel):
             umap_model=umap_model,
         )
 
-        topic_model.fit_transform(docs)
+        topic_model.fit_transform(docs, embeddings=reduced_embeddings)
 
         # topic_model.get_topics() will return a Mapping where
         # the key is the index of the topic,
@@ -1,5 +1,6 @@
 """Prepare documents for topic extraction."""
 
+from hashlib import sha256
 from typing import TypedDict
 
 
@@ -81,3 +82,31 @@ def create_docs(
         ['machine learning\nmachine learning is often used in the industry with the goal of...\nmachine learning, code smells, defect detection', 'artificial intelligence\nartificial intelligence is often used in the industry with the goal of...\nartificial intelligence, code smells, defect detection']
     """  # noqa: E501
     return [concat_study_info(s) for s in studies_list]
+
+
+def hash_docs(
+    docs: list[str],
+) -> str:
+    """Creates a hash that identifies the given list of documents, including their order.
+
+    Can be used as a key to cache results derived from the documents.
+
+    Args:
+        docs (list[str]): List of documents.
+
+    Returns:
+        Hex digest of the SHA-256 hash of the documents.
+
+    Examples:
+        >>> hash_docs(["machine learning", "code smells"]) == hash_docs(["machine learning", "code smells"])
+        True
+        >>> hash_docs(["machine learning", "code smells"]) == hash_docs(["machine learningcode smells"])
+        False
+    """  # noqa: E501
+    docs_hash = sha256()
+    for doc in docs:
+        docs_hash.update(doc.encode())
+        # separator, so the boundaries between the documents are part of the hash
+        docs_hash.update(b"\0")
+
+    return docs_hash.hexdigest()
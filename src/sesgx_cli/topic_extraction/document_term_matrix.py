@@ -0,0 +1,126 @@
+"""Document-term matrices shared between topic extraction runs over the same documents.
+
+The vocabulary of a `CountVectorizer` fitted with `min_df` is a subset of the
+vocabulary fitted without it, so the document-term matrix is computed once for a set of
+documents and each `min_df` is applied by masking its columns.
+"""  # noqa: E501
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from numbers import Integral
+from typing import Any, Optional
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer  # type: ignore
+
+from .docs import hash_docs
+
+DocumentTermMatrixKey = tuple[str, tuple[int, int], Optional[str]]
+"""Hash of the docs, ngram range and stop words used by the vectorizer."""
+
+_MAX_CACHED_MATRICES = 8
+
+_document_term_matrices: "OrderedDict[DocumentTermMatrixKey, DocumentTermMatrix]" = (
+    OrderedDict()
+)
+
+
+@dataclass(frozen=True)
+class DocumentTermMatrix:
+    """Document-term matrix with the full vocabulary of the documents.
+
+    Attributes:
+        tf (Any): Sparse matrix with the count of each term (column) in each document (row).
+        feature_names (Any): Array where `feature_names[i]` is the term of the i-th column.
+        document_frequencies (Any): Array with the number of documents that contain each term.
+    """  # noqa: E501
+
+    tf: Any
+    feature_names: Any
+    document_frequencies: Any
+
+    def filter_by_document_frequency(
+        self,
+        min_df: float,
+        max_df: float = 1.0,
+    ) -> tuple[Any, Any]:
+        """Keeps only the terms within the document frequency bounds.
+
+        Follows the semantics of `CountVectorizer`: float bounds are proportions of
+        documents and integer bounds are absolute counts.
+
+        Args:
+            min_df (float): Ignore terms with document frequency lower than this.
+            max_df (float): Ignore terms with document frequency higher than this.
+
+        Raises:
+            ValueError: If no terms remain after filtering.
+
+        Returns:
+            Tuple with the filtered matrix and its feature names.
+        """  # noqa: E501
+        n_docs = self.tf.shape[0]
+
+        min_doc_count = min_df if isinstance(min_df, Integral) else min_df * n_docs
+        max_doc_count = max_df if isinstance(max_df, Integral) else max_df * n_docs
+
+        mask = (self.document_frequencies >= min_doc_count) & (
+            self.document_frequencies <= max_doc_count
+        )
+
+        if not mask.any():
+            raise ValueError(
+                "After pruning, no terms remain. Try a lower min_df or a higher max_df."
+            )
+
+        (kept_indices,) = np.nonzero(mask)
+
+        return self.tf[:, kept_indices], self.feature_names[kept_indices]
+
+
+def get_document_term_matrix(
+    docs: list[str],
+    *,
+    ngram_range: tuple[int, int] = (1, 3),
+    stop_words: Optional[str] = "english",
+) -> DocumentTermMatrix:
+    """Gets the document-term matrix of the documents, vectorizing them only if not on cache.
+
+    The cache is kept per process, and holds the matrices of the most recently used documents.
+
+    Args:
+        docs (list[str]): List of documents.
+        ngram_range (tuple[int, int]): Range of n-grams used by the vectorizer.
+        stop_words (Optional[str]): Stop words used by the vectorizer.
+
+    Returns:
+        Document-term matrix with the full vocabulary of the documents.
+    """  # noqa: E501
+    key: DocumentTermMatrixKey = (hash_docs(docs), ngram_range, stop_words)
+
+    document_term_matrix = _document_term_matrices.get(key)
+    if document_term_matrix is not None:
+        _document_term_matrices.move_to_end(key)
+        return document_term_matrix
+
+    vectorizer = CountVectorizer(
+        min_df=1,
+        max_df=1.0,
+        ngram_range=ngram_range,
+        max_features=None,
+        stop_words=stop_words,
+    )
+
+    tf = vectorizer.fit_transform(docs)
+
+    document_term_matrix = DocumentTermMatrix(
+        tf=tf,
+        feature_names=vectorizer.get_feature_names_out(),
+        document_frequencies=np.bincount(tf.indices, minlength=tf.shape[1]),
+    )
+
+    _document_term_matrices[key] = document_term_matrix
+    if len(_document_term_matrices) > _MAX_CACHED_MATRICES:
+        _document_term_matrices.popitem(last=False)
+
+    return document_term_matrix
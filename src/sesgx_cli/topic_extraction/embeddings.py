@@ -0,0 +1,177 @@
+"""Sentence embeddings of the documents, shared between BERTopic runs over the same documents.
+
+Embeddings are kept in memory per process and can also be persisted to a directory, as
+`.npy` files keyed by the docs hash and the embedding model, which are memory-mapped on load.
+
+The UMAP reduction of the embeddings only depends on the number of neighbors, so the reduced
+embeddings are also kept in memory and shared between the runs with different cluster counts.
+"""  # noqa: E501
+
+import os
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+
+from .docs import hash_docs
+
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+"""Embedding model used by BERTopic for English documents."""
+
+EmbeddingsKey = tuple[str, str]
+"""Hash of the docs and name of the embedding model."""
+
+_MAX_CACHED_EMBEDDINGS = 8
+
+ReducedEmbeddingsKey = tuple[str, str, int]
+"""Hash of the docs, name of the embedding model and number of UMAP neighbors."""
+
+_MAX_CACHED_REDUCED_EMBEDDINGS = 16
+
+_embedding_models: dict[str, Any] = {}
+_embeddings: "OrderedDict[EmbeddingsKey, np.ndarray]" = OrderedDict()
+_reduced_embeddings: "OrderedDict[ReducedEmbeddingsKey, np.ndarray]" = OrderedDict()
+
+
+def get_embedding_model(embedding_model: str = DEFAULT_EMBEDDING_MODEL) -> Any:
+    """Gets a sentence transformer, loading it only once per process.
+
+    Args:
+        embedding_model (str): Name of the sentence transformer model.
+
+    Returns:
+        The sentence transformer.
+    """
+    if embedding_model not in _embedding_models:
+        from sentence_transformers import SentenceTransformer  # type: ignore
+
+        _embedding_models[embedding_model] = SentenceTransformer(embedding_model)
+
+    return _embedding_models[embedding_model]
+
+
+def get_embeddings_path(
+    cache_dir: Path,
+    key: EmbeddingsKey,
+) -> Path:
+    """Path of the `.npy` file with the embeddings of the given key.
+
+    Examples:
+        >>> get_embeddings_path(Path("cache"), ("abc", "sentence-transformers/all-MiniLM-L6-v2")).as_posix()
+        'cache/sentence-transformers_all-MiniLM-L6-v2-abc.npy'
+    """  # noqa: E501
+    docs_hash, embedding_model = key
+    model_name = re.sub(r"[^\w.-]", "_", embedding_model)
+
+    return cache_dir / f"{model_name}-{docs_hash}.npy"
+
+
+def _save_embeddings(path: Path, embeddings: np.ndarray) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # written to a temporary file first, so concurrent workers never load a partial file
+    tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npy")
+    np.save(tmp_path, embeddings)
+    os.replace(tmp_path, path)
+
+
+def get_embeddings(
+    docs: list[str],
+    *,
+    embedding_model: str = DEFAULT_EMBEDDING_MODEL,
+    cache_dir: Optional[Path] = None,
+) -> np.ndarray:
+    """Gets the embeddings of the documents, computing them only if not on cache.
+
+    Args:
+        docs (list[str]): List of documents.
+        embedding_model (str): Name of the sentence transformer model.
+        cache_dir (Optional[Path]): Directory where the embeddings are persisted. If None, they are kept only in memory.
+
+    Returns:
+        Array with the embedding of each document.
+    """  # noqa: E501
+    key: EmbeddingsKey = (hash_docs(docs), embedding_model)
+
+    embeddings = _embeddings.get(key)
+    if embeddings is not None:
+        _embeddings.move_to_end(key)
+        return embeddings
+
+    path = get_embeddings_path(cache_dir, key) if cache_dir is not None else None
+
+    if path is not None and path.exists():
+        embeddings = np.load(path, mmap_mode="r")
+
+    else:
+        embeddings = get_embedding_model(embedding_model).encode(
+            docs,
+            show_progress_bar=False,
+        )
+
+        if path is not None:
+            _save_embeddings(path, embeddings)
+            embeddings = np.load(path, mmap_mode="r")
+
+    _embeddings[key] = embeddings
+    if len(_embeddings) > _MAX_CACHED_EMBEDDINGS:
+        _embeddings.popitem(last=False)
+
+    return embeddings
+
+
+def get_reduced_embeddings(
+    docs: list[str],
+    *,
+    umap_n_neighbors: int,
+    embedding_model: str = DEFAULT_EMBEDDING_MODEL,
+    cache_dir: Optional[Path] = None,
+) -> np.ndarray:
+    """Gets the embeddings of the documents reduced by UMAP, reducing them only if not on cache.
+
+    The reduction is the same one performed by BERTopic: UMAP is fitted on the embeddings,
+    which are then transformed, replacing NaN values with zeros.
+
+    Args:
+        docs (list[str]): List of documents.
+        umap_n_neighbors (int): Number of neighbors used by UMAP.
+        embedding_model (str): Name of the sentence transformer model.
+        cache_dir (Optional[Path]): Directory where the embeddings (not the reduced ones) are persisted.
+
+    Returns:
+        Array with the reduced embedding of each document.
+    """  # noqa: E501
+    key: ReducedEmbeddingsKey = (hash_docs(docs), embedding_model, umap_n_neighbors)
+
+    reduced_embeddings = _reduced_embeddings.get(key)
+    if reduced_embeddings is not None:
+        _reduced_embeddings.move_to_end(key)
+        return reduced_embeddings
+
+    from umap import UMAP  # type: ignore
+
+    embeddings = get_embeddings(
+        docs,
+        embedding_model=embedding_model,
+        cache_dir=cache_dir,
+    )
+
+    umap_model = UMAP(
+        n_neighbors=umap_n_neighbors,
+        # default values used in BERTopic initialization.
+        n_components=5,
+        min_dist=0.0,
+        metric="cosine",
+        low_memory=False,
+    )
+
+    umap_model.fit(embeddings)
+    reduced_embeddings = np.nan_to_num(umap_model.transform(embeddings))
+
+    _reduced_embeddings[key] = reduced_embeddings
+    if len(_reduced_embeddings) > _MAX_CACHED_REDUCED_EMBEDDINGS:
+        _reduced_embeddings.popitem(last=False)
+
+    return reduced_embeddings
@@ -1,36 +1,58 @@
 """Topic extraction with [LDA (Latent Dirichlet Allocation)](https://www.jmlr.org/papers/volume3/blei03a/blei03a.pdf?ref=https://githubhelp.com)."""
 
 from dataclasses import dataclass
-from typing import List
+from typing import Any, List, Tuple
 
+from joblib import Parallel, delayed  # type: ignore
 from sesgx import TopicExtractionModel
 from sklearn.decomposition import LatentDirichletAllocation  # type: ignore
-from sklearn.feature_extraction.text import CountVectorizer  # type: ignore
 
+from .document_term_matrix import get_document_term_matrix
 from .reduce_n_words_per_topic import reduce_n_words_per_topic
 
 
 @dataclass
 class LDATopicExtractionStrategy(TopicExtractionModel):
+    """Topic extraction with LDA.
+
+    Attributes:
+        min_document_frequency (float): Ignore terms with document frequency lower than this.
+        n_topics (int): Number of topics to extract.
+        max_n_words_per_topic (int): Number of words to keep in each topic.
+        evaluate_every (int): How often to evaluate the perplexity, stopping the fit once it changes less than `perp_tol`. Use `-1` to always run until `max_iter`. Defaults to -1.
+        max_iter (int): Max number of passes over the documents. Defaults to 5000.
+    """  # noqa: E501
+
     min_document_frequency: float
     n_topics: int
     max_n_words_per_topic: int
-
-    def extract(self, docs: List[str]) -> List[List[str]]:
-        vectorizer = CountVectorizer(
-            min_df=self.min_document_frequency,
-            max_df=1.0,
+    evaluate_every: int = -1
+    max_iter: int = 5000
+
+    def get_document_term_matrix(self, docs: List[str]) -> Tuple[Any, Any]:
+        """Gets the document-term matrix of the docs and its feature names."""
+        # the corpus is vectorized once, and shared between the `min_df` values
+        document_term_matrix = get_document_term_matrix(
+            docs,
             ngram_range=(1, 3),
-            max_features=None,
             stop_words="english",
         )
 
-        tf = vectorizer.fit_transform(docs)
-
         # `feature_names` is a list with the vectorized words from the document.
         # meaning `feature_names[i]` is a token in the text.
-        feature_names = vectorizer.get_feature_names_out()
+        tf, feature_names = document_term_matrix.filter_by_document_frequency(
+            min_df=self.min_document_frequency,
+            max_df=1.0,
+        )
+
+        return tf, feature_names
 
+    def extract_from_document_term_matrix(
+        self,
+        tf: Any,
+        feature_names: Any,
+    ) -> List[List[str]]:
+        """Extracts the topics from an already computed document-term matrix."""
         alpha = None
         beta = None
         learning = "batch"  # Batch or Online
@@ -43,9 +65,9 @@ class LDATopicExtractionStrategy(TopicExtractionModel):
             learning_method=learning,
             learning_decay=0.7,
             learning_offset=10.0,
-            max_iter=5000,
+            max_iter=self.max_iter,
             batch_size=128,
-            evaluate_every=-1,
+            evaluate_every=self.evaluate_every,
             total_samples=1000000.0,
             perp_tol=0.1,
             mean_change_tol=0.001,
@@ -75,4 +97,44 @@ class LDATopicExtractionStrategy(TopicExtractionModel):
         topics = reduce_n_words_per_topic(
             topics, self.max_n_words_per_topic)
 
-        return topics
\ No newline at end of file
+        return topics
+
+    def extract(self, docs: List[str]) -> List[List[str]]:
+        tf, feature_names = self.get_document_term_matrix(docs)
+
+        return self.extract_from_document_term_matrix(tf, feature_names)
+
+
+def extract_many(
+    strategies: List[LDATopicExtractionStrategy],
+    docs: List[str],
+    n_jobs: int = 1,
+) -> List[List[List[str]]]:
+    """Extracts the topics of several LDA strategies, fitting them concurrently.
+
+    The document-term matrices are computed once per `min_document_frequency` in the
+    current process, and only the LDA fits are distributed over `n_jobs` processes.
+    Since every fit uses `random_state=0`, the topics are the same as the ones returned by
+    calling `extract` on each strategy.
+
+    Args:
+        strategies (List[LDATopicExtractionStrategy]): Strategies to extract the topics with.
+        docs (List[str]): List of documents.
+        n_jobs (int): Number of processes used to fit the models. Defaults to 1.
+
+    Returns:
+        List with the topics extracted by each strategy, in the same order.
+    """  # noqa: E501
+    document_term_matrices: dict[float, Tuple[Any, Any]] = {}
+    for strategy in strategies:
+        if strategy.min_document_frequency not in document_term_matrices:
+            document_term_matrices[strategy.min_document_frequency] = (
+                strategy.get_document_term_matrix(docs)
+            )
+
+    return Parallel(n_jobs=n_jobs)(
+        delayed(strategy.extract_from_document_term_matrix)(
+            *document_term_matrices[strategy.min_document_frequency]
+        )
+        for strategy in strategies
+    )
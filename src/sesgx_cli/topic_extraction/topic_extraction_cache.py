@@ -11,6 +11,7 @@ from sesgx_cli.database.models import (
 )
 from sesgx_cli.topic_extraction.strategies import TopicExtractionStrategy
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 
@@ -64,17 +65,42 @@ class TopicExtractionCache(TopicExtractionModel):
             )
 
         self.session.add(s)
-        self.session.commit()
 
-    def extract(self, docs: list[str]) -> List[str]:
+        try:
+            self.session.commit()
+        except IntegrityError:
+            # the same topics were cached by another worker in the meantime
+            self.session.rollback()
+
+    def get_topics(self, docs: list[str]) -> list[list[str]]:
+        """Topics with all the words returned by the model, extracted only if not on cache."""  # noqa: E501
         topics = self.get_from_cache()
         
         if topics is None:
             topics = self.topic_extraction_model.extract(docs)            
             
-            topics_dict = dict(enumerate(topics))            
-            self.save_on_cache(json.dumps(topics_dict))
+            self.save_topics_on_cache(topics)
+
+        return topics
+
+    def save_topics_on_cache(self, topics: list[list[str]]) -> None:
+        topics_dict = dict(enumerate(topics))
+        self.save_on_cache(json.dumps(topics_dict))
+
+    def extract(self, docs: list[str]) -> List[str]:
+        topics = self.get_topics(docs)
             
         topics_reduced = [topic[:self.n_words_per_topic] for topic in topics]        
         
-        return topics_reduced
\ No newline at end of file
+        return topics_reduced
+
+
+@dataclass
+class PrecomputedTopicExtraction(TopicExtractionModel):
+    """Reuses topics that were already extracted, keeping only `n_words_per_topic` words of each topic."""  # noqa: E501
+
+    topics: list[list[str]]
+    n_words_per_topic: int
+
+    def extract(self, docs: list[str]) -> List[str]:
+        return [topic[: self.n_words_per_topic] for topic in self.topics]
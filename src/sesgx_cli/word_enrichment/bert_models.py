@@ -0,0 +1,112 @@
+"""Process-wide registry of the BERT tokenizers and models used for word enrichment.
+
+Each model is loaded once per process. Optionally, a local copy of the model is kept in
+a cache directory, saved with safetensors, so later runs load it from the local disk
+without reaching the Hugging Face Hub, which also works in offline environments.
+"""  # noqa: E501
+
+import os
+import re
+import shutil
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Optional
+
+from rich import print
+
+DEFAULT_BERT_MODEL = "bert-base-uncased"
+
+BertModelKey = tuple[str, Optional[Path]]
+"""Name of the model and the cache directory used to load it."""
+
+_bert_models: dict[BertModelKey, tuple[Any, Any]] = {}
+
+
+def get_local_copy_path(
+    cache_dir: Path,
+    model_name: str,
+) -> Path:
+    """Path of the directory with the local copy of the model.
+
+    Examples:
+        >>> get_local_copy_path(Path("models"), "google/bert-base-uncased").as_posix()
+        'models/google_bert-base-uncased'
+    """
+    return cache_dir / re.sub(r"[^\w.-]", "_", model_name)
+
+
+def _save_local_copy(
+    local_copy_path: Path,
+    bert_tokenizer: Any,
+    bert_model: Any,
+) -> None:
+    # saved to a temporary directory first, so concurrent workers never load a partial copy
+    tmp_path = local_copy_path.with_name(f"{local_copy_path.name}.{os.getpid()}.tmp")
+
+    bert_tokenizer.save_pretrained(tmp_path)
+    bert_model.save_pretrained(tmp_path, safe_serialization=True)
+
+    try:
+        os.replace(tmp_path, local_copy_path)
+    except OSError:
+        # another worker saved the local copy in the meantime
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def get_bert_model(
+    model_name: str = DEFAULT_BERT_MODEL,
+    *,
+    cache_dir: Optional[Path] = None,
+) -> tuple[Any, Any]:
+    """Gets a BERT tokenizer and masked language model, loading them only once per process.
+
+    The time taken to load the model is printed.
+
+    Args:
+        model_name (str): Name of the model on the Hugging Face Hub. Defaults to `bert-base-uncased`.
+        cache_dir (Optional[Path]): Directory with local copies of the models. If the model has no local copy yet, it is loaded from the hub and saved there.
+
+    Returns:
+        Tuple with the tokenizer and the model, which is set to evaluation mode.
+    """  # noqa: E501
+    key: BertModelKey = (model_name, cache_dir)
+    if key in _bert_models:
+        return _bert_models[key]
+
+    from transformers import BertForMaskedLM, BertTokenizer
+
+    start_time = perf_counter()
+
+    local_copy_path = (
+        get_local_copy_path(cache_dir, model_name) if cache_dir is not None else None
+    )
+
+    if local_copy_path is not None and local_copy_path.exists():
+        bert_tokenizer = BertTokenizer.from_pretrained(
+            local_copy_path, local_files_only=True
+        )
+        bert_model = BertForMaskedLM.from_pretrained(
+            local_copy_path, local_files_only=True
+        )
+        source = f"local copy at {local_copy_path}"
+
+    else:
+        bert_tokenizer = BertTokenizer.from_pretrained(model_name)
+        bert_model = BertForMaskedLM.from_pretrained(model_name)
+        source = "Hugging Face Hub"
+
+        if local_copy_path is not None:
+            local_copy_path.parent.mkdir(parents=True, exist_ok=True)
+            _save_local_copy(local_copy_path, bert_tokenizer, bert_model)
+            source += f", saved local copy at {local_copy_path}"
+
+    bert_model.eval()  # type: ignore
+
+    elapsed_time = perf_counter() - start_time
+    print(
+        f"Loaded [bright_cyan]{model_name}[/] from {source} in [bright_cyan]{elapsed_time:.2f}s[/]."  # noqa: E501
+    )
+
+    _bert_models[key] = (bert_tokenizer, bert_model)
+
+    return bert_tokenizer, bert_model
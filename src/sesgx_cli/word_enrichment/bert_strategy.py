@@ -1,12 +1,12 @@
 """Perform word enrichment using BERT."""
 
-from dataclasses import dataclass
-from typing import Any, List
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 
-import numpy as np
 import torch
 from sesgx import WordEnrichmentModel
 
+from .enrichment_text import SentenceIndex
 from .stemming_filter import filter_with_stemming
 
 
@@ -36,29 +36,50 @@ def check_is_bert_oov_word(
 class BertWordEnrichmentStrategy(WordEnrichmentModel):
     """Perform word enrichment using BERT.
 
+    Words are enriched in batches, where the masked sentences of several words are
+    padded into a single tensor and predicted with a single forward pass.
+
     Attributes:
         enrichment_text (str): Text that will be used to find the context for the word enrichment.
         bert_tokenizer (Any): A BERT tokenizer. For example, `BertTokenizer.from_pretrained("bert-base-uncased")`.
         bert_model (Any): A BERT model. For example, `BertForMaskedLM.from_pretrained("bert-base-uncased")`.
+        batch_size (int): Max number of masked sentences predicted by a single forward pass. Defaults to 32.
+        top_k (int): Number of predictions to take for the masked word, before filtering. Defaults to 30.
     """  # noqa: E501
 
     enrichment_text: str
     bert_tokenizer: Any
     bert_model: Any
+    batch_size: int = 32
+    top_k: int = 30
+    sentence_index: SentenceIndex = field(init=False, repr=False)
 
-    def enrich(self, word: str) -> List[str]:
+    def __post_init__(self):
+        self.sentence_index = SentenceIndex(self.enrichment_text)
+
+    def _create_masked_sentence(
+        self,
+        word: str,
+    ) -> Optional[tuple[list[int], list[int], int]]:
+        """Creates the masked sentence used to predict the similar words.
+
+        Args:
+            word (str): Word to enrich.
+
+        Returns:
+            The token IDs, the segment IDs and the masked index, or None if the word can not be masked.
+        """  # noqa: E501
         if " " in word:
-            return []
+            return None
 
         # this list will actually contain only a single sentence
         # being the first sentence in the `enrichment_text` that contains the word
         selected_sentences: list[str] = []
 
         # selecting the first sentence that contains the word
-        for sentence in self.enrichment_text.split("."):
-            if word in sentence or word in sentence.lower():
-                selected_sentences.append(sentence + ".")
-                break
+        sentence = self.sentence_index.find_sentence(word)
+        if sentence is not None:
+            selected_sentences.append(sentence)
 
         formatted_sentences = "[CLS] "
         for sentence in selected_sentences:
@@ -78,7 +99,7 @@ class BertWordEnrichmentStrategy(WordEnrichmentModel):
                 word_is_in_tokens = True
 
         if not word_is_in_tokens:
-            return []
+            return None
 
         # Convert token to vocabulary indices.
         indexed_tokens = self.bert_tokenizer.convert_tokens_to_ids(tokenized_text)
@@ -88,19 +109,62 @@ class BertWordEnrichmentStrategy(WordEnrichmentModel):
         len_first = len_first + 1
         segments_ids = [0] * len_first + [1] * (len(tokenized_text) - len_first)
 
-        # Convert the inputs to PyTorch tensors.
-        tokens_tensor = torch.tensor([indexed_tokens])
-        segments_tensors = torch.tensor([segments_ids])
+        return indexed_tokens, segments_ids, masked_index
+
+    def _predict_masked_words(
+        self,
+        masked_sentences: list[tuple[list[int], list[int], int]],
+    ) -> list[list[int]]:
+        """Predicts the masked word of each sentence with a single forward pass.
+
+        Sentences are padded to the length of the longest one, and the padding is
+        ignored through the attention mask.
+
+        Returns:
+            The IDs of the top `top_k` predicted tokens of each sentence.
+        """
+        batch_size = len(masked_sentences)
+        max_length = max(len(tokens) for tokens, _, _ in masked_sentences)
+
+        pad_token_id = self.bert_tokenizer.pad_token_id or 0
+
+        tokens_tensor = torch.full(
+            (batch_size, max_length), pad_token_id, dtype=torch.long
+        )
+        segments_tensors = torch.zeros((batch_size, max_length), dtype=torch.long)
+        attention_mask = torch.zeros((batch_size, max_length), dtype=torch.long)
+
+        for i, (indexed_tokens, segments_ids, _) in enumerate(masked_sentences):
+            length = len(indexed_tokens)
+
+            tokens_tensor[i, :length] = torch.tensor(indexed_tokens)
+            segments_tensors[i, :length] = torch.tensor(segments_ids)
+            attention_mask[i, :length] = 1
+
+        masked_indexes = torch.tensor(
+            [masked_index for _, _, masked_index in masked_sentences]
+        )
 
         # Predict all tokens.
-        with torch.no_grad():
-            outputs = self.bert_model(tokens_tensor, token_type_ids=segments_tensors)
+        with torch.inference_mode():
+            outputs = self.bert_model(
+                tokens_tensor,
+                attention_mask=attention_mask,
+                token_type_ids=segments_tensors,
+            )
             predictions = outputs[0]
 
-        # Get top thirty possibilities for the masked word.
-        predicted_index = torch.topk(predictions[0, masked_index], 30)[1]
-        predicted_index = list(np.array(predicted_index))
+            # Get top possibilities for the masked word of each sentence.
+            masked_predictions = predictions[torch.arange(batch_size), masked_indexes]
+            predicted_indexes = torch.topk(masked_predictions, self.top_k).indices
+
+        return predicted_indexes.tolist()
 
+    def _filter_predicted_words(
+        self,
+        word: str,
+        predicted_index: list[int],
+    ) -> list[str]:
         # ???????????????????????????????????????
         # ???????????????????????????????????????
         # ???????????????????????????????????????
@@ -136,3 +200,43 @@ class BertWordEnrichmentStrategy(WordEnrichmentModel):
         )
 
         return tokens_after_stemming
+
+    def enrich(self, word: str) -> List[str]:
+        return self.enrich_many([word])[word]
+
+    def enrich_many(self, words: List[str]) -> Dict[str, List[str]]:
+        """Enriches all the given words, enriching duplicated words only once.
+
+        The masked sentences are predicted in batches of `batch_size`.
+
+        Args:
+            words (List[str]): Words to enrich.
+
+        Returns:
+            A dictionary mapping each word to its enriched words.
+        """
+        enriched_words: dict[str, list[str]] = {}
+        masked_words: list[str] = []
+        masked_sentences: list[tuple[list[int], list[int], int]] = []
+
+        for word in dict.fromkeys(words):
+            enriched_words[word] = []
+
+            masked_sentence = self._create_masked_sentence(word)
+            if masked_sentence is not None:
+                masked_words.append(word)
+                masked_sentences.append(masked_sentence)
+
+        for start in range(0, len(masked_sentences), self.batch_size):
+            end = start + self.batch_size
+
+            predicted_indexes = self._predict_masked_words(masked_sentences[start:end])
+
+            for word, predicted_index in zip(
+                masked_words[start:end], predicted_indexes
+            ):
+                enriched_words[word] = self._filter_predicted_words(
+                    word, predicted_index
+                )
+
+        return enriched_words
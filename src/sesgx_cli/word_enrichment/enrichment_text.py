@@ -1,4 +1,8 @@
-from typing import TypedDict
+from bisect import bisect_right
+from typing import Optional, TypedDict
+
+# sentences are split on periods, so a period never matches across two sentences
+_SENTENCE_SEPARATOR = "."
 
 
 class EnrichmentStudy(TypedDict):
@@ -50,3 +54,108 @@ def create_enrichment_text(
         enrichment_text += line
 
     return enrichment_text
+
+
+class SentenceIndex:
+    """Index over the sentences of an enrichment text.
+
+    Finds the first sentence that contains a word, either in the original or in the
+    lowercase sentence, like searching each sentence in order. Instead of a Python loop
+    over the sentences, the text (and its lowercase version) is searched with `str.find`,
+    and the position found is mapped back to its sentence. Since sentences are split on
+    periods, words with a period are never found. Results are memoized.
+
+    This is not a token index: a word matches any substring of a sentence (`learn` is
+    found in `learning`), so each new word still scans the whole text, in O(text length).
+    What is saved is splitting and lowercasing the text for every word.
+
+    Args:
+        enrichment_text (str): Text that will be used to find the context for the word enrichment.
+
+    Examples:
+        >>> index = SentenceIndex("Machine learning is used. Deep Learning too. learn")
+        >>> index.find_sentence("learning")
+        'Machine learning is used.'
+        >>> index.find_sentence("deep learning")
+        ' Deep Learning too.'
+        >>> index.find_sentence("learn")
+        'Machine learning is used.'
+        >>> index.find_sentence("Learning")
+        ' Deep Learning too.'
+        >>> index.find_sentence("robotics") is None
+        True
+    """  # noqa: E501
+
+    def __init__(self, enrichment_text: str) -> None:  # noqa: D107
+        self.sentences: list[str] = enrichment_text.split(".")
+
+        self._text, self._offsets = self._join(self.sentences)
+        self._lowercase_text, self._lowercase_offsets = self._join(
+            # lowercasing a sentence may change its length, so each one is lowercased
+            [sentence.lower() for sentence in self.sentences]
+        )
+
+        self._sentence_id_by_word: dict[str, Optional[int]] = {}
+
+    @staticmethod
+    def _join(sentences: list[str]) -> tuple[str, list[int]]:
+        offsets: list[int] = []
+        offset = 0
+
+        for sentence in sentences:
+            offsets.append(offset)
+            offset += len(sentence) + len(_SENTENCE_SEPARATOR)
+
+        return _SENTENCE_SEPARATOR.join(sentences), offsets
+
+    @staticmethod
+    def _find_in(word: str, text: str, offsets: list[int]) -> Optional[int]:
+        position = text.find(word)
+        if position == -1:
+            return None
+
+        return bisect_right(offsets, position) - 1
+
+    def _search_sentence_id(self, word: str) -> Optional[int]:
+        if _SENTENCE_SEPARATOR in word:
+            return None
+
+        sentence_ids = [
+            sentence_id
+            for sentence_id in (
+                self._find_in(word, self._text, self._offsets),
+                self._find_in(word, self._lowercase_text, self._lowercase_offsets),
+            )
+            if sentence_id is not None
+        ]
+
+        return min(sentence_ids, default=None)
+
+    def find_sentence_id(self, word: str) -> Optional[int]:
+        """Finds the first sentence that contains the given word.
+
+        Args:
+            word (str): Word to search for.
+
+        Returns:
+            The index of the sentence, or None if no sentence contains the word.
+        """
+        if word not in self._sentence_id_by_word:
+            self._sentence_id_by_word[word] = self._search_sentence_id(word)
+
+        return self._sentence_id_by_word[word]
+
+    def find_sentence(self, word: str) -> Optional[str]:
+        """Finds the first sentence that contains the given word, with its trailing period.
+
+        Args:
+            word (str): Word to search for.
+
+        Returns:
+            The sentence, or None if no sentence contains the word.
+        """  # noqa: E501
+        sentence_id = self.find_sentence_id(word)
+        if sentence_id is None:
+            return None
+
+        return self.sentences[sentence_id] + "."
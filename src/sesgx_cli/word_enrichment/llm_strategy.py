@@ -1,16 +1,21 @@
 """Perform word enrichment using LLM models."""
 
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from string import punctuation
-from typing import List
+from typing import Dict, List, Optional
 
 from langchain_community.llms import Ollama
 from langchain_core.output_parsers.json import SimpleJsonOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 from sesgx import WordEnrichmentModel
-from tenacity import retry, stop_after_attempt, wait_fixed
+from tenacity import retry, stop_after_attempt, wait_random_exponential
 
+from .enrichment_text import SentenceIndex
 from .stemming_filter import filter_with_stemming
+from .strategies import PartialEnrichmentError
 
 _PUNCTUATION: set[str] = set(punctuation) - {"'", "-"}
 
@@ -37,12 +42,70 @@ class Prompts:
         )
 
 
+class TokenBucket:
+    """Async token bucket rate limiter.
+
+    Tokens are refilled continuously at `rate` tokens per second, up to `capacity`.
+    Each call to `acquire` consumes a token, waiting until one is available.
+
+    Args:
+        rate (float): Number of tokens refilled per second.
+        capacity (int): Max number of tokens stored, which is the allowed burst size.
+    """  # noqa: E501
+
+    def __init__(self, rate: float, capacity: int = 1) -> None:  # noqa: D107
+        self.rate = rate
+        self.capacity = capacity
+
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._last_refill) * self.rate
+        )
+        self._last_refill = now
+
+    async def acquire(self) -> None:
+        """Waits until a token is available and consumes it."""
+        # the lock is created lazily so it is bound to the running event loop
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            self._refill()
+
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+
+            self._tokens -= 1
+
+
 class LLMWordEnrichmentStrategy(WordEnrichmentModel):
+    """Perform word enrichment using LLMs.
+
+    `enrich_many` enriches the words concurrently through the async API of the model,
+    with at most `max_concurrency` requests in flight and at most `requests_per_second`
+    requests started per second.
+
+    Args:
+        enrichment_text (str): Text that will be used to find the context for the word enrichment.
+        model (str): Name of the model. GPT models are accessed through OpenAI, others through Ollama.
+        prompt (ChatPromptTemplate): Prompt used to generate the similar words.
+        max_concurrency (int): Max number of concurrent requests. Defaults to 8.
+        requests_per_second (float): Max number of requests started per second. Defaults to 4.
+    """  # noqa: E501
+
     def __init__(
         self,  # noqa: D107
         enrichment_text: str,
         model: str = "mistral",
         prompt: ChatPromptTemplate = Prompts().prompt,
+        max_concurrency: int = 8,
+        requests_per_second: float = 4,
     ):
         self.model = model
         self.prompt = prompt
@@ -51,7 +114,10 @@ class LLMWordEnrichmentStrategy(WordEnrichmentModel):
         self.llm: ChatOpenAI | Ollama
 
         self.enrichment_text: str = enrichment_text
+        self.sentence_index = SentenceIndex(enrichment_text)
         self.number_similar_words: int = 7
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
         self.init_model()
 
     def init_model(self) -> None:
@@ -97,16 +163,14 @@ class LLMWordEnrichmentStrategy(WordEnrichmentModel):
 
         return similar_words
 
-    @retry(stop=stop_after_attempt(3), wait=wait_fixed(30), reraise=True)
-    def _invoke_model(self, context: str, word: str) -> list[str]:
-        response = self.chain.invoke(
-            {
-                "context": context,
-                "number_similar_words": self.number_similar_words,
-                "word_to_be_enriched": word,
-            }
-        )
+    def _create_model_input(self, context: str, word: str) -> dict:
+        return {
+            "context": context,
+            "number_similar_words": self.number_similar_words,
+            "word_to_be_enriched": word,
+        }
 
+    def _parse_response(self, response, word: str) -> list[str]:
         if "gpt" in self.model:
             response = self.json_parser.parse(response.content)
 
@@ -117,6 +181,36 @@ class LLMWordEnrichmentStrategy(WordEnrichmentModel):
 
         return similar_words
 
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_random_exponential(multiplier=2, max=60),
+        reraise=True,
+    )
+    def _invoke_model(self, context: str, word: str) -> list[str]:
+        response = self.chain.invoke(self._create_model_input(context, word))
+
+        return self._parse_response(response, word)
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_random_exponential(multiplier=2, max=60),
+        reraise=True,
+    )
+    async def _ainvoke_model(
+        self,
+        context: str,
+        word: str,
+        semaphore: asyncio.Semaphore,
+        token_bucket: TokenBucket,
+    ) -> list[str]:
+        # the semaphore is held only during the request,
+        # so retries waiting for the backoff do not take a slot
+        async with semaphore:
+            await token_bucket.acquire()
+            response = await self.chain.ainvoke(self._create_model_input(context, word))
+
+        return self._parse_response(response, word)
+
     def enrich(self, word: str) -> List[str]:
         """Generates similar words using LLMs.
 
@@ -126,16 +220,28 @@ class LLMWordEnrichmentStrategy(WordEnrichmentModel):
         Returns:
             A list of similar words.
         """
-        selected_sentences: list[str] = []
+        context = self.sentence_index.find_sentence(word) or ""
 
-        for sentence in self.enrichment_text.split("."):
-            if word in sentence or word in sentence.lower():
-                selected_sentences.append(sentence + ".")
-                break
+        similar_words = self._invoke_model(context, word)
 
-        context = " ".join(selected_sentences)
+        similar_words_after_stemming = filter_with_stemming(
+            word,
+            enriched_words_list=similar_words,
+        )
 
-        similar_words = self._invoke_model(context, word)
+        return similar_words_after_stemming
+
+    async def _aenrich(
+        self,
+        word: str,
+        semaphore: asyncio.Semaphore,
+        token_bucket: TokenBucket,
+    ) -> List[str]:
+        context = self.sentence_index.find_sentence(word) or ""
+
+        similar_words = await self._ainvoke_model(
+            context, word, semaphore, token_bucket
+        )
 
         similar_words_after_stemming = filter_with_stemming(
             word,
@@ -143,3 +249,68 @@ class LLMWordEnrichmentStrategy(WordEnrichmentModel):
         )
 
         return similar_words_after_stemming
+
+    async def aenrich_many(self, words: List[str]) -> Dict[str, List[str]]:
+        """Generates similar words for all the given words concurrently, enriching duplicated words only once.
+
+        A word that fails (after its retries) does not cancel the other requests.
+
+        Args:
+            words (List[str]): Words to enrich.
+
+        Raises:
+            PartialEnrichmentError: If any word failed, with the similar words of the words that succeeded.
+
+        Returns:
+            A dictionary mapping each word to its similar words.
+        """  # noqa: E501
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        token_bucket = TokenBucket(
+            rate=self.requests_per_second,
+            capacity=self.max_concurrency,
+        )
+
+        unique_words = list(dict.fromkeys(words))
+        results = await asyncio.gather(
+            *(self._aenrich(word, semaphore, token_bucket) for word in unique_words),
+            return_exceptions=True,
+        )
+
+        similar_words: dict[str, list[str]] = {}
+        errors: dict[str, BaseException] = {}
+
+        for word, result in zip(unique_words, results):
+            if isinstance(result, BaseException):
+                errors[word] = result
+            else:
+                similar_words[word] = result
+
+        if len(errors) > 0:
+            raise PartialEnrichmentError(similar_words, errors) from next(
+                iter(errors.values())
+            )
+
+        return similar_words
+
+    def enrich_many(self, words: List[str]) -> Dict[str, List[str]]:
+        """Generates similar words for all the given words, enriching duplicated words only once.
+
+        The words are enriched concurrently by `aenrich_many`. If an event loop is already
+        running in this thread, it runs on a new event loop in a separate thread.
+
+        Args:
+            words (List[str]): Words to enrich.
+
+        Raises:
+            PartialEnrichmentError: If any word failed, with the similar words of the words that succeeded.
+
+        Returns:
+            A dictionary mapping each word to its similar words.
+        """  # noqa: E501
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.aenrich_many(words))
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.aenrich_many(words)).result()
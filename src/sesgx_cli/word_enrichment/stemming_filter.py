@@ -2,19 +2,40 @@
 
 Attributes:
     PUNCTUATION (set[str]): Set of punctuation characters. Defaults to `#!python set(string.punctuation)`.
+    LEVENSHTEIN_DISTANCE (int): Stemmed words with a greater levenshtein distance are distant, and with a smaller one are close. Defaults to 4.
 """  # noqa: E501
 
+from functools import lru_cache
 from string import punctuation
 
 from nltk.stem import LancasterStemmer  # type: ignore
+from rapidfuzz import process
 from rapidfuzz.distance import Levenshtein
 
 PUNCTUATION: set[str] = set(punctuation)
+LEVENSHTEIN_DISTANCE: int = 4
 
 
 lancaster = LancasterStemmer()
 
 
+@lru_cache(maxsize=100_000)
+def stem(word: str) -> str:
+    """Stems the given word with the Lancaster stemmer, memoizing the result.
+
+    Args:
+        word (str): Word to stem.
+
+    Returns:
+        The stemmed word.
+
+    Examples:
+        >>> stem("maximum")
+        'maxim'
+    """
+    return lancaster.stem(word)
+
+
 def check_strings_are_distant(
     s1: str,
     s2: str,
@@ -34,8 +55,7 @@ def check_strings_are_distant(
         >>> check_strings_are_distant("string", "strng")
         False
     """  # noqa: E501
-    levenshtein_distance = 4
-    return Levenshtein.distance(str(s1), str(s2)) > levenshtein_distance
+    return Levenshtein.distance(str(s1), str(s2)) > LEVENSHTEIN_DISTANCE
 
 
 def check_strings_are_close(
@@ -57,8 +77,7 @@ def check_strings_are_close(
         >>> check_strings_are_close("string", "strng")
         True
     """  # noqa: E501
-    levenshtein_distance = 4
-    return Levenshtein.distance(str(s1), str(s2)) < levenshtein_distance
+    return Levenshtein.distance(str(s1), str(s2)) < LEVENSHTEIN_DISTANCE
 
 
 def check_stemmed_enriched_word_is_valid(
@@ -126,12 +145,17 @@ def check_stemmed_enriched_word_is_duplicate(
         ... )
         True
     """  # noqa: E501
-    for word in stemmed_enriched_words_list:
-        is_close = check_strings_are_close(word, stemmed_enriched_word)
-        if is_close:
-            return True
+    if len(stemmed_enriched_words_list) == 0:
+        return False
+
+    # same criteria as `check_strings_are_close`, against the whole list at once
+    distances = process.cdist(
+        [str(stemmed_enriched_word)],
+        [str(word) for word in stemmed_enriched_words_list],
+        scorer=Levenshtein.distance,
+    )
 
-    return False
+    return bool((distances < LEVENSHTEIN_DISTANCE).any())
 
 
 def check_word_is_punctuation(
@@ -221,7 +245,7 @@ def filter_with_stemming(
     Returns:
         List of filtered enriched words.
     """  # noqa: E501
-    stemmed_word: str = lancaster.stem(word)
+    stemmed_word: str = stem(word)
 
     # list with the filtered enriched words
     relevant_enriched_words: list[str] = []
@@ -230,7 +254,7 @@ def filter_with_stemming(
     stemmed_relevant_enriched_words: list[str] = []
 
     for enriched_word in enriched_words_list:
-        stemmed_enriched_word = lancaster.stem(enriched_word)
+        stemmed_enriched_word = stem(enriched_word)
 
         enriched_word_is_relevant = check_enriched_word_is_relevant(
             enriched_word,
@@ -8,3 +8,27 @@ class WordEnrichmentStrategy(str, Enum):
     mistral = "mistral"
     gpt = "gpt-3.5-turbo"
     llama = "llama3"
+
+
+class PartialEnrichmentError(RuntimeError):
+    """Raised when some words of a batch could not be enriched.
+
+    Holds the enrichments of the words that succeeded, so they can be saved before the
+    error is propagated.
+
+    Args:
+        enriched_words (dict[str, list[str]]): Enrichments of the words that succeeded.
+        errors (dict[str, BaseException]): Error raised for each word that failed.
+    """  # noqa: E501
+
+    def __init__(  # noqa: D107
+        self,
+        enriched_words: dict[str, list[str]],
+        errors: dict[str, BaseException],
+    ) -> None:
+        super().__init__(
+            f"Failed to enrich {len(errors)} of {len(errors) + len(enriched_words)} words: {list(errors)}"  # noqa: E501
+        )
+
+        self.enriched_words = enriched_words
+        self.errors = errors
@@ -1,5 +1,6 @@
-from dataclasses import dataclass
-from typing import List
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 
 from sesgx import WordEnrichmentModel
 from sesgx_cli.database.models import (
@@ -7,11 +8,95 @@ from sesgx_cli.database.models import (
     EnrichedWordsCacheKey,
     Experiment,
 )
-from sesgx_cli.word_enrichment.strategies import WordEnrichmentStrategy
+from sesgx_cli.word_enrichment.strategies import (
+    PartialEnrichmentError,
+    WordEnrichmentStrategy,
+)
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload
 
 
+# (experiment_id, word_enrichment_strategy, word)
+EnrichedWordsKey = tuple[int, str, str]
+
+
+class EnrichedWordsMemoryCache:
+    """Bounded in-memory LRU cache of enriched words, used in front of the database cache.
+
+    Args:
+        max_size (int): Max number of words kept in memory. If 0, nothing is kept.
+
+    Attributes:
+        hits (int): Number of lookups found in memory.
+        misses (int): Number of lookups not found in memory.
+    """  # noqa: E501
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: OrderedDict[EnrichedWordsKey, list[str]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __str__(self) -> str:
+        return f"{self.hits} hits, {self.misses} misses, {len(self)} of {self.max_size} words"  # noqa: E501
+
+    def get(self, key: EnrichedWordsKey) -> list[str] | None:
+        enriched_words = self._entries.get(key)
+
+        if enriched_words is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+
+        return enriched_words
+
+    def put(self, key: EnrichedWordsKey, enriched_words: list[str]) -> None:
+        if self.max_size <= 0:
+            return
+
+        self._entries[key] = enriched_words
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def warm_up(self, experiment_id: int, session: Session) -> None:
+        """Loads every enrichment cached on the database for the experiment with a single query."""  # noqa: E501
+        if self.max_size <= 0:
+            return
+
+        stmt = (
+            select(
+                EnrichedWordsCacheKey.word_enrichment_strategy,
+                EnrichedWordsCacheKey.word,
+                CachedEnrichedWords.word,
+            )
+            .join(EnrichedWordsCacheKey.cached_enriched_words_list, isouter=True)
+            .where(EnrichedWordsCacheKey.experiment_id == experiment_id)
+            .order_by(EnrichedWordsCacheKey.id, CachedEnrichedWords.id)
+        )
+
+        entries: dict[EnrichedWordsKey, list[str]] = {}
+        for word_enrichment_strategy, word, enriched_word in session.execute(stmt):
+            enriched_words = entries.setdefault(
+                (experiment_id, word_enrichment_strategy, word), []
+            )
+
+            # words without enrichments have a single row with a null enriched word
+            if enriched_word is not None:
+                enriched_words.append(enriched_word)
+
+        for key, enriched_words in entries.items():
+            self.put(key, enriched_words)
+
+
 @dataclass
 class WordEnrichmentCache(WordEnrichmentModel):
     word_enrichment_model: WordEnrichmentModel
@@ -19,12 +104,20 @@ class WordEnrichmentCache(WordEnrichmentModel):
     session: Session
     experiment: Experiment
     n_enrichments: int
+    memory_cache: Optional[EnrichedWordsMemoryCache] = None
+    save_chunk_size: int = 64
+
+    experiment_id: int = field(init=False)
+
+    def __post_init__(self):
+        # read once, since the experiment is expired on every commit
+        self.experiment_id = self.experiment.id
 
     def get_from_cache(self, key: str) -> list[str] | None:
         stmt = (
             select(EnrichedWordsCacheKey)
             .options(joinedload(EnrichedWordsCacheKey.cached_enriched_words_list))
-            .where(EnrichedWordsCacheKey.experiment_id == self.experiment.id)
+            .where(EnrichedWordsCacheKey.experiment_id == self.experiment_id)
             .where(EnrichedWordsCacheKey.word == key)
             .where(
                 EnrichedWordsCacheKey.word_enrichment_strategy
@@ -39,9 +132,31 @@ class WordEnrichmentCache(WordEnrichmentModel):
 
         return [cached_word.word for cached_word in result.cached_enriched_words_list]
 
-    def save_on_cache(self, key: str, value: list[str]) -> None:
-        s = EnrichedWordsCacheKey(
-            experiment_id=self.experiment.id,
+    def get_many_from_cache(self, keys: list[str]) -> dict[str, list[str]]:
+        """Retrieves the cached enrichments of all given words with a single query."""
+        stmt = (
+            select(EnrichedWordsCacheKey)
+            .options(joinedload(EnrichedWordsCacheKey.cached_enriched_words_list))
+            .where(EnrichedWordsCacheKey.experiment_id == self.experiment_id)
+            .where(EnrichedWordsCacheKey.word.in_(keys))
+            .where(
+                EnrichedWordsCacheKey.word_enrichment_strategy
+                == self.word_enrichment_strategy.value
+            )
+        )
+
+        results = self.session.execute(stmt).unique().scalars()
+
+        return {
+            result.word: [
+                cached_word.word for cached_word in result.cached_enriched_words_list
+            ]
+            for result in results
+        }
+
+    def _create_cache_entry(self, key: str, value: list[str]) -> EnrichedWordsCacheKey:
+        return EnrichedWordsCacheKey(
+            experiment_id=self.experiment_id,
             experiment=self.experiment,
             word_enrichment_strategy=self.word_enrichment_strategy.value,
             word=key,
@@ -53,15 +168,129 @@ class WordEnrichmentCache(WordEnrichmentModel):
             ],
         )
 
+    def save_many_on_cache(self, values: dict[str, list[str]]) -> None:
+        """Saves the enrichments of all given words in a single transaction."""
+        if len(values) == 0:
+            return
+
+        self.session.add_all(
+            [self._create_cache_entry(key, value) for key, value in values.items()]
+        )
+
+        try:
+            self.session.commit()
+        except IntegrityError:
+            # some words were cached by another worker in the meantime,
+            # so the words are saved one by one to keep the other ones
+            self.session.rollback()
+
+            for key, value in values.items():
+                self.save_on_cache(key, value)
+
+    def save_on_cache(self, key: str, value: list[str]) -> None:
+        s = self._create_cache_entry(key, value)
+
         self.session.add(s)
-        self.session.commit()
+
+        try:
+            self.session.commit()
+        except IntegrityError:
+            # the same word was cached by another worker in the meantime
+            self.session.rollback()
 
     def enrich(self, word: str) -> List[str]:
-        enriched_words = self.get_from_cache(word)
+        memory_key = (self.experiment_id, self.word_enrichment_strategy.value, word)
+
+        enriched_words = None
+        if self.memory_cache is not None:
+            enriched_words = self.memory_cache.get(memory_key)
+
         if enriched_words is None:
-            enriched_words = self.word_enrichment_model.enrich(word)
-            self.save_on_cache(word, enriched_words)
+            enriched_words = self.get_from_cache(word)
+
+            if enriched_words is None:
+                enriched_words = self.word_enrichment_model.enrich(word)
+                self.save_on_cache(word, enriched_words)
+
+            if self.memory_cache is not None:
+                self.memory_cache.put(memory_key, enriched_words)
 
         enriched_words_reduced = enriched_words[: self.n_enrichments]
 
         return enriched_words_reduced
+
+    def _enrich_words(self, words: List[str]) -> Dict[str, List[str]]:
+        if hasattr(self.word_enrichment_model, "enrich_many"):
+            try:
+                return self.word_enrichment_model.enrich_many(words)
+            except PartialEnrichmentError as e:
+                # keeps the words that were enriched
+                self.save_many_on_cache(e.enriched_words)
+                raise
+
+        computed: dict[str, list[str]] = {}
+        try:
+            for word in words:
+                computed[word] = self.word_enrichment_model.enrich(word)
+        except Exception:
+            # keeps the words enriched before the failure
+            self.save_many_on_cache(computed)
+            raise
+
+        return computed
+
+    def enrich_many(self, words: List[str]) -> Dict[str, List[str]]:
+        """Enriches all the given words at once.
+
+        Duplicated words are enriched only once. Words not found in memory are retrieved
+        from the database with a single query, and the remaining ones are enriched in
+        chunks of `save_chunk_size` words, each chunk with a single call to the model and
+        saved in a single transaction as soon as it is enriched. So if the model fails, the
+        words of the previous chunks are not enriched again.
+
+        Args:
+            words (List[str]): Words to enrich.
+
+        Returns:
+            A dictionary mapping each word to its enriched words.
+        """  # noqa: E501
+        unique_words = list(dict.fromkeys(words))
+        enriched_words_by_word: dict[str, list[str]] = {}
+
+        def get_memory_key(word: str) -> EnrichedWordsKey:
+            return (self.experiment_id, self.word_enrichment_strategy.value, word)
+
+        if self.memory_cache is not None:
+            for word in unique_words:
+                enriched_words = self.memory_cache.get(get_memory_key(word))
+
+                if enriched_words is not None:
+                    enriched_words_by_word[word] = enriched_words
+
+        missing_words = [w for w in unique_words if w not in enriched_words_by_word]
+        new_enriched_words_by_word: dict[str, list[str]] = {}
+
+        if len(missing_words) > 0:
+            new_enriched_words_by_word.update(self.get_many_from_cache(missing_words))
+
+            words_to_enrich = [
+                w for w in missing_words if w not in new_enriched_words_by_word
+            ]
+
+            for start in range(0, len(words_to_enrich), self.save_chunk_size):
+                chunk = words_to_enrich[start : start + self.save_chunk_size]
+                computed = self._enrich_words(chunk)
+
+                self.save_many_on_cache(computed)
+                new_enriched_words_by_word.update(computed)
+
+        if self.memory_cache is not None:
+            for word, enriched_words in new_enriched_words_by_word.items():
+                self.memory_cache.put(get_memory_key(word), enriched_words)
+
+        enriched_words_by_word.update(new_enriched_words_by_word)
+
+        return {
+            word: enriched_words_by_word[word][: self.n_enrichments]
+            for word in unique_words
+        }
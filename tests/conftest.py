@@ -0,0 +1,4 @@
+import os
+
+# modules that import the database connection require it, even if no test connects
+os.environ.setdefault("SESG_DATABASE_URL", "sqlite://")
@@ -0,0 +1,61 @@
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine, func, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from sesgx_cli.database.models import FormulationParams  # noqa: E402
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    FormulationParams.metadata.create_all(engine, tables=[FormulationParams.__table__])
+
+    with Session(engine) as session:
+        yield session
+
+
+def test_get_or_save_many_returns_an_instance_for_each_row(session):
+    rows = [(5, 1), (10, 1), (5, 1), (5, 2)]
+
+    params = FormulationParams.get_or_save_many(
+        columns=("n_words_per_topic", "n_enrichments_per_word"),
+        rows=rows,
+        session=session,
+    )
+
+    assert [(p.n_words_per_topic, p.n_enrichments_per_word) for p in params] == rows
+    # duplicated rows are saved once and share the instance
+    assert params[0] is params[2]
+    assert session.scalar(select(func.count()).select_from(FormulationParams)) == 3
+
+
+def test_get_or_save_many_reuses_saved_rows(session):
+    saved = FormulationParams.get_or_save(
+        n_words_per_topic=5,
+        n_enrichments_per_word=1,
+        session=session,
+    )
+
+    params = FormulationParams.get_or_save_from_params_product(
+        n_words_per_topic_list=[5, 10],
+        n_enrichments_per_word_list=[1],
+        session=session,
+    )
+
+    assert params[0].id == saved.id
+    assert params[1].id != saved.id
+    assert session.scalar(select(func.count()).select_from(FormulationParams)) == 2
+
+
+def test_get_or_save_many_without_rows(session):
+    assert (
+        FormulationParams.get_or_save_many(
+            columns=("n_words_per_topic", "n_enrichments_per_word"),
+            rows=[],
+            session=session,
+        )
+        == []
+    )
@@ -0,0 +1,78 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+
+from sesgx_cli.word_enrichment.bert_strategy import (  # noqa: E402
+    BertWordEnrichmentStrategy,
+)
+
+SPECIAL_TOKENS = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]
+WORDS = [
+    "machine", "learning", "is", "used", "for", "software", "testing", "deep",
+    "neural", "networks", "predict", "defects", "in", "large", "systems", "code",
+    "review", "metrics", "and", "models", "tools", "##ing", "##s", "data",
+]  # fmt: skip
+
+ENRICHMENT_TEXT = (
+    "Machine learning is used for software testing. "
+    "Deep neural networks predict defects in large software systems. "
+    "Code review metrics and models. "
+    "Tools."
+)
+
+
+@pytest.fixture
+def strategy(tmp_path) -> BertWordEnrichmentStrategy:
+    vocab_file = tmp_path / "vocab.txt"
+    vocab_file.write_text("\n".join(SPECIAL_TOKENS + WORDS) + "\n")
+
+    torch.manual_seed(0)
+    config = transformers.BertConfig(
+        vocab_size=len(SPECIAL_TOKENS) + len(WORDS),
+        hidden_size=32,
+        num_hidden_layers=2,
+        num_attention_heads=2,
+        intermediate_size=64,
+    )
+    bert_model = transformers.BertForMaskedLM(config).eval()
+
+    return BertWordEnrichmentStrategy(
+        enrichment_text=ENRICHMENT_TEXT,
+        bert_tokenizer=transformers.BertTokenizer(str(vocab_file)),
+        bert_model=bert_model,
+        top_k=8,
+    )
+
+
+def test_batched_predictions_match_unbatched(strategy):
+    # sentences of different lengths, so the batch needs padding
+    masked_sentences = [
+        strategy._create_masked_sentence(word)
+        for word in ["testing", "defects", "review", "tools"]
+    ]
+    assert all(masked_sentence is not None for masked_sentence in masked_sentences)
+    assert len({len(tokens) for tokens, _, _ in masked_sentences}) > 1
+
+    batched = strategy._predict_masked_words(masked_sentences)
+    unbatched = [
+        strategy._predict_masked_words([masked_sentence])[0]
+        for masked_sentence in masked_sentences
+    ]
+
+    assert batched == unbatched
+
+
+def test_enrich_many_does_not_depend_on_batch_size(strategy):
+    words = ["testing", "defects", "review", "tools", "missing", "testing"]
+
+    strategy.batch_size = 32
+    batched = strategy.enrich_many(words)
+
+    strategy.batch_size = 1
+    unbatched = strategy.enrich_many(words)
+
+    assert batched == unbatched
+    assert list(batched) == ["testing", "defects", "review", "tools", "missing"]
+    assert batched["missing"] == []
+    assert batched["testing"] == strategy.enrich("testing")
@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from sesgx_cli.citation_graph import (  # noqa: E402
+    ReachabilityIndex,
+    directed_adjacency_list_to_undirected,
+    snowballing,
+)
+
+
+def random_adjacency_list(rng: random.Random, n_nodes: int) -> dict[int, list[int]]:
+    # sparse node IDs, with cycles and nodes without references
+    node_ids = rng.sample(range(10 * n_nodes), k=n_nodes)
+
+    return {
+        node_id: rng.sample(node_ids, k=rng.randint(0, 3))
+        for node_id in node_ids
+        if rng.random() < 0.8
+    }
+
+
+@pytest.mark.parametrize("n_nodes", [1, 7, 64, 300])
+def test_reachability_index_matches_snowballing(n_nodes):
+    rng = random.Random(n_nodes)
+    directed_adjacency_list = random_adjacency_list(rng, n_nodes)
+
+    for adjacency_list in [
+        directed_adjacency_list,
+        directed_adjacency_list_to_undirected(directed_adjacency_list),
+    ]:
+        index = ReachabilityIndex(adjacency_list)
+        nodes = list(adjacency_list)
+
+        for _ in range(20):
+            # includes a node that is not on the graph
+            start_set = rng.sample(nodes, k=rng.randint(0, len(nodes))) + [-1]
+
+            assert index.reachable_from(start_set) == snowballing(
+                adjacency_list=adjacency_list,
+                start_set=start_set,
+            )
+
+
+def test_reachability_index_of_empty_graph():
+    index = ReachabilityIndex({})
+
+    assert index.reachable_from([]) == []
+    assert index.reachable_from([3, 1]) == [1, 3]
@@ -0,0 +1,84 @@
+import os
+import subprocess
+import sys
+from importlib import import_module
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("typer")
+
+from sesgx_cli.cli import _CLI_APPS, _get_app_help  # noqa: E402
+
+CLI_DIR = Path(__file__).parents[1] / "src" / "sesgx_cli" / "cli"
+
+# `sesg --help` must import none of the sub-apps, nor the heavy dependencies they use
+MODULES_NOT_IMPORTED_BY_HELP = [
+    *(f"sesgx_cli.cli.{cli_module_name}" for cli_module_name in _CLI_APPS.values()),
+    "sesgx_cli.env_vars",
+    "sesgx_cli.database",
+    "sqlalchemy",
+    "pandas",
+    "sklearn",
+    "torch",
+]
+
+# cumulative import time allowed for `sesg --help`, override it on slow machines
+HELP_IMPORT_TIME_BUDGET_SECONDS = float(
+    os.environ.get("SESG_HELP_IMPORT_TIME_BUDGET_SECONDS", "1.5")
+)
+
+
+def test_cli_apps_match_the_cli_modules():
+    assert _CLI_APPS == {
+        path.stem.replace("_", "-"): path.stem
+        for path in CLI_DIR.glob("*.py")
+        if not (path.stem.startswith("__") and path.stem.endswith("__"))
+    }
+
+
+@pytest.mark.parametrize("cli_module_name", sorted(_CLI_APPS.values()))
+def test_help_read_from_the_source_matches_the_app(cli_module_name):
+    # modules whose dependencies are not installed are still covered by `--help`
+    try:
+        module = import_module(f"sesgx_cli.cli.{cli_module_name}")
+    except ImportError as e:
+        pytest.skip(str(e))
+
+    app_help = _get_app_help(cli_module_name)
+
+    assert app_help is not None
+    assert app_help == module.app.info.help
+
+
+def test_help_imports_only_the_root_app():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "from sesgx_cli.cli import app; app(['--help'])",
+        ],
+        capture_output=True,
+        text=True,
+        env={
+            **os.environ,
+            "PYTHONPATH": os.pathsep.join(sys.path),
+        },
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert "Create or drop the database." in result.stdout
+
+    # lines look like `import time:   self [us] | cumulative | imported package`
+    import_lines = [
+        line.removeprefix("import time:").split("|")
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "imported package" not in line
+    ]
+    imported_modules = {package.strip() for _, _, package in import_lines}
+    import_time_seconds = sum(int(self_us) for self_us, _, _ in import_lines) / 1e6
+
+    assert imported_modules.isdisjoint(MODULES_NOT_IMPORTED_BY_HELP)
+    assert import_time_seconds < HELP_IMPORT_TIME_BUDGET_SECONDS
@@ -0,0 +1,87 @@
+import random
+
+import pytest
+
+pytest.importorskip("sklearn")
+pytest.importorskip("rapidfuzz")
+
+from sesgx_cli.evaluation_factory import EvaluationFactory, Study  # noqa: E402
+
+WORDS = [
+    "software", "testing", "machine", "learning", "defect", "prediction",
+    "code", "review", "model", "metrics", "neural", "network", "empirical",
+    "study", "tool", "support", "requirements", "engineering", "mining",
+]  # fmt: skip
+
+
+@pytest.fixture(scope="module")
+def evaluation_factory() -> EvaluationFactory:
+    rng = random.Random(0)
+
+    gs: list[Study] = []
+    for id in range(30):
+        gs.append(
+            Study(
+                id=id,
+                title=" ".join(rng.choices(WORDS, k=rng.randint(3, 8))),
+                references=rng.sample(gs, k=min(len(gs), rng.randint(0, 2))),
+            )
+        )
+
+    return EvaluationFactory(gs=gs, qgs=gs[::3])
+
+
+@pytest.fixture(scope="module")
+def scopus_results_sets(evaluation_factory) -> list[list[str]]:
+    rng = random.Random(1)
+    gs_titles = [s.title for s in evaluation_factory.gs]
+
+    def random_title() -> str:
+        if rng.random() < 0.3:
+            return rng.choice(gs_titles).upper() + " "
+
+        return " ".join(rng.choices(WORDS, k=rng.randint(2, 10)))
+
+    return [
+        [random_title() for _ in range(rng.choice([0, 1, 5, 40, 120]))]
+        for _ in range(25)
+    ]
+
+
+def evaluate_incrementally(evaluation_factory, scopus_results, chunk_size):
+    incremental_evaluation = evaluation_factory.create_incremental_evaluation(
+        chunk_size=chunk_size
+    )
+
+    for start in range(0, len(scopus_results), 7):
+        incremental_evaluation.add(scopus_results[start : start + 7])
+
+    return incremental_evaluation.evaluate()
+
+
+def test_evaluate_many_matches_incremental_evaluation(
+    evaluation_factory,
+    scopus_results_sets,
+):
+    evaluations = evaluation_factory.evaluate_many(scopus_results_sets)
+
+    assert evaluations == [
+        evaluate_incrementally(evaluation_factory, scopus_results, chunk_size=1000)
+        for scopus_results in scopus_results_sets
+    ]
+    assert any(len(e.gs_in_scopus) > 0 for e in evaluations)
+
+
+@pytest.mark.parametrize("block_size", [1, 3, 50, 200])
+def test_evaluate_many_does_not_depend_on_the_block_size(
+    evaluation_factory,
+    scopus_results_sets,
+    block_size,
+):
+    n_studies = len(evaluation_factory.gs) + len(evaluation_factory.qgs)
+
+    # splits the result sets over several blocks
+    assert evaluation_factory.evaluate_many(
+        scopus_results_sets,
+        memory_budget_bytes=32 * n_studies * block_size,
+    ) == evaluation_factory.evaluate_many(scopus_results_sets)
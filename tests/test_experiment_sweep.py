@@ -0,0 +1,110 @@
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine, func, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from sesgx_cli.database.models import Params, SearchString  # noqa: E402
+from sesgx_cli.experiment_sweep import SweepResult, SweepTask, SweepWriter  # noqa: E402
+from sesgx_cli.topic_extraction.strategies import (  # noqa: E402
+    TopicExtractionStrategy,
+)
+from sesgx_cli.word_enrichment.strategies import WordEnrichmentStrategy  # noqa: E402
+
+LDA_TASK = SweepTask(
+    topic_extraction_strategy=TopicExtractionStrategy.lda,
+    word_enrichment_strategy=WordEnrichmentStrategy.bert,
+    topic_params_id=1,
+    formulation_params_ids=(1, 2),
+)
+BERTOPIC_TASK = SweepTask(
+    topic_extraction_strategy=TopicExtractionStrategy.bertopic,
+    word_enrichment_strategy=WordEnrichmentStrategy.bert,
+    topic_params_id=1,
+    formulation_params_ids=(1,),
+)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Params.metadata.create_all(
+        engine,
+        tables=[Params.__table__, SearchString.__table__],
+    )
+
+    with Session(engine) as session:
+        yield session
+
+
+def count_params(session: Session) -> int:
+    return session.scalar(select(func.count()).select_from(Params))
+
+
+def test_sweep_writer_saves_in_batches(session):
+    completed_params_keys = set()
+
+    with SweepWriter(1, session, completed_params_keys, batch_size=2) as writer:
+        writer.add(SweepResult(LDA_TASK, 1, "a AND b"))
+        assert count_params(session) == 0
+
+        writer.add(SweepResult(LDA_TASK, 2, "a AND c"))
+        assert count_params(session) == 2
+
+        writer.add(SweepResult(BERTOPIC_TASK, 1, "a AND b"))
+
+    assert count_params(session) == 3
+    # both params share the string
+    assert session.scalar(select(func.count()).select_from(SearchString)) == 2
+    assert completed_params_keys == {
+        SweepResult(LDA_TASK, 1, "").params_key,
+        SweepResult(LDA_TASK, 2, "").params_key,
+        SweepResult(BERTOPIC_TASK, 1, "").params_key,
+    }
+
+
+def test_sweep_writer_saves_lda_and_bertopic_params_in_the_same_batch(session):
+    with SweepWriter(1, session, set(), batch_size=10) as writer:
+        writer.add(SweepResult(LDA_TASK, 1, "a AND b"))
+        writer.add(SweepResult(BERTOPIC_TASK, 1, "a AND c"))
+
+    params = session.execute(select(Params).order_by(Params.id)).scalars().all()
+
+    assert [(p.lda_params_id, p.bertopic_params_id) for p in params] == [
+        (1, None),
+        (None, 1),
+    ]
+
+
+def test_sweep_writer_skips_saved_and_duplicated_params(session):
+    completed_params_keys = {SweepResult(LDA_TASK, 1, "").params_key}
+
+    with SweepWriter(1, session, completed_params_keys, batch_size=10) as writer:
+        writer.add(SweepResult(LDA_TASK, 1, "a AND b"))
+        writer.add(SweepResult(LDA_TASK, 2, "a AND c"))
+        writer.add(SweepResult(LDA_TASK, 2, "a AND c"))
+
+    assert count_params(session) == 1
+    assert len(completed_params_keys) == 2
+
+
+def test_sweep_writer_saves_the_buffer_when_the_sweep_fails(session):
+    with pytest.raises(ValueError, match="sweep failed"):
+        with SweepWriter(1, session, set(), batch_size=10) as writer:
+            writer.add(SweepResult(LDA_TASK, 1, "a AND b"))
+
+            raise ValueError("sweep failed")
+
+    assert count_params(session) == 1
+
+
+def test_sweep_writer_does_not_hide_the_sweep_exception(session, monkeypatch):
+    def fail_to_flush():
+        raise RuntimeError("flush failed")
+
+    with pytest.raises(ValueError, match="sweep failed"):
+        with SweepWriter(1, session, set(), batch_size=10) as writer:
+            monkeypatch.setattr(writer, "flush", fail_to_flush)
+
+            raise ValueError("sweep failed")
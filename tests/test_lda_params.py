@@ -0,0 +1,37 @@
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from sesgx_cli.database.models import LDAParams  # noqa: E402
+
+
+def test_evaluate_every_identifies_the_lda_params():
+    engine = create_engine("sqlite://")
+    LDAParams.metadata.create_all(engine, tables=[LDAParams.__table__])
+
+    with Session(engine) as session:
+        default_params = LDAParams.get_or_save_from_params_product(
+            n_topics_list=[1, 2],
+            min_document_frequency_list=[0.1],
+            session=session,
+        )
+        early_stopping_params = LDAParams.get_or_save_from_params_product(
+            n_topics_list=[1, 2],
+            min_document_frequency_list=[0.1],
+            evaluate_every=10,
+            session=session,
+        )
+
+        assert [p.evaluate_every for p in default_params] == [-1, -1]
+        assert [p.evaluate_every for p in early_stopping_params] == [10, 10]
+        assert {p.id for p in default_params}.isdisjoint(
+            p.id for p in early_stopping_params
+        )
+        assert default_params == LDAParams.get_or_save_from_params_product(
+            n_topics_list=[1, 2],
+            min_document_frequency_list=[0.1],
+            session=session,
+        )
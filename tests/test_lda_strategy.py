@@ -0,0 +1,104 @@
+import random
+
+import pytest
+
+pytest.importorskip("sklearn")
+pytest.importorskip("sesgx")
+
+from sklearn.decomposition import LatentDirichletAllocation  # noqa: E402
+from sklearn.feature_extraction.text import CountVectorizer  # noqa: E402
+
+from sesgx_cli.topic_extraction.lda_strategy import (  # noqa: E402
+    LDATopicExtractionStrategy,
+    extract_many,
+)
+
+WORDS = [
+    "software", "testing", "machine", "learning", "defect", "prediction",
+    "code", "review", "model", "metrics", "neural", "network", "empirical",
+    "study", "tool", "support", "requirements", "engineering", "mining",
+]  # fmt: skip
+
+# few passes, so the fits are fast; the topics do not need to converge to be compared
+MAX_ITER = 20
+
+
+@pytest.fixture(scope="module")
+def docs() -> list[str]:
+    rng = random.Random(0)
+    return [" ".join(rng.choices(WORDS, k=rng.randint(4, 8))) for _ in range(12)]
+
+
+def extract_without_early_stopping(
+    docs: list[str],
+    *,
+    min_document_frequency: float,
+    n_topics: int,
+    max_n_words_per_topic: int,
+) -> list[list[str]]:
+    """Topics extracted the way they were before `evaluate_every` was configurable."""
+    vectorizer = CountVectorizer(
+        min_df=min_document_frequency,
+        max_df=1.0,
+        ngram_range=(1, 3),
+        max_features=None,
+        stop_words="english",
+    )
+    tf = vectorizer.fit_transform(docs)
+    feature_names = vectorizer.get_feature_names_out()
+
+    lda = LatentDirichletAllocation(
+        n_components=n_topics,
+        learning_method="batch",
+        max_iter=MAX_ITER,
+        evaluate_every=-1,
+        perp_tol=0.1,
+        random_state=0,
+    ).fit(tf)
+
+    return [
+        [feature_names[i] for i in topic.argsort()[::-1]][:max_n_words_per_topic]
+        for topic in lda.components_
+    ]
+
+
+@pytest.mark.parametrize(
+    "min_document_frequency,n_topics",
+    [(0.1, 2), (0.3, 3)],
+)
+def test_default_evaluate_every_keeps_topics_unchanged(
+    docs,
+    min_document_frequency,
+    n_topics,
+):
+    strategy = LDATopicExtractionStrategy(
+        min_document_frequency=min_document_frequency,
+        n_topics=n_topics,
+        max_n_words_per_topic=5,
+        max_iter=MAX_ITER,
+    )
+
+    assert strategy.evaluate_every == -1
+    assert strategy.extract(docs) == extract_without_early_stopping(
+        docs,
+        min_document_frequency=min_document_frequency,
+        n_topics=n_topics,
+        max_n_words_per_topic=5,
+    )
+
+
+def test_extract_many_matches_extract(docs):
+    strategies = [
+        LDATopicExtractionStrategy(
+            min_document_frequency=min_document_frequency,
+            n_topics=n_topics,
+            max_n_words_per_topic=5,
+            max_iter=MAX_ITER,
+        )
+        for min_document_frequency in [0.1, 0.3]
+        for n_topics in [1, 2]
+    ]
+
+    assert extract_many(strategies, docs, n_jobs=2) == [
+        strategy.extract(docs) for strategy in strategies
+    ]
@@ -0,0 +1,78 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from tenacity import wait_none  # noqa: E402
+
+from sesgx_cli.word_enrichment.llm_strategy import (  # noqa: E402
+    LLMWordEnrichmentStrategy,
+)
+from sesgx_cli.word_enrichment.strategies import PartialEnrichmentError  # noqa: E402
+
+
+class StubChain:
+    """Stands in for the `prompt | llm` chain, failing for some words."""
+
+    def __init__(self, failing_words: set[str]):
+        self.failing_words = failing_words
+        self.calls: list[str] = []
+        self.n_in_flight = 0
+        self.max_in_flight = 0
+
+    async def ainvoke(self, model_input: dict) -> str:
+        word = model_input["word_to_be_enriched"]
+        self.calls.append(word)
+
+        self.n_in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.n_in_flight)
+        await asyncio.sleep(0.01)
+        self.n_in_flight -= 1
+
+        if word in self.failing_words:
+            raise ConnectionError(f"Request for {word} failed.")
+
+        return json.dumps({"synonyms": ["framework", "approach"]})
+
+
+@pytest.fixture
+def strategy(monkeypatch: pytest.MonkeyPatch) -> LLMWordEnrichmentStrategy:
+    monkeypatch.setattr(
+        LLMWordEnrichmentStrategy._ainvoke_model.retry,  # type: ignore
+        "wait",
+        wait_none(),
+    )
+
+    return LLMWordEnrichmentStrategy(
+        "Machine learning is used. Software testing too.",
+        model="mistral",
+        max_concurrency=2,
+        requests_per_second=1000,
+    )
+
+
+def test_enrich_many_keeps_successes_when_a_word_fails(strategy):
+    strategy.chain = StubChain(failing_words={"testing"})
+
+    with pytest.raises(PartialEnrichmentError) as exc_info:
+        strategy.enrich_many(["machine", "testing", "software"])
+
+    assert exc_info.value.enriched_words == {
+        "machine": ["framework", "approach"],
+        "software": ["framework", "approach"],
+    }
+    assert list(exc_info.value.errors) == ["testing"]
+    # the failed word was retried, without cancelling the other requests
+    assert strategy.chain.calls.count("testing") == 3
+
+
+def test_enrich_many_limits_concurrent_requests(strategy):
+    chain = StubChain(failing_words=set())
+    strategy.chain = chain
+
+    enriched_words = strategy.enrich_many([f"word{i}" for i in range(10)])
+
+    assert len(enriched_words) == 10
+    assert chain.max_in_flight == 2
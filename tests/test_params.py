@@ -0,0 +1,62 @@
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from sesgx_cli.database.models import Params  # noqa: E402
+from sesgx_cli.database.models.params import ParamsKey  # noqa: E402
+
+
+def test_get_keys_by_experiment():
+    engine = create_engine("sqlite://")
+    Params.metadata.create_all(engine, tables=[Params.__table__])
+
+    with Session(engine) as session:
+        session.execute(
+            insert(Params).values(
+                [
+                    {
+                        "experiment_id": 1,
+                        "formulation_params_id": 1,
+                        "word_enrichment_strategy": "bert",
+                        "search_string_id": 1,
+                        "lda_params_id": 2,
+                        "bertopic_params_id": None,
+                    },
+                    {
+                        "experiment_id": 1,
+                        "formulation_params_id": 3,
+                        "word_enrichment_strategy": "llama3",
+                        "search_string_id": 2,
+                        "lda_params_id": None,
+                        "bertopic_params_id": 2,
+                    },
+                    {
+                        "experiment_id": 2,
+                        "formulation_params_id": 1,
+                        "word_enrichment_strategy": "bert",
+                        "search_string_id": 1,
+                        "lda_params_id": 2,
+                        "bertopic_params_id": None,
+                    },
+                ]
+            )
+        )
+
+        assert Params.get_keys_by_experiment(1, session) == {
+            ParamsKey(
+                topic_extraction_strategy="lda",
+                word_enrichment_strategy="bert",
+                topic_params_id=2,
+                formulation_params_id=1,
+            ),
+            ParamsKey(
+                topic_extraction_strategy="bertopic",
+                word_enrichment_strategy="llama3",
+                topic_params_id=2,
+                formulation_params_id=3,
+            ),
+        }
+        assert Params.get_keys_by_experiment(3, session) == set()
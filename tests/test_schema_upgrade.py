@@ -0,0 +1,77 @@
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine, text  # noqa: E402
+
+from sesgx_cli.database.models import LDAParams, SearchStringResults  # noqa: E402
+from sesgx_cli.database.util.schema_upgrade import (  # noqa: E402
+    get_lda_params_upgrade_statements,
+    get_search_string_results_upgrade_statements,
+)
+
+
+def test_up_to_date_lda_params_needs_no_upgrade():
+    engine = create_engine("sqlite://")
+    LDAParams.metadata.create_all(engine, tables=[LDAParams.__table__])
+
+    assert get_lda_params_upgrade_statements(engine) == []
+
+
+def test_missing_lda_params_needs_no_upgrade():
+    engine = create_engine("sqlite://")
+
+    assert get_lda_params_upgrade_statements(engine) == []
+
+
+def test_lda_params_without_evaluate_every_is_upgraded():
+    engine = create_engine("sqlite://")
+
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE lda_params ("
+                "id INTEGER PRIMARY KEY, "
+                "min_document_frequency FLOAT NOT NULL, "
+                "n_topics INTEGER NOT NULL, "
+                "CONSTRAINT lda_params_min_document_frequency_n_topics_key "
+                "UNIQUE (min_document_frequency, n_topics))"
+            )
+        )
+
+    assert get_lda_params_upgrade_statements(engine) == [
+        "ALTER TABLE lda_params ADD COLUMN evaluate_every INTEGER NOT NULL DEFAULT -1",  # noqa: E501
+        'ALTER TABLE lda_params DROP CONSTRAINT "lda_params_min_document_frequency_n_topics_key"',  # noqa: E501
+        "ALTER TABLE lda_params ADD CONSTRAINT lda_params_min_document_frequency_n_topics_evaluate_every_key UNIQUE (min_document_frequency, n_topics, evaluate_every)",  # noqa: E501
+    ]
+
+
+def test_up_to_date_search_string_results_needs_no_upgrade():
+    engine = create_engine("sqlite://")
+    SearchStringResults.metadata.create_all(
+        engine, tables=[SearchStringResults.__table__]
+    )
+
+    assert get_search_string_results_upgrade_statements(engine) == []
+
+
+def test_search_string_results_without_chunks_is_upgraded():
+    engine = create_engine("sqlite://")
+
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE search_string_results ("
+                "search_string_id INTEGER NOT NULL, "
+                "n_scopus_results INTEGER NOT NULL, "
+                "compressed_titles BLOB NOT NULL, "
+                "compressed_eids BLOB NOT NULL, "
+                "CONSTRAINT search_string_results_pkey PRIMARY KEY (search_string_id))"
+            )
+        )
+
+    assert get_search_string_results_upgrade_statements(engine) == [
+        "ALTER TABLE search_string_results ADD COLUMN chunk_index INTEGER NOT NULL DEFAULT 0",  # noqa: E501
+        'ALTER TABLE search_string_results DROP CONSTRAINT "search_string_results_pkey"',  # noqa: E501
+        "ALTER TABLE search_string_results ADD PRIMARY KEY (search_string_id, chunk_index)",  # noqa: E501
+    ]
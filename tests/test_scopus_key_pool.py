@@ -0,0 +1,382 @@
+import asyncio
+import json
+import threading
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from math import ceil
+from typing import Iterator, Optional
+from urllib.error import HTTPError
+from urllib.parse import parse_qs, quote, urlparse
+from urllib.request import Request, urlopen
+
+import pytest
+
+from sesgx_cli.scopus_key_pool import (
+    ScopusKeyPool,
+    is_quota_error,
+    map_in_order,
+    search_with_key_pool,
+)
+
+PAGE_SIZE = 2
+
+
+@dataclass
+class FakeScopusState:
+    """What the fake Scopus server answers.
+
+    Attributes:
+        results (dict[str, list[str]]): Titles returned for each search string.
+        quotas (dict[str, int]): Number of requests each key can make before getting a 429.
+        failing_strings (set[str]): Strings that get a 500.
+        requests (list[tuple[str, str]]): Key and string of each request received.
+    """  # noqa: E501
+
+    results: dict[str, list[str]] = field(default_factory=dict)
+    quotas: dict[str, int] = field(default_factory=dict)
+    failing_strings: set[str] = field(default_factory=set)
+    requests: list[tuple[str, str]] = field(default_factory=list)
+
+
+def create_handler(state: FakeScopusState) -> type[BaseHTTPRequestHandler]:
+    class FakeScopusHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args) -> None:
+            pass
+
+        def send_json(self, status: int, body: dict) -> None:
+            payload = json.dumps(body).encode()
+
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self) -> None:
+            query = parse_qs(urlparse(self.path).query)
+            string = query["query"][0]
+            start = int(query["start"][0])
+            key = self.headers["X-ELS-APIKey"]
+
+            state.requests.append((key, string))
+
+            if state.quotas.get(key, 0) <= 0:
+                self.send_json(429, {"error-response": {"error-code": "TOO_MANY_REQUESTS"}})  # noqa: E501
+                return
+
+            state.quotas[key] -= 1
+
+            if string in state.failing_strings:
+                self.send_json(500, {"error-response": {"error-code": "GENERAL_SYSTEM_ERROR"}})  # noqa: E501
+                return
+
+            titles = state.results.get(string, [])
+            self.send_json(
+                200,
+                {
+                    "search-results": {
+                        "opensearch:totalResults": str(len(titles)),
+                        "entry": [
+                            {"dc:title": title, "eid": f"2-s2.0-{start + i}"}
+                            for i, title in enumerate(titles[start : start + PAGE_SIZE])
+                        ],
+                    }
+                },
+            )
+
+    return FakeScopusHandler
+
+
+@dataclass
+class Page:
+    entries: list[dict]
+    n_pages: int
+
+
+class FakeScopusClient:
+    """Client with the same `search` interface of `scopus_client.ScopusClient`, using one key.
+
+    Like `ScopusClient`, it handles a 429 itself and raises `quota_error`, since its only
+    key is out of quota. Without `quota_error`, the `HTTPError` of the 429 is raised.
+    """  # noqa: E501
+
+    def __init__(
+        self,
+        key: str,
+        base_url: str,
+        quota_error: Optional[type[Exception]] = None,
+    ):
+        self.key = key
+        self.base_url = base_url
+        self.quota_error = quota_error
+
+    def get(self, string: str, start: int) -> dict:
+        request = Request(
+            f"{self.base_url}/content/search/scopus?query={quote(string)}&start={start}&count={PAGE_SIZE}",  # noqa: E501
+            headers={"X-ELS-APIKey": self.key},
+        )
+
+        try:
+            with urlopen(request) as response:
+                return json.loads(response.read())["search-results"]
+
+        except HTTPError as e:
+            if e.code == 429 and self.quota_error is not None:
+                raise self.quota_error()
+
+            raise
+
+    async def search(self, string: str):
+        start = 0
+        n_pages = None
+
+        while n_pages is None or start < n_pages * PAGE_SIZE:
+            body = await asyncio.to_thread(self.get, string, start)
+            n_pages = ceil(int(body["opensearch:totalResults"]) / PAGE_SIZE)
+
+            yield Page(entries=body["entry"], n_pages=n_pages)
+
+            start += PAGE_SIZE
+
+
+class TitlesResults:
+    def __init__(self):
+        self.titles: list[str] = []
+
+    def add_entries(self, entries: list[dict]) -> None:
+        self.titles.extend(e["dc:title"] for e in entries)
+
+
+@pytest.fixture
+def out_of_api_keys_error() -> type[Exception]:
+    """Error raised by `scopus_client.ScopusClient` when its keys are out of quota."""
+    return pytest.importorskip("scopus_client").OutOfAPIKeysError
+
+
+@pytest.fixture
+def fake_scopus() -> Iterator[tuple[FakeScopusState, str]]:
+    state = FakeScopusState()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), create_handler(state))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield state, f"http://127.0.0.1:{server.server_port}"
+
+    server.shutdown()
+    server.server_close()
+
+
+def create_key_pool(
+    base_url: str,
+    keys: list[str],
+    quota_error: Optional[type[Exception]] = None,
+    **kwargs,
+) -> ScopusKeyPool:
+    return ScopusKeyPool(
+        keys,
+        client_factory=lambda key: FakeScopusClient(key, base_url, quota_error),
+        quota_errors=() if quota_error is None else (quota_error,),
+        cooldown_seconds=0,
+        **kwargs,
+    )
+
+
+def search(key_pool: ScopusKeyPool, string: str, on_page=lambda page: None):
+    return asyncio.run(
+        search_with_key_pool(
+            string,
+            key_pool,
+            on_page=on_page,
+            create_results=TitlesResults,
+        )
+    )
+
+
+@pytest.mark.parametrize("client_handles_429", [True, False])
+def test_key_out_of_quota_rotates_to_another_key(
+    fake_scopus,
+    request,
+    client_handles_429,
+):
+    state, base_url = fake_scopus
+    state.results["machine learning"] = ["a", "b", "c", "d", "e"]
+    state.quotas = {"key-a": 1, "key-b": 10}
+
+    quota_error = None
+    if client_handles_429:
+        quota_error = request.getfixturevalue("out_of_api_keys_error")
+
+    key_pool = create_key_pool(base_url, ["key-a", "key-b"], quota_error)
+    results = search(key_pool, "machine learning")
+
+    assert results.titles == ["a", "b", "c", "d", "e"]
+    # key-a got the first page, and a 429 on the second one
+    assert state.requests[:2] == [
+        ("key-a", "machine learning"),
+        ("key-a", "machine learning"),
+    ]
+    assert {key for key, _ in state.requests[2:]} == {"key-b"}
+
+    key_a, key_b = key_pool.keys
+    assert key_a.n_consecutive_failures == 1
+    assert key_b.n_consecutive_failures == 0
+    assert key_a.n_in_flight == key_b.n_in_flight == 0
+
+
+def test_every_key_out_of_quota_exhausts_the_pool(fake_scopus, out_of_api_keys_error):
+    state, base_url = fake_scopus
+    state.results["machine learning"] = ["a"]
+    state.quotas = {"key-a": 0, "key-b": 0}
+
+    key_pool = create_key_pool(
+        base_url,
+        ["key-a", "key-b"],
+        out_of_api_keys_error,
+        max_failures=2,
+    )
+
+    with pytest.raises(out_of_api_keys_error):
+        search(key_pool, "machine learning")
+
+    assert key_pool.is_exhausted
+    assert len(state.requests) == 4
+
+
+def test_server_error_is_raised_without_failing_the_key(fake_scopus):
+    state, base_url = fake_scopus
+    state.results["machine learning"] = ["a", "b"]
+    state.failing_strings = {"broken string"}
+    state.quotas = {"key-a": 10}
+
+    key_pool = create_key_pool(
+        base_url,
+        ["key-a"],
+        # a client error that is not about the quota
+        quota_error=PermissionError,
+        max_failures=1,
+    )
+
+    with pytest.raises(HTTPError) as exc_info:
+        search(key_pool, "broken string")
+
+    assert exc_info.value.code == 500
+    assert state.requests == [("key-a", "broken string")]
+    assert not key_pool.is_exhausted
+
+    assert search(key_pool, "machine learning").titles == ["a", "b"]
+
+
+def test_callback_error_is_raised_without_failing_the_key(fake_scopus):
+    state, base_url = fake_scopus
+    state.results["machine learning"] = ["a", "b"]
+    state.quotas = {"key-a": 10}
+
+    key_pool = create_key_pool(base_url, ["key-a"], max_failures=1)
+
+    def on_page(page):
+        raise ValueError("Bug in the callback.")
+
+    with pytest.raises(ValueError):
+        search(key_pool, "machine learning", on_page=on_page)
+
+    (key_a,) = key_pool.keys
+    assert key_a.n_consecutive_failures == 0
+    assert key_a.n_in_flight == 0
+
+
+def test_concurrent_searches_are_spread_over_the_keys(fake_scopus):
+    state, base_url = fake_scopus
+    strings = [f"string {i}" for i in range(6)]
+    for string in strings:
+        state.results[string] = [f"{string} title {i}" for i in range(3)]
+    state.quotas = {"key-a": 100, "key-b": 100, "key-c": 100}
+
+    key_pool = create_key_pool(base_url, ["key-a", "key-b", "key-c"])
+
+    async def search_all():
+        return await asyncio.gather(
+            *(
+                search_with_key_pool(
+                    string,
+                    key_pool,
+                    on_page=lambda page: None,
+                    create_results=TitlesResults,
+                )
+                for string in strings
+            )
+        )
+
+    results = asyncio.run(search_all())
+
+    assert [r.titles for r in results] == [state.results[s] for s in strings]
+    assert {key for key, _ in state.requests} == {"key-a", "key-b", "key-c"}
+
+
+def test_quota_error_is_found_in_the_cause_chain():
+    class ClientError(Exception):
+        pass
+
+    http_error = HTTPError("http://scopus", 429, "Too Many Requests", None, None)  # type: ignore
+    wrapped_error = ClientError("Request failed.")
+    wrapped_error.__cause__ = http_error
+
+    assert is_quota_error(http_error)
+    assert is_quota_error(wrapped_error)
+    assert not is_quota_error(ClientError("Request failed."))
+    assert is_quota_error(ClientError("Out of keys."), quota_errors=(ClientError,))
+    assert not is_quota_error(
+        HTTPError("http://scopus", 500, "Internal Server Error", None, None)  # type: ignore
+    )
+
+
+def test_map_in_order_bounds_the_items_not_yielded():
+    n_not_yielded = 0
+    max_not_yielded = 0
+
+    async def run(item: int) -> int:
+        nonlocal n_not_yielded, max_not_yielded
+        n_not_yielded += 1
+        max_not_yielded = max(max_not_yielded, n_not_yielded)
+
+        # the first item is the slowest
+        await asyncio.sleep(0.05 if item == 0 else 0.001)
+
+        return item * 10
+
+    async def consume() -> list[int]:
+        nonlocal n_not_yielded
+        results = []
+
+        async for result in map_in_order(run, range(10), concurrency=3):
+            n_not_yielded -= 1
+            results.append(result)
+
+        return results
+
+    assert asyncio.run(consume()) == [i * 10 for i in range(10)]
+    assert max_not_yielded == 3
+
+
+def test_map_in_order_cancels_the_items_running_on_error():
+    cancelled: list[int] = []
+
+    async def run(item: int) -> int:
+        try:
+            if item == 0:
+                raise ValueError("First item failed.")
+
+            await asyncio.sleep(1)
+            return item
+
+        except asyncio.CancelledError:
+            cancelled.append(item)
+            raise
+
+    async def consume() -> None:
+        async for _ in map_in_order(run, range(5), concurrency=3):
+            pass
+
+    with pytest.raises(ValueError):
+        asyncio.run(consume())
+
+    assert cancelled == [1, 2]
@@ -0,0 +1,33 @@
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine, func, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from sesgx_cli.database.models import SearchString  # noqa: E402
+
+
+def test_get_or_save_many_by_string_saves_each_string_once():
+    engine = create_engine("sqlite://")
+    SearchString.metadata.create_all(engine, tables=[SearchString.__table__])
+
+    with Session(engine) as session:
+        existing = SearchString.get_or_save_by_string("a AND b", session)
+
+        ids = SearchString.get_or_save_many_by_string(
+            ["c OR d", "a AND b", "c OR d", "e"],
+            session,
+        )
+        session.commit()
+
+        assert set(ids) == {"a AND b", "c OR d", "e"}
+        assert ids["a AND b"] == existing.id
+        assert len(set(ids.values())) == 3
+        assert session.scalar(select(func.count()).select_from(SearchString)) == 3
+
+        assert SearchString.get_or_save_many_by_string(["e", "a AND b"], session) == {
+            "e": ids["e"],
+            "a AND b": ids["a AND b"],
+        }
+        assert SearchString.get_or_save_many_by_string([], session) == {}
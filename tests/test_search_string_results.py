@@ -0,0 +1,65 @@
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from sesgx_cli.database.models import (  # noqa: E402
+    Base,
+    SearchString,
+    SearchStringResults,
+)
+
+
+@pytest.mark.parametrize(
+    "titles",
+    [
+        [],
+        [""],
+        [None],
+        ["Software testing", "", None, "Defect prediction"],
+    ],
+)
+def test_missing_titles_are_not_empty_titles(titles):
+    results = SearchStringResults.from_titles_and_eids(
+        search_string_id=1,
+        titles=titles,
+        eids=[f"2-s2.0-{i}" for i in range(len(titles))],
+    )
+
+    assert results.get_titles() == titles
+    # titles missing from a Scopus entry are not evaluated, as in the baseline
+    assert [t for t in results.get_titles() if t is not None] == [
+        t for t in titles if t is not None
+    ]
+
+
+def test_results_of_a_string_are_read_in_chunk_order():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(
+        engine,
+        tables=[SearchString.__table__, SearchStringResults.__table__],
+    )
+
+    with Session(engine) as session:
+        search_string = SearchString(string="machine AND learning")
+        session.add(search_string)
+        session.flush()
+
+        for chunk_index, titles in [(1, ["c", None]), (0, ["a", "b"])]:
+            session.add(
+                SearchStringResults.from_titles_and_eids(
+                    search_string_id=search_string.id,
+                    titles=titles,
+                    eids=[f"2-s2.0-{t}" for t in titles],
+                    chunk_index=chunk_index,
+                )
+            )
+        session.commit()
+
+        session.expire_all()
+
+        assert [
+            title for chunk in search_string.results for title in chunk.get_titles()
+        ] == ["a", "b", "c", None]
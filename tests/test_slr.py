@@ -0,0 +1,66 @@
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from sesgx_cli.database.models import SLR, Base, Study  # noqa: E402
+from sesgx_cli.database.models.association_tables import (  # noqa: E402
+    studies_citations,
+)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(
+        engine,
+        tables=[SLR.__table__, Study.__table__, studies_citations],
+    )
+
+    with Session(engine) as session:
+        slr = SLR(name="slr", min_publication_year=None, max_publication_year=None)
+
+        # node ids in the opposite order of the ids
+        studies = [
+            Study(node_id=4 - i, title=f"study {i}", abstract="", keywords="")
+            for i in range(4)
+        ]
+        slr.gs.extend(studies)
+        session.add(slr)
+        session.flush()
+
+        # the references are added out of order
+        studies[0].references.extend([studies[3], studies[1]])
+        studies[2].references.append(studies[0])
+        session.commit()
+
+        yield session
+
+
+def get_relationships_adjacency_list(
+    slr: SLR,
+    use_node_id: bool,
+) -> dict[int, list[int]]:
+    if use_node_id:
+        return {s.node_id: [r.node_id for r in s.references] for s in slr.gs}
+
+    return {s.id: [r.id for r in s.references] for s in slr.gs}
+
+
+@pytest.mark.parametrize("use_node_id", [False, True])
+def test_adjacency_list_keeps_the_order_of_the_relationships(session, use_node_id):
+    slr = SLR.get_by_name("slr", session)
+    session.expire_all()
+
+    adjacency_list = slr.adjacency_list(use_node_id=use_node_id)
+    expected = get_relationships_adjacency_list(slr, use_node_id)
+
+    assert list(adjacency_list.items()) == list(expected.items())
+
+
+def test_citation_graph_matches_the_adjacency_list(session):
+    slr = SLR.get_by_name("slr", session)
+
+    assert slr.get_citation_graph().to_adjacency_list() == slr.adjacency_list()
@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+pytest.importorskip("nltk")
+pytest.importorskip("rapidfuzz")
+
+from sesgx_cli.word_enrichment.stemming_filter import (  # noqa: E402
+    check_stemmed_enriched_word_is_valid,
+    check_strings_are_close,
+    check_word_is_punctuation,
+    filter_with_stemming,
+    lancaster,
+)
+
+
+def filter_with_stemming_reference(
+    word: str,
+    enriched_words_list: list[str],
+) -> list[str]:
+    """Unoptimized `filter_with_stemming`, stemming every word and comparing each pair of words."""  # noqa: E501
+    stemmed_word = lancaster.stem(word)
+    relevant_enriched_words: list[str] = []
+    stemmed_relevant_enriched_words: list[str] = []
+
+    for enriched_word in enriched_words_list:
+        stemmed_enriched_word = lancaster.stem(enriched_word)
+
+        is_relevant = (
+            not check_word_is_punctuation(enriched_word)
+            and check_stemmed_enriched_word_is_valid(
+                stemmed_enriched_word,
+                stemmed_word=stemmed_word,
+            )
+            and not any(
+                check_strings_are_close(stemmed_relevant_enriched_word, stemmed_enriched_word)  # noqa: E501
+                for stemmed_relevant_enriched_word in stemmed_relevant_enriched_words
+            )
+        )
+
+        if is_relevant:
+            relevant_enriched_words.append(enriched_word)
+            stemmed_relevant_enriched_words.append(stemmed_enriched_word)
+
+    return relevant_enriched_words
+
+
+def random_words(
+    rng: random.Random,
+    n_words: int,
+    min_length: int = 1,
+    max_length: int = 14,
+) -> list[str]:
+    alphabet = "abcdeilmnorst"
+    return [
+        "".join(rng.choices(alphabet, k=rng.randint(min_length, max_length)))
+        for _ in range(n_words)
+    ]
+
+
+def test_filter_with_stemming_matches_reference_filter():
+    rng = random.Random(0)
+
+    for _ in range(500):
+        word = random_words(rng, 1)[0]
+        enriched_words_list = random_words(rng, rng.randint(0, 30))
+        enriched_words_list += rng.choices(["!", "-", word, word.upper()], k=2)
+
+        assert filter_with_stemming(
+            word, enriched_words_list=enriched_words_list
+        ) == filter_with_stemming_reference(word, enriched_words_list)
+
+
+def test_filter_with_stemming_keeps_first_of_duplicates():
+    enriched_words_list = ["framework", "frameworks", "approach", "-"]
+
+    assert filter_with_stemming("model", enriched_words_list=enriched_words_list) == [
+        "framework",
+        "approach",
+    ]
+
@@ -0,0 +1,135 @@
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("sesgx")
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from sesgx_cli.database.models import (  # noqa: E402
+    CachedEnrichedWords,
+    EnrichedWordsCacheKey,
+    Experiment,
+)
+from sesgx_cli.word_enrichment.strategies import WordEnrichmentStrategy  # noqa: E402
+from sesgx_cli.word_enrichment.word_enrichment_cache import (  # noqa: E402
+    EnrichedWordsMemoryCache,
+    WordEnrichmentCache,
+)
+
+
+class CountingModel:
+    """Enriches each word with two suffixed words, recording the words it enriches."""
+
+    def __init__(self):
+        self.calls: list[str] = []
+
+    def enrich(self, word: str) -> list[str]:
+        self.calls.append(word)
+
+        # some words have no enrichments
+        if word.startswith("x"):
+            return []
+
+        return [f"{word}1", f"{word}2"]
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Experiment.metadata.create_all(
+        engine,
+        tables=[
+            Experiment.__table__,
+            EnrichedWordsCacheKey.__table__,
+            CachedEnrichedWords.__table__,
+        ],
+    )
+
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def experiment(session):
+    experiment = Experiment(name="experiment", slr_id=1)
+    session.add(experiment)
+    session.commit()
+
+    return experiment
+
+
+def create_cache(session, experiment, model, memory_cache=None, n_enrichments=5):
+    return WordEnrichmentCache(
+        word_enrichment_model=model,
+        word_enrichment_strategy=WordEnrichmentStrategy.bert,
+        session=session,
+        experiment=experiment,
+        n_enrichments=n_enrichments,
+        memory_cache=memory_cache,
+        save_chunk_size=2,
+    )
+
+
+def test_enrich_many_enriches_each_word_once(session, experiment):
+    model = CountingModel()
+    cache = create_cache(session, experiment, model, n_enrichments=1)
+
+    assert cache.enrich_many(["a", "b", "a", "xc", "d"]) == {
+        "a": ["a1"],
+        "b": ["b1"],
+        "xc": [],
+        "d": ["d1"],
+    }
+    assert model.calls == ["a", "b", "xc", "d"]
+
+    # a new cache only reads the database
+    other_model = CountingModel()
+    other_cache = create_cache(session, experiment, other_model)
+
+    assert other_cache.enrich_many(["d", "xc", "e"]) == {
+        "d": ["d1", "d2"],
+        "xc": [],
+        "e": ["e1", "e2"],
+    }
+    assert other_cache.enrich("a") == ["a1", "a2"]
+    assert other_model.calls == ["e"]
+
+
+def test_memory_cache_is_used_before_the_database(session, experiment):
+    create_cache(session, experiment, CountingModel()).enrich_many(["a", "xb"])
+
+    memory_cache = EnrichedWordsMemoryCache(max_size=10)
+    memory_cache.warm_up(experiment.id, session)
+
+    assert len(memory_cache) == 2
+
+    # words are never read from the database nor enriched again
+    cache = create_cache(session, experiment, CountingModel(), memory_cache)
+    cache.session = None  # type: ignore
+
+    assert cache.enrich_many(["a", "xb"]) == {"a": ["a1", "a2"], "xb": []}
+    assert cache.enrich("a") == ["a1", "a2"]
+    assert memory_cache.hits == 3
+
+
+def test_memory_cache_evicts_the_least_recently_used_words():
+    memory_cache = EnrichedWordsMemoryCache(max_size=2)
+
+    memory_cache.put((1, "bert", "a"), ["a1"])
+    memory_cache.put((1, "bert", "b"), ["b1"])
+    assert memory_cache.get((1, "bert", "a")) == ["a1"]
+
+    memory_cache.put((1, "bert", "c"), ["c1"])
+
+    assert memory_cache.get((1, "bert", "b")) is None
+    assert memory_cache.get((1, "bert", "a")) == ["a1"]
+    assert memory_cache.get((1, "bert", "c")) == ["c1"]
+    assert (memory_cache.hits, memory_cache.misses) == (3, 1)
+
+
+def test_memory_cache_without_size_keeps_nothing():
+    memory_cache = EnrichedWordsMemoryCache(max_size=0)
+    memory_cache.put((1, "bert", "a"), ["a1"])
+
+    assert len(memory_cache) == 0